@@ -0,0 +1,39 @@
+"""Add the payment_daily_totals rollup
+
+Revision ID: 5c1d7e93b0a2
+Revises: 733ff6e840bb
+Create Date: 2026-10-17 14:05:31.772940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d7e93b0a2'
+down_revision: Union[str, None] = '733ff6e840bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TABLE payment_daily_totals ("
+               "day DATE NOT NULL, "
+               "status paymentstatus NOT NULL, "
+               "count BIGINT NOT NULL, "
+               "amount NUMERIC NOT NULL, "
+               "CONSTRAINT payment_daily_totals_pkey PRIMARY KEY (day, status))")
+
+    # Única varredura completa de payments; o SHARE bloqueia escritas só
+    # durante o preenchimento, para que nenhuma fique fora do rollup. Réplicas
+    # com o código anterior não mantêm o rollup: depois do deploy, rode
+    # `python -m tech.workers.rebuild_payment_totals` para os dias do deploy.
+    op.execute("LOCK TABLE payments IN SHARE MODE")
+    op.execute("INSERT INTO payment_daily_totals (day, status, count, amount) "
+               "SELECT CAST(created_at AS DATE), status, count(*), sum(CAST(amount AS NUMERIC)) "
+               "FROM payments GROUP BY 1, 2")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE payment_daily_totals")
@@ -0,0 +1,123 @@
+"""Partition payments by month on created_at
+
+Revision ID: 733ff6e840bb
+Revises: a6150fe0443e
+Create Date: 2026-10-17 11:40:05.204117
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '733ff6e840bb'
+down_revision: Union[str, None] = 'a6150fe0443e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partições mensais criadas a partir do limite da partição legada; as
+# seguintes são criadas pela API na inicialização e pelo job de arquivamento
+INITIAL_MONTHLY_PARTITIONS = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    today = datetime.utcnow().date()
+    # A tabela atual vira a partição legada até o início do mês seguinte ao
+    # próximo, com folga caso a migração atravesse a virada do mês
+    boundary = add_months(date(today.year, today.month, 1), 2)
+
+    # Preparação sem bloquear escritas: a CHECK validada permite que o
+    # SET NOT NULL e o ATTACH PARTITION não varram a tabela, e os índices que
+    # a partição legada precisa são criados concorrentemente
+    with op.get_context().autocommit_block():
+        op.execute("UPDATE payments SET created_at = COALESCE(updated_at, now() AT TIME ZONE 'utc') "
+                   "WHERE created_at IS NULL")
+        op.execute("ALTER TABLE payments ADD CONSTRAINT payments_created_at_bound "
+                   f"CHECK (created_at IS NOT NULL AND created_at < '{boundary.isoformat()}') NOT VALID")
+        op.execute("ALTER TABLE payments VALIDATE CONSTRAINT payments_created_at_bound")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS payments_id_created_at_idx "
+                   "ON payments (id, created_at)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS payments_order_id_idx ON payments (order_id)")
+
+    # Daqui em diante a tabela fica bloqueada até o fim da transação; a única
+    # varredura é a cópia dos order IDs para payment_order_ids
+    op.execute("LOCK TABLE payments IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE payments ALTER COLUMN created_at SET NOT NULL")
+
+    op.execute("CREATE TABLE payment_order_ids ("
+               "order_id INTEGER NOT NULL, "
+               "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+               "CONSTRAINT payment_order_ids_pkey PRIMARY KEY (order_id))")
+    op.execute("INSERT INTO payment_order_ids (order_id, created_at) SELECT order_id, created_at FROM payments")
+
+    op.execute("ALTER TABLE payments RENAME TO payments_legacy")
+    op.execute("ALTER TABLE payments_legacy DROP CONSTRAINT payments_pkey")
+    op.execute("ALTER TABLE payments_legacy DROP CONSTRAINT payments_order_id_key")
+    op.execute("DROP INDEX ix_payments_id")
+    op.execute("ALTER TABLE payments_legacy ADD CONSTRAINT payments_legacy_pkey "
+               "PRIMARY KEY USING INDEX payments_id_created_at_idx")
+    op.execute("ALTER INDEX payments_order_id_idx RENAME TO payments_legacy_order_id_idx")
+    op.execute("ALTER INDEX ix_payments_status_updated_at RENAME TO payments_legacy_status_updated_at_idx")
+    op.execute("ALTER INDEX ix_payments_in_flight_updated_at RENAME TO payments_legacy_in_flight_updated_at_idx")
+    op.execute("ALTER INDEX ix_payments_created_at_brin RENAME TO payments_legacy_created_at_brin_idx")
+
+    op.execute("CREATE TABLE payments ("
+               "id INTEGER NOT NULL DEFAULT nextval('payments_id_seq'), "
+               "order_id INTEGER NOT NULL, "
+               "amount FLOAT NOT NULL, "
+               "status paymentstatus NOT NULL, "
+               "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+               "updated_at TIMESTAMP WITHOUT TIME ZONE, "
+               "CONSTRAINT payments_pkey PRIMARY KEY (id, created_at)"
+               ") PARTITION BY RANGE (created_at)")
+    op.execute("ALTER SEQUENCE payments_id_seq OWNED BY payments.id")
+    op.execute("CREATE INDEX ix_payments_order_id ON payments (order_id)")
+    op.execute("CREATE INDEX ix_payments_status_updated_at ON payments (status, updated_at)")
+    op.execute("CREATE INDEX ix_payments_in_flight_updated_at ON payments (updated_at) "
+               "WHERE status IN ('PENDING', 'PROCESSING')")
+    op.execute("CREATE INDEX ix_payments_created_at_brin ON payments USING brin (created_at)")
+
+    # Os índices equivalentes da partição legada são anexados aos do pai
+    op.execute("ALTER TABLE payments ATTACH PARTITION payments_legacy "
+               f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')")
+    op.execute("ALTER TABLE payments_legacy DROP CONSTRAINT payments_created_at_bound")
+
+    for offset in range(INITIAL_MONTHLY_PARTITIONS):
+        month = add_months(boundary, offset)
+        op.execute(f"CREATE TABLE payments_y{month.year:04d}m{month.month:02d} PARTITION OF payments "
+                   f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')")
+
+
+def downgrade() -> None:
+    # Partições já arquivadas não voltam; só os dados ainda no banco são copiados
+    op.execute("LOCK TABLE payments IN ACCESS EXCLUSIVE MODE")
+    op.execute("CREATE TABLE payments_unpartitioned ("
+               "id INTEGER NOT NULL DEFAULT nextval('payments_id_seq'), "
+               "order_id INTEGER NOT NULL, "
+               "amount FLOAT NOT NULL, "
+               "status paymentstatus NOT NULL, "
+               "created_at TIMESTAMP WITHOUT TIME ZONE, "
+               "updated_at TIMESTAMP WITHOUT TIME ZONE, "
+               "CONSTRAINT payments_unpartitioned_pkey PRIMARY KEY (id), "
+               "CONSTRAINT payments_unpartitioned_order_id_key UNIQUE (order_id))")
+    op.execute("INSERT INTO payments_unpartitioned (id, order_id, amount, status, created_at, updated_at) "
+               "SELECT id, order_id, amount, status, created_at, updated_at FROM payments")
+    op.execute("ALTER SEQUENCE payments_id_seq OWNED BY payments_unpartitioned.id")
+    op.execute("DROP TABLE payments CASCADE")
+    op.execute("DROP TABLE payment_order_ids")
+
+    op.execute("ALTER TABLE payments_unpartitioned RENAME TO payments")
+    op.execute("ALTER TABLE payments RENAME CONSTRAINT payments_unpartitioned_pkey TO payments_pkey")
+    op.execute("ALTER TABLE payments RENAME CONSTRAINT payments_unpartitioned_order_id_key TO payments_order_id_key")
+    op.execute("CREATE INDEX ix_payments_id ON payments (id)")
+    op.execute("CREATE INDEX ix_payments_status_updated_at ON payments (status, updated_at)")
+    op.execute("CREATE INDEX ix_payments_in_flight_updated_at ON payments (updated_at) "
+               "WHERE status IN ('PENDING', 'PROCESSING')")
+    op.execute("CREATE INDEX ix_payments_created_at_brin ON payments USING brin (created_at)")
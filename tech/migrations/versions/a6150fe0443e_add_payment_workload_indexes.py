@@ -0,0 +1,56 @@
+"""Add payment workload indexes and REFUNDED status
+
+Revision ID: a6150fe0443e
+Revises: 13b202cd2040
+Create Date: 2026-10-17 10:12:41.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6150fe0443e'
+down_revision: Union[str, None] = '13b202cd2040'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY e ALTER TYPE ... ADD VALUE não podem rodar
+    # dentro da transação da migração. Se um índice concorrente falhar, ele
+    # fica INVALID e deve ser removido antes de rodar a migração de novo.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE paymentstatus ADD VALUE IF NOT EXISTS 'REFUNDED'")
+
+        # Varreduras e listagens por status e janela de atualização
+        op.create_index(
+            'ix_payments_status_updated_at', 'payments', ['status', 'updated_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Só os pagamentos em andamento, uma fração pequena da tabela
+        op.create_index(
+            'ix_payments_in_flight_updated_at', 'payments', ['updated_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_where=sa.text("status IN ('PENDING', 'PROCESSING')")
+        )
+        # created_at cresce com a ordem de inserção, então um BRIN cobre
+        # janelas de tempo com uma fração do tamanho de uma B-tree
+        op.create_index(
+            'ix_payments_created_at_brin', 'payments', ['created_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_using='brin'
+        )
+
+
+def downgrade() -> None:
+    # O PostgreSQL não remove valores de um enum; REFUNDED continua no tipo
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_created_at_brin', table_name='payments',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_payments_in_flight_updated_at', table_name='payments',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_payments_status_updated_at', table_name='payments',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,43 @@
+"""Add the payments (status, order_id) index for listings
+
+Revision ID: e3a91c5d7f24
+Revises: 5c1d7e93b0a2
+Create Date: 2026-10-17 16:20:48.391027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a91c5d7f24'
+down_revision: Union[str, None] = '5c1d7e93b0a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Um índice de tabela particionada não pode ser criado concorrentemente:
+    # o índice do pai nasce inválido (ON ONLY), o de cada partição é criado
+    # concorrentemente e anexado, e o do pai fica válido quando todas estiverem
+    # anexadas. Partições criadas depois já recebem o índice do pai.
+    op.execute("CREATE INDEX IF NOT EXISTS ix_payments_status_order_id ON ONLY payments (status, order_id)")
+    partitions = op.get_bind().execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'payments'::regclass ORDER BY c.relname"
+    )).scalars().all()
+
+    # Se um índice concorrente falhar, ele fica INVALID e deve ser removido
+    # antes de rodar a migração de novo
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            index = f"{partition}_status_order_id_idx"
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON {partition} (status, order_id)")
+            op.execute(f"ALTER INDEX ix_payments_status_order_id ATTACH PARTITION {index}")
+
+
+def downgrade() -> None:
+    # Remove também os índices das partições
+    op.execute("DROP INDEX IF EXISTS ix_payments_status_order_id")
@@ -1,14 +1,54 @@
+import os
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI
 
 from tech.api import  payments_router
+from tech.infra.databases.database import engine, database_pool_status, dispose_async_engine
+from tech.infra.databases.partitions import ensure_partitions_on_startup
+from tech.infra.http_client import create_orders_http_client
+from tech.infra.repositories.cached_payment_repository import create_payment_cache
+from tech.infra.webhook_event_queue import create_webhook_event_queue
 from tech.interfaces.schemas.message_schema import (
     Message,
 )
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cria os recursos compartilhados na inicialização e os libera quando a
+    aplicação encerra.
+
+    O cliente HTTP e o gateway do serviço de pedidos, com seu cache, e o cache
+    de pagamentos são criados uma vez e reaproveitados por todas as requisições.
+    A fila de eventos de webhook é consumida em segundo plano. As partições
+    mensais de `payments` dos próximos meses são garantidas antes de atender.
+
+    O uvicorn para de aceitar conexões e conclui as requisições em andamento
+    antes de executar o encerramento; em seguida os eventos de webhook
+    pendentes são aplicados e o cliente HTTP e os pools de conexões com o
+    banco, síncrono e assíncrono, são fechados.
+    """
+    ensure_partitions_on_startup(engine, int(os.getenv("PAYMENT_PARTITIONS_AHEAD", "3")))
+    app.state.orders_http_client = create_orders_http_client()
+    app.state.order_gateway = payments_router.create_order_gateway(app.state.orders_http_client)
+    app.state.payment_cache = create_payment_cache()
+    app.state.webhook_event_queue = create_webhook_event_queue(
+        lambda events: payments_router.apply_webhook_events(events, app.state.payment_cache)
+    )
+    app.state.webhook_event_queue.start()
+    yield
+    await app.state.webhook_event_queue.stop()
+    if hasattr(app.state.order_gateway, 'close'):
+        await app.state.order_gateway.close()
+    await app.state.orders_http_client.aclose()
+    engine.dispose()
+    await dispose_async_engine()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(payments_router.router, prefix='/payments', tags=['payments'])
 
@@ -17,3 +57,12 @@ app.include_router(payments_router.router, prefix='/payments', tags=['payments']
 @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
 def read_root():
     return {'message': 'Tech Challenge FIAP - Kauan Silva!  Payments Microservice'}
+
+
+@app.get('/metrics/database-pool', status_code=HTTPStatus.OK)
+def read_database_pool_metrics():
+    """
+    Conexões em uso, overflow e tempo de espera dos pools de conexões com o
+    banco deste processo.
+    """
+    return database_pool_status()
@@ -1,71 +1,167 @@
-from fastapi import APIRouter, Depends
+from datetime import date, datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
-from tech.infra.databases.database import get_session
+from tech.domain.entities.payments import PaymentStatus
+from tech.infra.databases.database import get_session, get_async_session, get_async_engine
+from tech.infra.webhook_event_queue import WebhookEventQueue
 from tech.interfaces.gateways.http_order_gateway import HttpOrderGateway  # Novo gateway HTTP
+from tech.interfaces.gateways.order_gateway import OrderGateway
+from tech.interfaces.gateways.cached_order_gateway import CachedOrderGateway, create_order_cache
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
 from tech.interfaces.repositories.payment_repository import PaymentRepository
 from tech.infra.repositories.sql_alchemy_payment_repository import SQLAlchemyPaymentRepository
-from tech.interfaces.schemas.payment_schema import PaymentCreate
+from tech.infra.repositories.sql_alchemy_async_payment_repository import SQLAlchemyAsyncPaymentRepository
+from tech.infra.repositories.cached_payment_repository import CachedPaymentRepository
+from tech.interfaces.schemas.payment_schema import (
+    MAX_PAYMENTS_PAGE,
+    PaymentBulkCreate,
+    PaymentCreate,
+    PaymentStatus as PaymentStatusSchema,
+    PaymentStatusBatchRequest,
+    WebhookEventBatch,
+)
 from tech.use_cases.payments.create_payment_use_case import CreatePaymentUseCase
 from tech.use_cases.payments.get_payment_status_use_case import GetPaymentStatusUseCase
-from tech.use_cases.payments.webhook_payment_use_case import WebhookHandlerUseCase
+from tech.use_cases.payments.get_payment_totals_use_case import GetPaymentTotalsUseCase
+from tech.use_cases.payments.list_payments_use_case import ListPaymentsUseCase
+from tech.use_cases.payments.webhook_payment_use_case import WebhookBatchHandlerUseCase, WebhookHandlerUseCase
 from tech.interfaces.controllers.payment_controller import PaymentController
 
 router = APIRouter()
 
 
-def get_order_gateway() -> HttpOrderGateway:
+def create_order_gateway(client=None) -> OrderGateway:
     """
-    Provides a configured HttpOrderGateway for communication with the orders service.
+    Builds the gateway for communication with the orders service.
+
+    When the order cache is enabled, the HttpOrderGateway is wrapped in a
+    CachedOrderGateway. The app lifespan builds one gateway per process so the
+    cache is shared by every request.
+
+    Args:
+        client: Pooled HTTP client shared with the orders service.
 
     Returns:
-        HttpOrderGateway: Gateway configured with the orders service URL.
+        The order gateway.
     """
     # Obter a URL do serviço de pedidos de variáveis de ambiente
     orders_service_url = os.getenv("SERVICE_ORDERS_URL", "http://host.docker.internal:8003")
-    return HttpOrderGateway(base_url=orders_service_url)
+    gateway = HttpOrderGateway(base_url=orders_service_url, client=client)
+
+    cache = create_order_cache()
+    if cache is None:
+        return gateway
+    return CachedOrderGateway(gateway, cache)
+
+
+def get_order_gateway(request: Request) -> OrderGateway:
+    """
+    Provides the order gateway for communication with the orders service.
 
+    Returns the gateway built in the app lifespan, which reuses the pooled
+    HTTP client and the order cache.
 
-def get_payment_repository(session: Session = Depends(get_session)) -> PaymentRepository:
+    Args:
+        request: The current request, used to reach the shared gateway.
+
+    Returns:
+        OrderGateway: Gateway configured with the orders service URL, cached when the order cache is enabled.
+    """
+    gateway = getattr(request.app.state, "order_gateway", None)
+    if gateway is None:
+        gateway = create_order_gateway(getattr(request.app.state, "orders_http_client", None))
+    return gateway
+
+
+def get_payment_repository(request: Request, session: Session = Depends(get_session)) -> PaymentRepository:
     """
     Provides a configured payment repository instance.
 
+    Reads go through the process-wide payment cache created in the app
+    lifespan, when it is enabled.
+
     Args:
+        request: The current request, used to reach the shared payment cache.
         session: SQLAlchemy database session.
 
     Returns:
         PaymentRepository: Repository for payment data operations.
     """
-    return SQLAlchemyPaymentRepository(session)
+    repository = SQLAlchemyPaymentRepository(session)
+    cache = getattr(request.app.state, "payment_cache", None)
+    if cache is None:
+        return repository
+    return CachedPaymentRepository(repository, cache)
+
+
+def get_async_payment_repository(session: AsyncSession = Depends(get_async_session)) -> AsyncPaymentRepository:
+    """
+    Provides a payment repository whose methods are coroutines, for async routes.
+
+    Args:
+        session: SQLAlchemy async database session.
+
+    Returns:
+        AsyncPaymentRepository: Async repository for payment data operations.
+    """
+    return SQLAlchemyAsyncPaymentRepository(session)
 
 
 def get_payment_controller(
-        payment_repository: PaymentRepository = Depends(get_payment_repository),
-        order_gateway: HttpOrderGateway = Depends(get_order_gateway)
+        payment_repository: PaymentRepository = Depends(get_payment_repository)
 ) -> PaymentController:
     """
-    Dependency injection for the PaymentController.
+    Dependency injection for the PaymentController of the sync routes.
+
+    The status and webhook routes run in the threadpool with the sync, cached
+    repository, so they never open an async session.
 
     Args:
         payment_repository: Repository for payment data operations.
+
+    Returns:
+        PaymentController: Instance of PaymentController with the status and webhook use cases.
+    """
+    return PaymentController(
+        get_payment_status_use_case=GetPaymentStatusUseCase(payment_repository),
+        webhook_handler_use_case=WebhookHandlerUseCase(payment_repository),
+    )
+
+
+def get_async_payment_controller(
+        async_payment_repository: AsyncPaymentRepository = Depends(get_async_payment_repository),
+        order_gateway: OrderGateway = Depends(get_order_gateway)
+) -> PaymentController:
+    """
+    Dependency injection for the PaymentController of the async routes.
+
+    The create, list and totals routes run on the event loop with the async
+    repository, so they never open a sync session.
+
+    Args:
+        async_payment_repository: Async repository used by the create, list and totals use cases.
         order_gateway: Gateway for communication with the orders service.
 
     Returns:
-        PaymentController: Instance of PaymentController with required dependencies.
+        PaymentController: Instance of PaymentController with the create, list and totals use cases.
     """
     return PaymentController(
         create_payment_use_case=CreatePaymentUseCase(
-            payment_repository=payment_repository,
-            order_gateway=order_gateway
+            payment_repository=async_payment_repository,
+            order_gateway=order_gateway,
+            max_concurrency=int(os.getenv("PAYMENT_BULK_CONCURRENCY", "20"))
         ),
-        get_payment_status_use_case=GetPaymentStatusUseCase(payment_repository),
-        webhook_handler_use_case=WebhookHandlerUseCase(payment_repository),
+        list_payments_use_case=ListPaymentsUseCase(async_payment_repository),
+        get_payment_totals_use_case=GetPaymentTotalsUseCase(async_payment_repository),
     )
 
 
 @router.post("/payments", status_code=201)
 async def create_payment(payment_data: PaymentCreate,
-                         controller: PaymentController = Depends(get_payment_controller)) -> dict:
+                         controller: PaymentController = Depends(get_async_payment_controller)) -> dict:
     """
     Creates a new payment.
 
@@ -79,6 +175,140 @@ async def create_payment(payment_data: PaymentCreate,
     return await controller.create_payment(payment_data)
 
 
+async def apply_webhook_events(events: list, payment_cache=None) -> None:
+    """
+    Applies a batch of queued webhook events with one bulk update and one commit.
+
+    Runs outside any request, so it opens its own async session. Cached
+    statuses of the orders actually changed are invalidated.
+
+    Args:
+        events: The WebhookEvent instances, in arrival order.
+        payment_cache: The process-wide payment cache, if enabled.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        use_case = WebhookBatchHandlerUseCase(SQLAlchemyAsyncPaymentRepository(session))
+        payments = await use_case.execute(
+            (event.order_id, PaymentStatus[event.status.name]) for event in events
+        )
+
+    if payment_cache is not None:
+        for payment in payments:
+            payment_cache.invalidate(payment.order_id)
+
+
+def get_webhook_event_queue(request: Request) -> WebhookEventQueue:
+    """
+    Provides the webhook event queue created in the app lifespan.
+
+    Args:
+        request: The current request, used to reach the shared queue.
+
+    Returns:
+        WebhookEventQueue: The queue consumed in the background.
+    """
+    return request.app.state.webhook_event_queue
+
+
+@router.post("/payments/bulk")
+async def create_payments(payments_data: PaymentBulkCreate,
+                          controller: PaymentController = Depends(get_async_payment_controller)) -> dict:
+    """
+    Creates the payments of several orders, reporting the outcome of each one.
+
+    Args:
+        payments_data: The IDs of the orders to create payments for.
+        controller: The PaymentController instance.
+
+    Returns:
+        One formatted result per order; orders that failed carry an error.
+    """
+    return await controller.create_payments(payments_data.order_ids)
+
+
+@router.post("/payments/statuses")
+def get_payment_statuses(batch: PaymentStatusBatchRequest,
+                         controller: PaymentController = Depends(get_payment_controller)) -> dict:
+    """
+    Retrieves the payment statuses of up to a few thousand orders with one query.
+
+    Args:
+        batch: The order IDs to look up.
+        controller: The PaymentController instance.
+
+    Returns:
+        The formatted payment statuses and the order IDs without a payment.
+    """
+    return controller.get_payment_statuses(batch.order_ids)
+
+
+@router.get("/payments")
+async def list_payments(status: Optional[List[PaymentStatusSchema]] = Query(None),
+                        created_from: Optional[datetime] = None,
+                        created_to: Optional[datetime] = None,
+                        updated_from: Optional[datetime] = None,
+                        updated_to: Optional[datetime] = None,
+                        cursor: Optional[int] = None,
+                        limit: int = Query(100, ge=1, le=MAX_PAYMENTS_PAGE),
+                        controller: PaymentController = Depends(get_async_payment_controller)) -> dict:
+    """
+    Lists payments ordered by order ID, with keyset pagination.
+
+    Pass the `next_cursor` of a page as `cursor` to get the next one; it is
+    null on the last page. Time windows include their start and exclude their end.
+
+    Args:
+        status: Only payments in one of these statuses; may be repeated.
+        created_from: Only payments created at or after this time.
+        created_to: Only payments created before this time.
+        updated_from: Only payments updated at or after this time.
+        updated_to: Only payments updated before this time.
+        cursor: The cursor returned with the previous page.
+        limit: Maximum number of payments in the page.
+        controller: The PaymentController instance.
+
+    Returns:
+        The formatted payments and the cursor of the next page.
+    """
+    return await controller.list_payments(
+        statuses=[item.value for item in status or []],
+        created_from=created_from,
+        created_to=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+@router.get("/payments/totals")
+async def get_payment_totals(day_from: Optional[date] = None,
+                             day_to: Optional[date] = None,
+                             status: Optional[List[PaymentStatusSchema]] = Query(None),
+                             controller: PaymentController = Depends(get_async_payment_controller)) -> dict:
+    """
+    Reports the number and amount of payments by creation day (UTC) and status.
+
+    Reads the rollup maintained with every payment write, so the cost depends
+    on the number of days requested, not on the number of payments. The day
+    window includes its start and excludes its end.
+
+    Args:
+        day_from: Only days on or after this one.
+        day_to: Only days before this one.
+        status: Only these statuses; may be repeated.
+        controller: The PaymentController instance.
+
+    Returns:
+        The count and amount of each day and status with payments.
+    """
+    return await controller.get_payment_totals(
+        day_from=day_from,
+        day_to=day_to,
+        statuses=[item.value for item in status or []],
+    )
+
+
 @router.get("/payments/{order_id}")
 def get_payment_status(order_id: int, controller: PaymentController = Depends(get_payment_controller)) -> dict:
     """
@@ -108,4 +338,28 @@ def webhook_payment(order_id: int, status: str,
     Returns:
         The updated payment status.
     """
-    return controller.webhook_payment(order_id, status)
\ No newline at end of file
+    return controller.webhook_payment(order_id, status)
+
+
+@router.post("/webhook/batch", status_code=202)
+async def webhook_payments(events: WebhookEventBatch,
+                           queue: WebhookEventQueue = Depends(get_webhook_event_queue)) -> dict:
+    """
+    Accepts a batch of payment status events and applies them in the background.
+
+    The events are validated and queued, and the response is sent right away;
+    a background consumer writes them with bulk updates.
+
+    Args:
+        events: The status events, up to MAX_WEBHOOK_EVENTS.
+        queue: The webhook event queue.
+
+    Returns:
+        The number of accepted events.
+
+    Raises:
+        HTTPException: 503 when the queue cannot take the whole batch.
+    """
+    if not queue.offer(events):
+        raise HTTPException(status_code=503, detail="Webhook queue is full, retry later")
+    return {"accepted": len(events)}
@@ -1,7 +1,7 @@
 from enum import Enum
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Dict, FrozenSet, Optional
 
 class PaymentStatus(Enum):
     PENDING = "PENDING"
@@ -11,6 +11,51 @@ class PaymentStatus(Enum):
     REFUNDED = "REFUNDED"
     ERROR = "ERROR"
 
+    def allowed_from(self) -> FrozenSet["PaymentStatus"]:
+        """
+        Statuses from which a payment may move to this status, including this
+        status itself so that repeated notifications are harmless.
+        """
+        return _ALLOWED_FROM[self]
+
+    def can_transition_to(self, status: "PaymentStatus") -> bool:
+        return self in _ALLOWED_FROM[status]
+
+    def is_final(self) -> bool:
+        """
+        Whether a payment in this status can never move to another one.
+        """
+        return not _TRANSITIONS[self]
+
+
+class InvalidStatusTransition(ValueError):
+    """
+    Raised when a payment cannot move from its current status to the requested one.
+    """
+
+
+_TRANSITIONS: Dict[PaymentStatus, FrozenSet[PaymentStatus]] = {
+    PaymentStatus.PENDING: frozenset({
+        PaymentStatus.PROCESSING, PaymentStatus.APPROVED, PaymentStatus.REJECTED, PaymentStatus.ERROR,
+    }),
+    # The provider may hand a payment back as awaiting confirmation (PENDING)
+    PaymentStatus.PROCESSING: frozenset({
+        PaymentStatus.PENDING, PaymentStatus.APPROVED, PaymentStatus.REJECTED, PaymentStatus.ERROR,
+    }),
+    PaymentStatus.ERROR: frozenset({PaymentStatus.PROCESSING, PaymentStatus.APPROVED, PaymentStatus.REJECTED}),
+    PaymentStatus.APPROVED: frozenset({PaymentStatus.REFUNDED}),
+    PaymentStatus.REJECTED: frozenset(),
+    PaymentStatus.REFUNDED: frozenset(),
+}
+
+# Precomputed inverse of _TRANSITIONS, used to build `status IN (...)` guards
+_ALLOWED_FROM: Dict[PaymentStatus, FrozenSet[PaymentStatus]] = {
+    target: frozenset(
+        source for source, targets in _TRANSITIONS.items() if target in targets
+    ) | {target}
+    for target in PaymentStatus
+}
+
 @dataclass
 class Payment:
     order_id: int
@@ -20,4 +65,12 @@ class Payment:
     updated_at: Optional[datetime] = None
     transaction_id: Optional[str] = None
     error_message: Optional[str] = None
-    payment_method: Optional[str] = None
\ No newline at end of file
+    payment_method: Optional[str] = None
+
+
+@dataclass
+class PaymentDailyTotal:
+    day: date
+    status: PaymentStatus
+    count: int
+    amount: float
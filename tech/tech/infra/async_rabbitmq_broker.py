@@ -1,7 +1,8 @@
 import json
 import asyncio
-from typing import Dict, Any, Callable, Optional
-from tech.interfaces.message_broker import MessageBroker
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterator, Optional
+from tech.interfaces.message_broker import MessageBroker, MessageBatch
 from tech.infra.rabbitmq_broker import RabbitMQBroker
 
 
@@ -10,7 +11,9 @@ class AsyncRabbitMQBroker(MessageBroker):
     Implementação assíncrona de MessageBroker usando RabbitMQ.
 
     Esta classe adapta os métodos síncronos do RabbitMQBroker para serem
-    usados em contextos assíncronos.
+    usados em contextos assíncronos. Todas as operações assíncronas rodam em
+    um executor de uma única thread, pois a conexão bloqueante do pika não
+    pode ser usada por várias threads ao mesmo tempo.
     """
 
     def __init__(self, host: str, port: int, user: str, password: str):
@@ -29,6 +32,7 @@ class AsyncRabbitMQBroker(MessageBroker):
             user=user,
             password=password
         )
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rabbitmq-broker")
 
     def publish(self, queue: str, message: Dict[str, Any]) -> None:
         """
@@ -54,7 +58,7 @@ class AsyncRabbitMQBroker(MessageBroker):
         """
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(
-            None,
+            self._executor,
             lambda: self.sync_broker.publish(queue, message)
         )
 
@@ -69,6 +73,35 @@ class AsyncRabbitMQBroker(MessageBroker):
         """
         self.sync_broker.consume(queue, callback)
 
+    def consume_batch(
+            self,
+            queue: str,
+            max_batch: int,
+            max_wait: float,
+            prefetch_count: Optional[int] = None
+    ) -> Iterator[MessageBatch]:
+        """
+        Método síncrono de consumo em lotes para compatibilidade com a interface.
+        Redireciona para o broker síncrono.
+
+        Args:
+            queue: Nome da fila para consumir
+            max_batch: Número máximo de mensagens por lote
+            max_wait: Tempo máximo, em segundos, para completar um lote
+            prefetch_count: Número máximo de mensagens não confirmadas
+
+        Returns:
+            Um gerador de lotes que devem ser confirmados com ack() ou nack()
+        """
+        return self.sync_broker.consume_batch(queue, max_batch, max_wait, prefetch_count=prefetch_count)
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Indica se a conexão do broker síncrono continua aberta.
+        """
+        return self.sync_broker.is_open
+
     def close(self) -> None:
         """
         Fecha a conexão com o RabbitMQ.
@@ -76,6 +109,7 @@ class AsyncRabbitMQBroker(MessageBroker):
         Redireciona para o método de fechamento do broker síncrono.
         """
         self.sync_broker.close()
+        self._executor.shutdown(wait=False)
 
     async def close_async(self) -> None:
         """
@@ -86,7 +120,7 @@ class AsyncRabbitMQBroker(MessageBroker):
         """
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(
-            None,
+            self._executor,
             lambda: self.sync_broker.close()
         )
 
@@ -0,0 +1,669 @@
+import os
+import json
+import asyncio
+import inspect
+import logging
+import itertools
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.exceptions import AMQPConnectionError, ChannelClosed, NackError
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional
+from tech.interfaces.message_broker import MessageBroker, MessageBatch
+from tech.infra.rabbitmq_broker import AckTracker, decode_batch, message_properties
+
+logger = logging.getLogger("asyncio_rabbitmq_broker")
+
+
+class ConfirmingChannel:
+    """
+    Canal de publicação em modo confirm.
+
+    Associa cada publicação a um future resolvido quando o servidor envia o
+    Basic.Ack/Basic.Nack correspondente, inclusive confirmações agrupadas com
+    `multiple=True`, permitindo aguardar várias publicações de uma só vez.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self._next_delivery_tag = 1
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    @property
+    def is_open(self) -> bool:
+        return self.channel.is_open
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def enable_confirms(self) -> None:
+        loop = asyncio.get_running_loop()
+        selected = loop.create_future()
+        self.channel.confirm_delivery(
+            ack_nack_callback=self._on_confirm,
+            callback=lambda frame: _set_result(selected, frame)
+        )
+        await selected
+
+    def publish(self, queue: str, body: str, properties) -> asyncio.Future:
+        """
+        Publica uma mensagem e retorna o future da sua confirmação.
+        """
+        confirmed = asyncio.get_running_loop().create_future()
+        self.channel.basic_publish(exchange='', routing_key=queue, body=body, properties=properties)
+        self._pending[self._next_delivery_tag] = confirmed
+        self._next_delivery_tag += 1
+        return confirmed
+
+    def _on_confirm(self, frame) -> None:
+        method = frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+
+        if method.multiple:
+            tags = [tag for tag in self._pending if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+
+        for tag in tags:
+            future = self._pending.pop(tag, None)
+            if future is not None:
+                _set_result(future, acked)
+
+    async def wait_for_confirms(self) -> None:
+        """
+        Aguarda as confirmações de todas as publicações pendentes neste canal.
+        """
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+    def fail_pending(self, reason: BaseException) -> None:
+        """
+        Falha todas as confirmações pendentes, por exemplo quando o canal fecha.
+        """
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            _set_exception(future, ChannelClosed(-1, f"Publisher channel closed: {reason}"))
+
+
+class AsyncioRabbitMQBroker(MessageBroker):
+    """
+    Implementação de MessageBroker nativa de asyncio usando RabbitMQ.
+
+    Usa o adaptador AsyncioConnection do pika: publicação, consumo e fechamento
+    rodam no próprio loop de eventos, sem threads auxiliares. A conexão é aberta
+    sob demanda no loop em execução, então a mesma classe serve tanto para a API
+    FastAPI quanto para o worker.
+
+    As publicações assíncronas usam um pool de canais em modo confirm, escolhidos
+    em rodízio, e as filas já declaradas na conexão ficam em cache, de modo que
+    `queue_declare` só é enviado na primeira publicação de cada fila.
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            user: str,
+            password: str,
+            publisher_channels: int = 2,
+            connection_factory: Callable[..., Any] = AsyncioConnection
+    ):
+        """
+        Inicializa o broker sem abrir a conexão.
+
+        Args:
+            host: Endereço do host RabbitMQ
+            port: Porta do serviço RabbitMQ
+            user: Nome de usuário para autenticação
+            password: Senha para autenticação
+            publisher_channels: Tamanho do pool de canais de publicação com confirmação
+            connection_factory: Fábrica da conexão assíncrona (substituível em testes)
+        """
+        credentials = pika.PlainCredentials(user, password)
+        self.connection_params = pika.ConnectionParameters(
+            host=host,
+            port=port,
+            credentials=credentials,
+            heartbeat=600,
+            blocked_connection_timeout=300
+        )
+        self._connection_factory = connection_factory
+        self.publisher_channels = max(1, publisher_channels)
+        self.connection = None
+        self.channel = None
+        self._publishers: List[Optional[asyncio.Future]] = []
+        self._publisher_slots = itertools.cycle(range(self.publisher_channels))
+        self._declared_queues = set()
+        self._consumer_tasks = set()
+        self._connect_lock = None
+        self._closed = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Indica se a conexão e o canal continuam abertos.
+        """
+        return bool(
+            self.connection is not None and self.connection.is_open
+            and self.channel is not None and self.channel.is_open
+        )
+
+    @property
+    def closed(self) -> Optional[asyncio.Future]:
+        """
+        Future resolvido quando a conexão é fechada, com a exceção caso tenha caído.
+        """
+        return self._closed
+
+    async def connect(self) -> None:
+        """
+        Abre a conexão e o canal de consumo no loop em execução, se ainda não estiverem abertos.
+
+        Se apenas o canal tiver sido fechado, um novo canal é aberto na conexão existente.
+
+        Raises:
+            AMQPConnectionError: Se não for possível conectar ao RabbitMQ.
+        """
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self.is_open:
+                return
+
+            if self.connection is None or not self.connection.is_open:
+                await self._open_connection()
+
+            self.channel = await self._open_channel()
+            self.channel.add_on_close_callback(self._on_channel_closed)
+
+    async def _open_connection(self) -> None:
+        loop = asyncio.get_running_loop()
+        opened = loop.create_future()
+        self._closed = loop.create_future()
+        self._declared_queues.clear()
+        self._publishers = [None] * self.publisher_channels
+
+        def on_open(connection):
+            _set_result(opened, connection)
+
+        def on_open_error(connection, error):
+            _set_exception(opened, AMQPConnectionError(error))
+
+        self.connection = self._connection_factory(
+            parameters=self.connection_params,
+            on_open_callback=on_open,
+            on_open_error_callback=on_open_error,
+            on_close_callback=self._on_connection_closed,
+            custom_ioloop=loop
+        )
+        await opened
+
+    async def _open_channel(self):
+        loop = asyncio.get_running_loop()
+        opened = loop.create_future()
+        self.connection.channel(on_open_callback=lambda ch: _set_result(opened, ch))
+        return await opened
+
+    async def _acquire_publisher(self) -> ConfirmingChannel:
+        """
+        Retorna o próximo canal de publicação do pool, abrindo-o se necessário.
+
+        Cada posição do pool guarda o future de abertura do canal, para que
+        chamadas concorrentes compartilhem a mesma abertura.
+        """
+        await self._ensure_connected()
+        slot = next(self._publisher_slots)
+        opening = self._publishers[slot]
+
+        if opening is None or (opening.done() and (
+                opening.exception() is not None or not opening.result().is_open)):
+            opening = asyncio.ensure_future(self._open_publisher())
+            self._publishers[slot] = opening
+
+        return await opening
+
+    async def _open_publisher(self) -> ConfirmingChannel:
+        channel = await self._open_channel()
+        publisher = ConfirmingChannel(channel)
+        channel.add_on_close_callback(
+            lambda ch, reason: self._on_publisher_closed(publisher, reason)
+        )
+        await publisher.enable_confirms()
+        return publisher
+
+    def _on_publisher_closed(self, publisher: ConfirmingChannel, reason) -> None:
+        logger.warning(f"RabbitMQ publisher channel closed: {reason}")
+        publisher.fail_pending(reason)
+
+    def _open_publishers(self) -> List[ConfirmingChannel]:
+        return [
+            opening.result() for opening in self._publishers
+            if opening is not None and opening.done() and opening.exception() is None
+        ]
+
+    def _on_connection_closed(self, connection, reason) -> None:
+        logger.info(f"RabbitMQ connection closed: {reason}")
+        self.channel = None
+        self._declared_queues.clear()
+        for publisher in self._open_publishers():
+            publisher.fail_pending(reason)
+        self._publishers = [None] * self.publisher_channels
+        if self._closed is not None and not self._closed.done():
+            if isinstance(reason, BaseException) and not _is_normal_shutdown(reason):
+                self._closed.set_exception(reason)
+                # Evita aviso de exceção não recuperada quando ninguém aguarda o fechamento
+                self._closed.exception()
+            else:
+                self._closed.set_result(None)
+
+    def _on_channel_closed(self, channel, reason) -> None:
+        logger.warning(f"RabbitMQ channel closed: {reason}")
+        if channel is self.channel:
+            self.channel = None
+
+    async def _ensure_connected(self) -> None:
+        if not self.is_open:
+            await self.connect()
+
+    async def declare_queue(self, queue: str, arguments: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Declara uma fila durável uma única vez por conexão.
+
+        Args:
+            queue: Nome da fila a declarar
+            arguments: Argumentos opcionais da fila, como x-message-ttl ou x-dead-letter-*
+        """
+        if queue in self._declared_queues:
+            return
+
+        await self._ensure_connected()
+        loop = asyncio.get_running_loop()
+        declared = loop.create_future()
+        self.channel.queue_declare(
+            queue=queue,
+            durable=True,
+            arguments=arguments,
+            callback=lambda frame: _set_result(declared, frame)
+        )
+        await declared
+        self._declared_queues.add(queue)
+
+    def publish(self, queue: str, message: Dict[str, Any]) -> None:
+        """
+        Publica uma mensagem sem aguardar o servidor.
+
+        Deve ser chamado na thread do loop com a conexão já aberta. A declaração
+        da fila, quando necessária, é enviada antes da publicação no mesmo canal,
+        o que garante a ordem no servidor.
+
+        Args:
+            queue: Nome da fila para publicar a mensagem
+            message: Mensagem a ser publicada
+
+        Raises:
+            ChannelClosed: Se a conexão não estiver aberta.
+        """
+        if not self.is_open:
+            raise ChannelClosed(-1, "Broker is not connected")
+
+        if queue not in self._declared_queues:
+            self.channel.queue_declare(queue=queue, durable=True)
+            self._declared_queues.add(queue)
+
+        self._basic_publish(queue, message)
+
+    async def publish_async(
+            self,
+            queue: str,
+            message: Dict[str, Any],
+            headers: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Publica uma mensagem e aguarda a confirmação do servidor.
+
+        Args:
+            queue: Nome da fila para publicar a mensagem
+            message: Mensagem a ser publicada
+            headers: Cabeçalhos AMQP opcionais da mensagem
+
+        Raises:
+            NackError: Se o servidor recusar a mensagem.
+        """
+        await self.publish_many(queue, [message], headers=headers)
+
+    async def publish_many(
+            self,
+            queue: str,
+            messages: List[Dict[str, Any]],
+            headers: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Publica um lote de mensagens em um canal do pool e aguarda as confirmações em bloco.
+
+        Todas as mensagens são enviadas antes de aguardar qualquer confirmação,
+        então o lote custa aproximadamente uma ida e volta ao servidor.
+
+        Args:
+            queue: Nome da fila para publicar as mensagens
+            messages: Mensagens a serem publicadas
+            headers: Cabeçalhos AMQP opcionais aplicados a todas as mensagens
+
+        Raises:
+            NackError: Se o servidor recusar alguma das mensagens.
+            ChannelClosed: Se o canal fechar antes das confirmações chegarem.
+        """
+        if not messages:
+            return
+
+        await self.declare_queue(queue)
+        publisher = await self._acquire_publisher()
+
+        confirmations = [
+            publisher.publish(queue, json.dumps(message), message_properties(headers))
+            for message in messages
+        ]
+        results = await asyncio.gather(*confirmations)
+
+        nacked = [message for message, acked in zip(messages, results) if not acked]
+        if nacked:
+            raise NackError(nacked)
+
+    def _basic_publish(self, queue: str, message: Dict[str, Any]) -> None:
+        self.channel.basic_publish(
+            exchange='',
+            routing_key=queue,
+            body=json.dumps(message),
+            properties=message_properties()
+        )
+
+    def consume(self, queue: str, callback: Callable[[dict], Any]) -> asyncio.Task:
+        """
+        Agenda o consumo de uma fila no loop em execução.
+
+        Args:
+            queue: Nome da fila para consumir
+            callback: Função ou corrotina chamada para cada mensagem
+
+        Returns:
+            A task que registra o consumidor; seu resultado é a consumer tag.
+        """
+        return asyncio.ensure_future(self.consume_async(queue, callback))
+
+    async def consume_async(
+            self,
+            queue: str,
+            callback: Callable[[dict], Any],
+            prefetch_count: int = 1
+    ) -> str:
+        """
+        Registra um consumidor na fila e retorna sem bloquear o loop.
+
+        O callback recebe a mensagem decodificada. Se ele retornar um awaitable,
+        a mensagem é processada em uma task e confirmada quando ela termina, o que
+        permite processar até `prefetch_count` mensagens ao mesmo tempo. Falhas no
+        callback geram nack com reenfileiramento; mensagens que não são JSON válido
+        são descartadas com ack.
+
+        Args:
+            queue: Nome da fila para consumir
+            callback: Função ou corrotina chamada para cada mensagem
+            prefetch_count: Número máximo de mensagens não confirmadas
+
+        Returns:
+            A consumer tag registrada.
+        """
+        await self.declare_queue(queue)
+
+        loop = asyncio.get_running_loop()
+        qos_ok = loop.create_future()
+        self.channel.basic_qos(
+            prefetch_count=prefetch_count,
+            callback=lambda frame: _set_result(qos_ok, frame)
+        )
+        await qos_ok
+
+        channel = self.channel
+
+        def on_message(ch, method, properties, body):
+            self._dispatch(channel, method.delivery_tag, body, callback)
+
+        consume_ok = loop.create_future()
+        consumer_tag = channel.basic_consume(
+            queue=queue,
+            on_message_callback=on_message,
+            callback=lambda frame: _set_result(consume_ok, frame)
+        )
+        await consume_ok
+        logger.info(f"Consuming from '{queue}' with prefetch {prefetch_count}")
+        return consumer_tag
+
+    async def consume_batch(
+            self,
+            queue: str,
+            max_batch: int,
+            max_wait: float,
+            prefetch_count: Optional[int] = None
+    ) -> AsyncIterator[MessageBatch]:
+        """
+        Consome a fila em lotes, agrupando as entregas que chegam dentro de uma janela.
+
+        Cada lote é emitido ao atingir `max_batch` mensagens ou quando `max_wait`
+        segundos se passam desde a primeira mensagem do lote. O consumidor confirma
+        o lote inteiro com `MessageBatch.ack()`, enviado como um único ack com
+        `multiple=True` assim que os lotes anteriores também forem confirmados.
+        Mensagens que não são JSON válido são descartadas com ack.
+
+        A iteração termina quando a conexão é fechada normalmente; ao encerrar,
+        o consumidor é cancelado e as entregas ainda não emitidas são devolvidas à fila.
+
+        Args:
+            queue: Nome da fila para consumir
+            max_batch: Número máximo de mensagens por lote
+            max_wait: Tempo máximo, em segundos, para completar um lote
+            prefetch_count: Número máximo de mensagens não confirmadas. Padrão: max_batch
+
+        Yields:
+            Lotes de mensagens decodificadas.
+
+        Raises:
+            Exception: Se a conexão ou o canal de consumo cair.
+        """
+        max_batch = max(1, max_batch)
+        await self.declare_queue(queue)
+
+        loop = asyncio.get_running_loop()
+        channel = self.channel
+        qos_ok = loop.create_future()
+        channel.basic_qos(
+            prefetch_count=prefetch_count or max_batch,
+            callback=lambda frame: _set_result(qos_ok, frame)
+        )
+        await qos_ok
+
+        tracker = AckTracker(channel)
+        deliveries: asyncio.Queue = asyncio.Queue()
+        channel_closed = loop.create_future()
+        channel.add_on_close_callback(lambda ch, reason: _set_result(channel_closed, reason))
+
+        def on_message(ch, method, properties, body):
+            tracker.delivered(method.delivery_tag)
+            deliveries.put_nowait((method.delivery_tag, properties, body))
+
+        consume_ok = loop.create_future()
+        consumer_tag = channel.basic_consume(
+            queue=queue,
+            on_message_callback=on_message,
+            callback=lambda frame: _set_result(consume_ok, frame)
+        )
+        await consume_ok
+        logger.info(f"Consuming from '{queue}' in batches of up to {max_batch}")
+
+        try:
+            while True:
+                next_delivery = asyncio.ensure_future(deliveries.get())
+                await asyncio.wait({next_delivery, channel_closed}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_delivery.done():
+                    next_delivery.cancel()
+                    reason = channel_closed.result()
+                    if isinstance(reason, BaseException) and not _is_normal_close(reason):
+                        raise reason
+                    return
+
+                pending = [next_delivery.result()]
+                deadline = loop.time() + max_wait
+                while len(pending) < max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0 or channel_closed.done():
+                        break
+                    try:
+                        pending.append(await asyncio.wait_for(deliveries.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                batch = decode_batch(pending, tracker)
+                if batch.messages:
+                    yield batch
+        finally:
+            if channel.is_open:
+                channel.basic_cancel(consumer_tag=consumer_tag)
+                unclaimed = []
+                while not deliveries.empty():
+                    delivery_tag, _, _ = deliveries.get_nowait()
+                    unclaimed.append(delivery_tag)
+                tracker.nack(unclaimed, requeue=True)
+
+    def _dispatch(self, channel, delivery_tag, body, callback) -> None:
+        try:
+            message = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logger.error(f"Discarding undecodable message: {body!r}")
+            channel.basic_ack(delivery_tag=delivery_tag)
+            return
+
+        try:
+            result = callback(message)
+        except Exception as e:
+            logger.error(f"Error handling message: {str(e)}")
+            channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            return
+
+        if not inspect.isawaitable(result):
+            channel.basic_ack(delivery_tag=delivery_tag)
+            return
+
+        task = asyncio.ensure_future(result)
+        self._consumer_tasks.add(task)
+
+        def settle(done):
+            self._consumer_tasks.discard(done)
+            if not channel.is_open:
+                # O servidor reentrega mensagens não confirmadas de canais fechados
+                return
+            if done.cancelled() or done.exception() is not None:
+                if not done.cancelled():
+                    logger.error(f"Error handling message: {str(done.exception())}")
+                channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            else:
+                channel.basic_ack(delivery_tag=delivery_tag)
+
+        task.add_done_callback(settle)
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Aguarda as confirmações pendentes em todos os canais de publicação.
+
+        Args:
+            timeout: Tempo máximo de espera, em segundos
+
+        Raises:
+            asyncio.TimeoutError: Se as confirmações não chegarem a tempo.
+        """
+        waiting = [publisher.wait_for_confirms() for publisher in self._open_publishers()]
+        if waiting:
+            await asyncio.wait_for(asyncio.gather(*waiting), timeout)
+
+    async def cancel(self, consumer_tag: str) -> None:
+        """
+        Cancela um consumidor, parando o recebimento de novas mensagens.
+
+        Args:
+            consumer_tag: Tag retornada por consume_async
+        """
+        if not self.is_open:
+            return
+        loop = asyncio.get_running_loop()
+        cancelled = loop.create_future()
+        self.channel.basic_cancel(
+            consumer_tag=consumer_tag,
+            callback=lambda frame: _set_result(cancelled, frame)
+        )
+        await cancelled
+
+    def close(self) -> None:
+        """
+        Inicia o fechamento da conexão sem aguardar sua conclusão.
+        """
+        if self.connection is not None and self.connection.is_open:
+            self.connection.close()
+
+    async def close_async(self) -> None:
+        """
+        Fecha a conexão e aguarda a confirmação do servidor.
+        """
+        if self.connection is None or not (self.connection.is_open or self.connection.is_opening):
+            return
+        self.connection.close()
+        if self._closed is not None:
+            try:
+                await self._closed
+            except Exception as e:
+                logger.warning(f"Connection closed with error: {str(e)}")
+
+
+def _set_result(future: asyncio.Future, value: Any) -> None:
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_exception(future: asyncio.Future, error: BaseException) -> None:
+    if not future.done():
+        future.set_exception(error)
+
+
+def _is_normal_shutdown(reason: BaseException) -> bool:
+    return getattr(reason, 'reply_code', None) == 200
+
+
+def _is_normal_close(reason: BaseException) -> bool:
+    # Canais fechados pelo cliente usam reply_code 0; conexões, 200
+    return getattr(reason, 'reply_code', None) in (0, 200)
+
+
+def create_asyncio_rabbitmq_broker(
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        publisher_channels: Optional[int] = None
+) -> AsyncioRabbitMQBroker:
+    """
+    Cria um broker asyncio configurado, usando as variáveis de ambiente como padrão.
+
+    Args:
+        host: Endereço do host RabbitMQ (RABBITMQ_HOST)
+        port: Porta do serviço RabbitMQ (RABBITMQ_PORT)
+        user: Nome de usuário para autenticação (RABBITMQ_USER)
+        password: Senha para autenticação (RABBITMQ_PASS)
+        publisher_channels: Canais de publicação no pool (RABBITMQ_PUBLISHER_CHANNELS)
+
+    Returns:
+        Uma instância de AsyncioRabbitMQBroker ainda não conectada
+    """
+    return AsyncioRabbitMQBroker(
+        host=host or os.getenv("RABBITMQ_HOST", "localhost"),
+        port=port or int(os.getenv("RABBITMQ_PORT", "5672")),
+        user=user or os.getenv("RABBITMQ_USER", "user"),
+        password=password or os.getenv("RABBITMQ_PASS", "password"),
+        publisher_channels=publisher_channels or int(os.getenv("RABBITMQ_PUBLISHER_CHANNELS", "2"))
+    )
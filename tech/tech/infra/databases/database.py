@@ -1,22 +1,136 @@
+from typing import Any, Dict
+
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from tech.infra.databases.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    pool_status,
+)
 from tech.infra.settings.settings import Settings
-from pydantic_settings import BaseSettings
 
 
-class Settings(BaseSettings):
-    DATABASE_URL: str = "sqlite:///:memory:"  # Default for testing
+def engine_options(settings: Settings, url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Monta os argumentos do pool de conexões a partir das configurações.
+
+    No modo PgBouncer (DB_PGBOUNCER) o pool local é desativado com NullPool e,
+    com o psycopg 3, os prepared statements no servidor são desligados, pois
+    em modo transaction cada transação pode cair numa conexão diferente. O
+    SQLite mantém o pool padrão do SQLAlchemy.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+
+    options: Dict[str, Any] = {}
+    if url.get_driver_name() == "psycopg" and settings.DB_PGBOUNCER:
+        options["connect_args"] = {"prepare_threshold": None}
 
-    class Config:
-        env_file = ".env"
+    if settings.DB_PGBOUNCER:
+        options["poolclass"] = NullPool
+        return options
 
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def create_database_engine(settings: Settings) -> Engine:
+    """
+    Cria o engine síncrono com o pool configurado por `engine_options`.
+    """
+    engine = create_engine(settings.DATABASE_URL, **engine_options(settings, settings.DATABASE_URL))
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = PoolMetrics()
+    return engine
 
 
 load_dotenv()
-engine = create_engine(Settings().DATABASE_URL)
+settings = Settings()
+engine = create_database_engine(settings)
+
+_async_engine = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    Converte a URL do banco para um driver assíncrono.
+
+    URLs do PostgreSQL passam a usar o psycopg 3, que o SQLAlchemy conecta
+    em modo assíncrono quando usado por `create_async_engine`.
+    """
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+psycopg")
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Retorna o engine assíncrono, criando-o no primeiro uso.
+
+    A criação é adiada para que processos que só usam o engine síncrono,
+    como os workers, não dependam do driver assíncrono.
+
+    Raises:
+        ValueError: Se o driver assíncrono do DATABASE_URL não estiver instalado.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = async_database_url(settings.DATABASE_URL)
+        try:
+            _async_engine = create_async_engine(url, **engine_options(settings, url, is_async=True))
+        except ModuleNotFoundError as e:
+            raise ValueError(
+                f"DATABASE_URL needs the async driver '{e.name}', which is not installed; "
+                f"the async routes cannot run with {make_url(url).drivername}"
+            ) from e
+        if isinstance(_async_engine.pool, InstrumentedAsyncQueuePool):
+            _async_engine.pool.metrics = PoolMetrics()
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """
+    Fecha o pool de conexões assíncrono, se ele foi criado.
+    """
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+def database_pool_status() -> Dict[str, Any]:
+    """
+    Retorna as métricas dos pools de conexões deste processo.
+
+    O pool assíncrono só aparece depois de criado.
+    """
+    status = {"sync": pool_status(engine.pool)}
+    if _async_engine is not None:
+        status["async"] = pool_status(_async_engine.pool)
+    return status
 
 
 def get_session():  # pragma: no cover
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():  # pragma: no cover
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,167 @@
+import re
+import logging
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger("payment_partitions")
+
+PAYMENTS_TABLE = "payments"
+PARTITION_NAME = re.compile(r"^payments_y(\d{4})m(\d{2})$")
+
+# Chave arbitrária do advisory lock que serializa a criação de partições
+# entre as réplicas da API e o job de arquivamento
+PARTITION_LOCK_KEY = 7_402_117
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """
+    Nome da partição mensal de `payments` que começa em `month`.
+    """
+    return f"{PAYMENTS_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """
+    Mês de uma partição a partir do nome, ou None se não for uma partição mensal.
+    """
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PAYMENTS_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def ensure_partitions(connection, months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """
+    Cria as partições mensais que faltam até `months_ahead` meses após o atual.
+
+    Só são criados meses posteriores à partição mensal mais recente, pois os
+    anteriores já existem ou estão cobertos pela partição legada. É idempotente
+    e pode rodar em várias réplicas ao mesmo tempo: um advisory lock da
+    transação serializa a criação. Em bancos que não são PostgreSQL não faz nada.
+
+    Args:
+        connection: Conexão SQLAlchemy; a transação é confirmada ao final
+        months_ahead: Quantos meses futuros devem existir além do atual
+        today: Data de referência. Padrão: hoje, em UTC
+
+    Returns:
+        Os nomes das partições criadas
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+
+    current = month_start(today or datetime.utcnow().date())
+    existing = [month for month in map(partition_month, list_partitions(connection)) if month is not None]
+    month = add_months(max(existing), 1) if existing else current
+    last = add_months(current, months_ahead)
+
+    created = []
+    while month <= last:
+        connection.execute(text(create_partition_sql(month)))
+        created.append(partition_name(month))
+        month = add_months(month, 1)
+    connection.commit()
+    return created
+
+
+def ensure_partitions_on_startup(engine, months_ahead: int = 3) -> None:
+    """
+    Garante as partições futuras na inicialização do processo.
+
+    Uma falha é apenas registrada: as partições já existentes cobrem os
+    próximos meses e o job de arquivamento também as cria.
+    """
+    try:
+        with engine.connect() as connection:
+            ensure_partitions(connection, months_ahead)
+    except Exception as e:
+        logger.warning(f"Failed to ensure payment partitions: {str(e)}")
+
+
+def list_partitions(connection) -> List[str]:
+    """
+    Nomes das partições atualmente anexadas a `payments`.
+
+    Partições com um DETACH ... CONCURRENTLY interrompido não entram aqui;
+    elas são listadas por `list_pending_detach_partitions`.
+    """
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = CAST(:table AS regclass) "
+        "AND NOT pg_inherits.inhdetachpending "
+        "ORDER BY child.relname"
+    ), {"table": PAYMENTS_TABLE})
+    return [row[0] for row in rows]
+
+
+def list_pending_detach_partitions(connection) -> List[str]:
+    """
+    Partições de `payments` cujo DETACH ... CONCURRENTLY foi interrompido
+    entre as suas duas transações.
+
+    Elas continuam como partição (relispartition), mas não aceitam outro
+    DETACH CONCURRENTLY; o desanexo precisa ser concluído com FINALIZE.
+    """
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = CAST(:table AS regclass) "
+        "AND pg_inherits.inhdetachpending "
+        "ORDER BY child.relname"
+    ), {"table": PAYMENTS_TABLE})
+    return [row[0] for row in rows]
+
+
+def list_detached_partitions(connection) -> List[str]:
+    """
+    Tabelas com nome de partição mensal que não estão anexadas a `payments`,
+    deixadas por um arquivamento interrompido depois do DETACH.
+    """
+    rows = connection.execute(text(
+        "SELECT relname FROM pg_class "
+        "WHERE relkind = 'r' AND NOT relispartition AND relname ~ :pattern "
+        "ORDER BY relname"
+    ), {"pattern": PARTITION_NAME.pattern})
+    return [row[0] for row in rows]
+
+
+def expired_partitions(names: List[str], retention_months: int, today: Optional[date] = None) -> List[str]:
+    """
+    Partições mensais que terminam antes do início do período de retenção.
+
+    Partições que não seguem o nome mensal, como a partição com os dados
+    anteriores ao particionamento, nunca são selecionadas.
+
+    Args:
+        names: Nomes das partições
+        retention_months: Meses completos mantidos antes do mês atual
+        today: Data de referência. Padrão: hoje, em UTC
+    """
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -retention_months)
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
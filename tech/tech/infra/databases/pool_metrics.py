@@ -0,0 +1,113 @@
+import time
+import threading
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Contadores de uso de um pool de conexões com o banco.
+
+    Registra quantas conexões foram retiradas do pool, quanto tempo cada
+    retirada esperou, quantas precisaram abrir uma conexão de overflow e
+    quantas desistiram por timeout. Os contadores são protegidos por um lock,
+    pois o pool síncrono é usado a partir de várias threads.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.overflow_events += int(overflowed)
+            self._record_wait(wait)
+
+    def record_timeout(self, wait: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self._record_wait(wait)
+
+    def _record_wait(self, wait: float) -> None:
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Retorna os contadores junto com o estado atual do pool.
+
+        Args:
+            pool: Pool cujas conexões em uso e de overflow serão lidas
+        """
+        status: Dict[str, Any] = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(size=pool.size(), in_use=pool.checkedout(), overflow=max(0, pool.overflow()))
+
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            status.update(
+                checkouts=self.checkouts,
+                overflow_events=self.overflow_events,
+                timeouts=self.timeouts,
+                wait_total_ms=round(self.wait_total * 1000, 3),
+                wait_avg_ms=round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                wait_max_ms=round(self.wait_max * 1000, 3),
+            )
+        return status
+
+
+class InstrumentedPoolMixin:
+    """
+    Mede o tempo de espera de cada retirada de conexão de um QueuePool.
+
+    O SQLAlchemy só emite eventos depois que a conexão foi obtida, então a
+    espera pela fila do pool é medida em torno de `_do_get`. As métricas são
+    repassadas ao pool criado por `recreate`, usado em `engine.dispose()`.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        overflow = self.overflow()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.overflow() > max(0, overflow))
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+CUMULATIVE_POOL_METRICS = ("checkouts", "overflow_events", "timeouts", "wait_total_ms")
+
+
+def pool_status(pool: Pool) -> Dict[str, Any]:
+    """
+    Retorna as métricas de um pool instrumentado, ou só o tipo do pool caso
+    ele não seja instrumentado (NullPool no modo PgBouncer, SQLite).
+    """
+    metrics = getattr(pool, "metrics", None)
+    if metrics is None:
+        return {"pool": type(pool).__name__}
+    return metrics.snapshot(pool)
@@ -0,0 +1,56 @@
+import os
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger("http_client")
+
+
+def http2_available() -> bool:
+    """
+    Indica se o pacote `h2`, necessário para HTTP/2 no httpx, está instalado.
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_orders_http_client(
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None
+) -> httpx.AsyncClient:
+    """
+    Cria o cliente HTTP compartilhado com o serviço de pedidos, usando as
+    variáveis de ambiente como padrão.
+
+    O cliente mantém um pool de conexões keep-alive, evitando uma nova conexão
+    TCP (e um novo handshake TLS) a cada chamada. Deve ser criado uma vez na
+    inicialização da aplicação e fechado no encerramento.
+
+    Args:
+        max_connections: Conexões simultâneas no pool (ORDERS_HTTP_MAX_CONNECTIONS, padrão 100)
+        max_keepalive_connections: Conexões ociosas mantidas abertas (ORDERS_HTTP_MAX_KEEPALIVE, padrão 20)
+        keepalive_expiry: Segundos até fechar uma conexão ociosa (ORDERS_HTTP_KEEPALIVE_EXPIRY, padrão 30)
+        http2: Habilita HTTP/2 (ORDERS_HTTP2, padrão false). Requer o pacote `h2`;
+            sem ele, o cliente usa HTTP/1.1
+
+    Returns:
+        Um httpx.AsyncClient configurado
+    """
+    if http2 is None:
+        http2 = os.getenv("ORDERS_HTTP2", "false").lower() in ("1", "true", "yes")
+    if http2 and not http2_available():
+        logger.warning("HTTP/2 requested for the orders service but 'h2' is not installed; using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections or int(os.getenv("ORDERS_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=max_keepalive_connections or int(os.getenv("ORDERS_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=keepalive_expiry or float(os.getenv("ORDERS_HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+    return httpx.AsyncClient(limits=limits, http2=http2)
@@ -1,7 +1,96 @@
 import json
+import time
+import logging
 import pika
-from typing import Callable, Dict, Any
-from tech.interfaces.message_broker import MessageBroker
+from collections import deque
+from typing import Callable, Dict, Any, Iterator, List, Optional
+from tech.interfaces.message_broker import MessageBroker, MessageBatch
+
+logger = logging.getLogger("rabbitmq_broker")
+
+
+class AckTracker:
+    """
+    Confirma entregas de um canal de consumo em bloco.
+
+    Lotes podem ser resolvidos fora de ordem, mas `basic_ack(multiple=True)`
+    confirma tudo até a tag informada. Por isso só é enviado um ack agrupado até
+    a maior tag cujas entregas anteriores já foram todas resolvidas.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self._outstanding = deque()
+        self._completed = set()
+
+    def delivered(self, delivery_tag: int) -> None:
+        self._outstanding.append(delivery_tag)
+
+    def ack(self, delivery_tags: List[int]) -> None:
+        self._completed.update(delivery_tags)
+        self._flush()
+
+    def nack(self, delivery_tags: List[int], requeue: bool = True) -> None:
+        for delivery_tag in delivery_tags:
+            if delivery_tag in self._outstanding:
+                self._outstanding.remove(delivery_tag)
+                if self.channel.is_open:
+                    self.channel.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+        self._flush()
+
+    def batch(self, messages: List[dict], delivery_tags: List[int],
+              headers: Optional[List[dict]] = None) -> MessageBatch:
+        """
+        Cria um lote cujas confirmações passam por este rastreador.
+        """
+        return MessageBatch(
+            messages,
+            on_ack=lambda: self.ack(delivery_tags),
+            on_nack=lambda requeue: self.nack(delivery_tags, requeue=requeue),
+            headers=headers
+        )
+
+    def _flush(self) -> None:
+        last_tag = None
+        while self._outstanding and self._outstanding[0] in self._completed:
+            last_tag = self._outstanding.popleft()
+            self._completed.discard(last_tag)
+
+        # O servidor reentrega mensagens não confirmadas de canais fechados
+        if last_tag is not None and self.channel.is_open:
+            self.channel.basic_ack(delivery_tag=last_tag, multiple=True)
+
+
+def decode_batch(deliveries, tracker: AckTracker) -> MessageBatch:
+    """
+    Decodifica um grupo de entregas (delivery_tag, properties, body) em um lote.
+
+    Entregas que não são JSON válido são descartadas com ack.
+    """
+    messages, delivery_tags, headers, undecodable = [], [], [], []
+    for delivery_tag, properties, body in deliveries:
+        try:
+            messages.append(json.loads(body))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logger.error(f"Discarding undecodable message: {body!r}")
+            undecodable.append(delivery_tag)
+            continue
+        delivery_tags.append(delivery_tag)
+        headers.append(dict(getattr(properties, 'headers', None) or {}))
+    if undecodable:
+        tracker.ack(undecodable)
+    return tracker.batch(messages, delivery_tags, headers)
+
+
+def message_properties(headers: Optional[Dict[str, Any]] = None) -> pika.BasicProperties:
+    """
+    Propriedades usadas em todas as publicações: mensagem persistente em JSON.
+    """
+    return pika.BasicProperties(
+        delivery_mode=2,  # Persistente
+        content_type='application/json',
+        headers=headers
+    )
 
 
 class RabbitMQBroker(MessageBroker):
@@ -23,20 +112,26 @@ class RabbitMQBroker(MessageBroker):
         )
         self.connection = pika.BlockingConnection(self.connection_params)
         self.channel = self.connection.channel()
+        self._declared_queues = set()
+
+    def _declare_queue(self, queue: str) -> None:
+        """
+        Declara a fila apenas na primeira vez em que ela é usada neste canal.
+        """
+        if queue not in self._declared_queues:
+            self.channel.queue_declare(queue=queue, durable=True)
+            self._declared_queues.add(queue)
 
     def publish(self, queue: str, message: dict) -> None:
         """
         Publica uma mensagem em uma fila RabbitMQ.
         """
-        self.channel.queue_declare(queue=queue, durable=True)
+        self._declare_queue(queue)
         self.channel.basic_publish(
             exchange='',
             routing_key=queue,
             body=json.dumps(message),
-            properties=pika.BasicProperties(
-                delivery_mode=2,  # Persistente
-                content_type='application/json'
-            )
+            properties=message_properties()
         )
 
     def consume(self, queue: str, callback: Callable[[dict], None]) -> None:
@@ -49,11 +144,59 @@ class RabbitMQBroker(MessageBroker):
             callback(message)
             ch.basic_ack(delivery_tag=method.delivery_tag)
 
-        self.channel.queue_declare(queue=queue, durable=True)
+        self._declare_queue(queue)
         self.channel.basic_qos(prefetch_count=1)
         self.channel.basic_consume(queue=queue, on_message_callback=_callback)
         self.channel.start_consuming()
 
+    def consume_batch(
+            self,
+            queue: str,
+            max_batch: int,
+            max_wait: float,
+            prefetch_count: Optional[int] = None
+    ) -> Iterator[MessageBatch]:
+        """
+        Consome mensagens de uma fila RabbitMQ em lotes.
+
+        Um lote é emitido ao atingir `max_batch` mensagens ou quando `max_wait`
+        segundos se passam desde a primeira mensagem sem completá-lo. Cada lote
+        deve ser confirmado com `ack()` ou rejeitado com `nack()`; o ack é enviado
+        com `multiple=True`. Ao encerrar o gerador, o consumidor é cancelado e as
+        entregas ainda não emitidas voltam para a fila.
+        """
+        max_batch = max(1, max_batch)
+        self._declare_queue(queue)
+        self.channel.basic_qos(prefetch_count=prefetch_count or max_batch)
+        tracker = AckTracker(self.channel)
+
+        pending = []
+        deadline = None
+        try:
+            for method, properties, body in self.channel.consume(queue, inactivity_timeout=max_wait):
+                if method is not None:
+                    tracker.delivered(method.delivery_tag)
+                    pending.append((method.delivery_tag, properties, body))
+                    if deadline is None:
+                        deadline = time.monotonic() + max_wait
+
+                if pending and (method is None or len(pending) >= max_batch or time.monotonic() >= deadline):
+                    batch = decode_batch(pending, tracker)
+                    pending, deadline = [], None
+                    if batch.messages:
+                        yield batch
+        finally:
+            tracker.nack([delivery_tag for delivery_tag, _, _ in pending], requeue=True)
+            if self.channel.is_open:
+                self.channel.cancel()
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Indica se a conexão com RabbitMQ continua aberta.
+        """
+        return bool(self.connection and self.connection.is_open)
+
     def close(self) -> None:
         """
         Fecha a conexão com RabbitMQ.
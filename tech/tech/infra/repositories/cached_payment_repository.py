@@ -0,0 +1,216 @@
+import os
+import copy
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.interfaces.repositories.payment_repository import PaymentRepository
+from tech.infra.ttl_cache import TTLCache
+
+
+class PaymentCache:
+    """
+    Process-wide cache of payments by order ID.
+
+    The cache is local to each API process, and the payment worker writes
+    statuses without being able to invalidate it. A status changed by another
+    process is therefore only seen here once the entry expires. Payments in a
+    final status (REJECTED, REFUNDED), which can never change again, are kept
+    for `terminal_ttl` seconds. Every other payment, including APPROVED since
+    it may still be refunded, is kept only for `ttl` seconds, which bounds how
+    long such a status can be stale.
+    Access is serialized with a lock because sync routes run in a threadpool.
+    Payments are copied on the way in and out, so callers can mutate them.
+    """
+
+    def __init__(self, max_size: int, ttl: float, terminal_ttl: float):
+        """
+        Args:
+            max_size (int): Maximum number of cached payments.
+            ttl (float): Seconds a payment whose status may still change stays cached.
+            terminal_ttl (float): Seconds a payment in a final status stays cached.
+        """
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+        self.terminal_ttl = terminal_ttl
+        self._lock = threading.Lock()
+
+    def ttl_for(self, payment: Payment) -> float:
+        status = PaymentStatus[getattr(payment.status, "name", payment.status)]
+        return self.terminal_ttl if status.is_final() else self.entries.ttl
+
+    def get(self, order_id: int) -> Optional[Payment]:
+        with self._lock:
+            payment = self.entries.get(order_id)
+        return copy.copy(payment) if payment is not None else None
+
+    def put(self, payment: Payment) -> None:
+        with self._lock:
+            self.entries.put(payment.order_id, copy.copy(payment), ttl=self.ttl_for(payment))
+
+    def invalidate(self, order_id: int) -> None:
+        with self._lock:
+            self.entries.invalidate(order_id)
+
+
+class CachedPaymentRepository(PaymentRepository):
+    """
+    Read-through caching decorator for a PaymentRepository.
+
+    Reads by order ID are served from a shared PaymentCache and fall back to
+    the wrapped repository on a miss. Writes go to the wrapped repository and
+    then refresh the cached entries with the written payments; if a write
+    fails, the affected entries are invalidated. Lookups that find nothing are
+    not cached.
+    """
+
+    def __init__(self, repository: PaymentRepository, cache: PaymentCache):
+        """
+        Initialize the decorator.
+
+        Args:
+            repository (PaymentRepository): The repository that reads and writes the database.
+            cache (PaymentCache): The cache shared by every repository in the process.
+        """
+        self.repository = repository
+        self.cache = cache
+
+    def get_by_order_id(self, order_id: int) -> Payment:
+        """
+        Retrieve a payment by its order ID, from the cache when possible.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+
+        Returns:
+            Payment: The found payment.
+
+        Raises:
+            ValueError: If no payment is found for the given order ID.
+        """
+        payment = self.cache.get(order_id)
+        if payment is not None:
+            return payment
+
+        payment = self.repository.get_by_order_id(order_id)
+        if payment:
+            self.cache.put(payment)
+        return payment
+
+    def get_by_order_ids(self, order_ids: List[int]) -> List[Payment]:
+        """
+        Retrieve the payments of several orders, querying only the cache misses.
+
+        Args:
+            order_ids (List[int]): The order IDs to look up.
+
+        Returns:
+            List[Payment]: The payments found. Unknown order IDs are omitted.
+        """
+        payments = []
+        missing = []
+        for order_id in order_ids:
+            payment = self.cache.get(order_id)
+            if payment is None:
+                missing.append(order_id)
+            else:
+                payments.append(payment)
+
+        if missing:
+            for payment in self.repository.get_by_order_ids(missing):
+                self.cache.put(payment)
+                payments.append(payment)
+        return payments
+
+    def iter_payments(self, *args, **kwargs):
+        # Listings scan ranges of rows and always go to the database
+        return self.repository.iter_payments(*args, **kwargs)
+
+    def daily_totals(self, *args, **kwargs):
+        return self.repository.daily_totals(*args, **kwargs)
+
+    def claim_stale(self, order_ids: List[int], older_than: datetime) -> List[int]:
+        # Only updated_at changes, which the cached payments do not carry
+        return self.repository.claim_stale(order_ids, older_than)
+
+    def add(self, payment: Payment) -> Payment:
+        return self._written([payment], self.repository.add, payment)
+
+    def create(self, payment: Payment) -> Payment:
+        return self._written([payment], self.repository.create, payment)
+
+    def update(self, payment: Payment) -> Payment:
+        return self._written([payment], self.repository.update, payment)
+
+    def transition(self, order_id: int, status: PaymentStatus) -> Optional[Payment]:
+        try:
+            payment = self.repository.transition(order_id, status)
+        except Exception:
+            self.cache.invalidate(order_id)
+            raise
+
+        # A refused transition means the cached status may be out of date
+        if payment is None:
+            self.cache.invalidate(order_id)
+        else:
+            self.cache.put(payment)
+        return payment
+
+    def add_if_absent(self, payment: Payment) -> Optional[Payment]:
+        return self._written([payment], self.repository.add_if_absent, payment)
+
+    def add_or_get(self, payment: Payment) -> Tuple[Payment, bool]:
+        saved, created = self._written([payment], self.repository.add_or_get, payment)
+        self.cache.put(saved)
+        return saved, created
+
+    def add_many(self, payments: List[Payment]) -> List[Payment]:
+        return self._written(payments, self.repository.add_many, payments)
+
+    def add_many_if_absent(self, payments: List[Payment]) -> List[Payment]:
+        return self._written(payments, self.repository.add_many_if_absent, payments)
+
+    def update_many(self, payments: List[Payment]) -> List[Payment]:
+        written = self._written(payments, self.repository.update_many, payments)
+        # Rows whose transition is refused keep a status this process may not know
+        written_order_ids = {payment.order_id for payment in written}
+        for payment in payments:
+            if payment.order_id not in written_order_ids:
+                self.cache.invalidate(payment.order_id)
+        return written
+
+    def _written(self, payments: List[Payment], write, argument):
+        try:
+            result = write(argument)
+        except Exception:
+            for payment in payments:
+                self.cache.invalidate(payment.order_id)
+            raise
+
+        if isinstance(result, Payment):
+            self.cache.put(result)
+        elif isinstance(result, list):
+            for payment in result:
+                self.cache.put(payment)
+        return result
+
+
+def create_payment_cache() -> Optional[PaymentCache]:
+    """
+    Create the payment cache from environment variables.
+
+    Uses PAYMENT_CACHE_SIZE (default 10000, 0 disables the cache),
+    PAYMENT_CACHE_TTL (default 1 second, for payments whose status may still
+    change) and PAYMENT_CACHE_TERMINAL_TTL (default 60 seconds, for REJECTED
+    and REFUNDED payments).
+
+    Returns:
+        Optional[PaymentCache]: The cache, or None when caching is disabled.
+    """
+    max_size = int(os.getenv("PAYMENT_CACHE_SIZE", "10000"))
+    if max_size <= 0:
+        return None
+    return PaymentCache(
+        max_size=max_size,
+        ttl=float(os.getenv("PAYMENT_CACHE_TTL", "1")),
+        terminal_ttl=float(os.getenv("PAYMENT_CACHE_TERMINAL_TTL", "60"))
+    )
@@ -0,0 +1,312 @@
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from tech.domain.entities.payments import Payment, PaymentDailyTotal, PaymentStatus
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+from tech.infra.repositories.sql_alchemy_models import SQLAlchemyPayment
+from tech.infra.repositories.sql_alchemy_payment_repository import (
+    add_or_get_statement,
+    claim_stale_statement,
+    daily_total,
+    daily_totals_statement,
+    insert_many_statement,
+    list_statement,
+    listed_payment,
+    order_id_in,
+    refused_update,
+    saved_payments,
+    transition_statement,
+    update_many_statement,
+    update_statement,
+)
+
+
+class SQLAlchemyAsyncPaymentRepository(AsyncPaymentRepository):
+    """
+    SQLAlchemy implementation of the AsyncPaymentRepository interface.
+
+    Every method is a coroutine that runs on an AsyncSession, so async routes
+    can await database round trips without blocking the event loop. Writes use
+    the same statements as SQLAlchemyPaymentRepository.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize the repository with a SQLAlchemy async session.
+
+        Args:
+            session (AsyncSession): A SQLAlchemy async session for database operations.
+        """
+        self.session = session
+
+    def _to_domain_payment(self, db_payment) -> Payment:
+        """
+        Convert a SQLAlchemyPayment instance or a returned row to a domain Payment instance.
+        """
+        return Payment(
+            order_id=db_payment.order_id,
+            amount=db_payment.amount,
+            status=PaymentStatus[db_payment.status.name],
+        )
+
+    async def add(self, payment: Payment) -> Payment:
+        """
+        Save a new payment to the database.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Payment: The saved payment.
+        """
+        saved = await self._insert_many([payment])
+        return saved[0]
+
+    async def get_by_order_id(self, order_id: int) -> Payment:
+        """
+        Retrieve a payment by its order ID.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+
+        Returns:
+            Payment: The found payment.
+
+        Raises:
+            ValueError: If no payment is found for the given order ID.
+        """
+        result = await self.session.execute(
+            select(SQLAlchemyPayment).where(SQLAlchemyPayment.order_id == order_id)
+        )
+        db_payment = result.scalars().first()
+        if not db_payment:
+            raise ValueError("Payment not found")
+        return self._to_domain_payment(db_payment)
+
+    async def update(self, payment: Payment) -> Payment:
+        """
+        Update the amount and status of an existing payment with a single statement.
+
+        Args:
+            payment (Payment): The payment to update.
+
+        Returns:
+            Payment: The updated payment.
+
+        Raises:
+            ValueError: If no payment is found for the given order ID.
+            InvalidStatusTransition: If the stored status cannot move to the new one.
+        """
+        try:
+            row = (await self.session.execute(update_statement(payment))).first()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        if row is None:
+            # Only a refused update pays for the lookup that explains it
+            raise refused_update(payment, await self.get_by_order_id(payment.order_id))
+        return self._to_domain_payment(row)
+
+    async def transition(self, order_id: int, status: PaymentStatus) -> Optional[Payment]:
+        """
+        Move a payment to a new status in one round trip, if the transition is allowed.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+            status (PaymentStatus): The new status.
+
+        Returns:
+            Optional[Payment]: The updated payment, or None if there is no payment
+            for the order or its current status cannot move to `status`.
+        """
+        try:
+            row = (await self.session.execute(transition_statement(order_id, status))).first()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return self._to_domain_payment(row) if row is not None else None
+
+    async def add_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save several new payments with a single multi-row INSERT and one commit.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: The saved payments, in the same order as the input.
+        """
+        return await self._insert_many(payments)
+
+    async def add_many_if_absent(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save the payments whose order ID is not stored yet, with a single
+        INSERT ... ON CONFLICT (order_id) DO NOTHING and one commit.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: Only the payments that were inserted, in input order.
+        """
+        return await self._insert_many(payments, if_absent=True)
+
+    async def add_if_absent(self, payment: Payment) -> Optional[Payment]:
+        """
+        Save a new payment unless a payment for the same order ID already exists.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Optional[Payment]: The saved payment, or None if the order ID was already stored.
+        """
+        inserted = await self.add_many_if_absent([payment])
+        return inserted[0] if inserted else None
+
+    async def add_or_get(self, payment: Payment) -> Tuple[Payment, bool]:
+        """
+        Save a new payment, or return the stored one if its order ID already
+        exists, in a single round trip.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Tuple[Payment, bool]: The saved or existing payment, and whether it was created.
+        """
+        try:
+            row = (await self.session.execute(add_or_get_statement(payment))).first()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        if row is None:
+            # The conflicting row was committed after the statement's snapshot was taken
+            return await self.get_by_order_id(payment.order_id), False
+        return self._to_domain_payment(row), row.created
+
+    async def iter_payments(
+            self,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+            created_from: Optional[datetime] = None,
+            created_to: Optional[datetime] = None,
+            updated_from: Optional[datetime] = None,
+            updated_to: Optional[datetime] = None,
+            after_order_id: Optional[int] = None,
+            limit: Optional[int] = None,
+    ) -> AsyncIterator[Payment]:
+        """
+        Stream the payments matching the filters, ordered by order ID, with a
+        server-side cursor. Takes the same filters as
+        SQLAlchemyPaymentRepository.iter_payments.
+
+        Returns:
+            AsyncIterator[Payment]: The payments, with their timestamps.
+        """
+        stmt = list_statement(
+            statuses, created_from, created_to, updated_from, updated_to, after_order_id, limit
+        )
+        result = await self.session.stream_scalars(stmt)
+        async for db_payment in result:
+            yield listed_payment(db_payment)
+
+    async def get_by_order_ids(self, order_ids: List[int]) -> List[Payment]:
+        """
+        Retrieve the payments of several orders with a single
+        `WHERE order_id = ANY(...)` query.
+
+        Args:
+            order_ids (List[int]): The order IDs to look up.
+
+        Returns:
+            List[Payment]: The payments found. Unknown order IDs are omitted.
+        """
+        if not order_ids:
+            return []
+
+        result = await self.session.execute(
+            select(SQLAlchemyPayment).where(order_id_in(order_ids))
+        )
+        return [self._to_domain_payment(db_payment) for db_payment in result.scalars()]
+
+    async def claim_stale(self, order_ids: List[int], older_than: datetime) -> List[int]:
+        """
+        Claim the payments left in PROCESSING by an interrupted delivery, so
+        that a single caller resumes each of them.
+
+        Args:
+            order_ids (List[int]): The order IDs to check.
+            older_than (datetime): Payments updated at or after this moment are still in progress.
+
+        Returns:
+            List[int]: The order IDs claimed by this call.
+        """
+        if not order_ids:
+            return []
+
+        try:
+            result = await self.session.execute(claim_stale_statement(order_ids, older_than))
+            claimed = result.scalars().all()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return list(claimed)
+
+    async def daily_totals(
+            self,
+            day_from: Optional[date] = None,
+            day_to: Optional[date] = None,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+    ) -> List[PaymentDailyTotal]:
+        """
+        Read the payment count and amount by creation day and status from the
+        rollup. Takes the same filters as SQLAlchemyPaymentRepository.daily_totals.
+
+        Returns:
+            List[PaymentDailyTotal]: One total per day and status with payments, ordered by day and status.
+        """
+        result = await self.session.execute(daily_totals_statement(day_from, day_to, statuses))
+        return [daily_total(db_total) for db_total in result.scalars()]
+
+    async def update_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Write the status of several payments with a single statement and one commit.
+
+        Args:
+            payments (List[Payment]): The payments whose current status should be persisted.
+
+        Returns:
+            List[Payment]: The payments that were written, as stored. Payments whose
+            stored status cannot move to the new one, and unknown order IDs, are omitted.
+        """
+        if not payments:
+            return []
+
+        try:
+            rows = list(await self.session.execute(update_many_statement(payments)))
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return [self._to_domain_payment(row) for row in rows]
+
+    async def _insert_many(self, payments: List[Payment], if_absent: bool = False) -> List[Payment]:
+        if not payments:
+            return []
+
+        try:
+            rows = list(await self.session.execute(insert_many_statement(payments, if_absent)))
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return saved_payments(payments, rows, self._to_domain_payment)
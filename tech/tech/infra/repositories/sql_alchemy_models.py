@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, create_engine
+from sqlalchemy import (
+    BigInteger, Column, Date, Integer, Numeric, String, Float, DateTime, Enum, Index, create_engine, text
+)
 from sqlalchemy.orm import registry
 from datetime import datetime
 import enum
@@ -28,12 +30,71 @@ class SQLAlchemyPayment(object):
         status (PaymentStatus): The current status of the payment.
         created_at (datetime): The timestamp when the payment was created.
         updated_at (datetime): The timestamp when the payment was last updated.
+
+    The table is partitioned by month on created_at, so created_at is part of
+    the primary key. Order IDs are kept unique by SQLAlchemyPaymentOrderId.
     """
     __tablename__ = 'payments'
+    __table_args__ = (
+        Index('ix_payments_order_id', 'order_id'),
+        Index('ix_payments_status_updated_at', 'status', 'updated_at'),
+        Index('ix_payments_status_order_id', 'status', 'order_id'),
+        Index(
+            'ix_payments_in_flight_updated_at', 'updated_at',
+            postgresql_where=text("status IN ('PENDING', 'PROCESSING')")
+        ),
+        Index('ix_payments_created_at_brin', 'created_at', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, unique=True, nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    order_id = Column(Integer, nullable=False)
     amount = Column(Float, nullable=False)
     status = Column(Enum(PaymentStatus), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+@table_registry.mapped
+class SQLAlchemyPaymentOrderId(object):
+    """
+    Order IDs that have a payment.
+
+    A partitioned table can only enforce uniqueness on columns that include
+    the partition key, so the unique order ID lives in this narrow table and
+    every payment insert claims its order ID here in the same statement. Rows
+    are kept when their payment is archived, so an archived order cannot get
+    a second payment.
+
+    Attributes:
+        order_id (int): The order ID.
+        created_at (datetime): When the payment of the order was created.
+    """
+    __tablename__ = 'payment_order_ids'
+
+    order_id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+@table_registry.mapped
+class SQLAlchemyPaymentDailyTotal(object):
+    """
+    Rollup of the payments by creation day and current status.
+
+    Every statement that inserts payments or changes their status or amount
+    updates this table in the same statement, so it always matches
+    `SELECT created_at::date, status, count(*), sum(amount) FROM payments GROUP BY 1, 2`
+    without scanning payments. Rows are kept when partitions are archived.
+
+    Attributes:
+        day (date): The day the payments were created, in UTC.
+        status (PaymentStatus): The current status of the payments.
+        count (int): The number of payments.
+        amount (Decimal): The sum of their amounts.
+    """
+    __tablename__ = 'payment_daily_totals'
+
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(PaymentStatus), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    amount = Column(Numeric, nullable=False, default=0)
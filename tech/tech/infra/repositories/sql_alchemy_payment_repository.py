@@ -1,7 +1,416 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import (
+    ARRAY, Date, DateTime, Float, Integer, Numeric, String, and_, any_, bindparam, case, cast, column, exists, false,
+    func, insert, literal, or_, select, true, union_all, update, values
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentDailyTotal, PaymentStatus
 from tech.interfaces.repositories.payment_repository import PaymentRepository
-from tech.infra.repositories.sql_alchemy_models import SQLAlchemyPayment
+from tech.infra.repositories.sql_alchemy_models import (
+    SQLAlchemyPayment,
+    SQLAlchemyPaymentDailyTotal,
+    SQLAlchemyPaymentOrderId,
+)
+
+
+def totals_statement(deltas):
+    """
+    Build the INSERT ... ON CONFLICT DO UPDATE that adds `deltas` to payment_daily_totals.
+
+    `deltas` selects (day, status, count, amount) rows. They are summed per
+    (day, status) and applied in key order, so concurrent writers lock the
+    rollup rows in the same order and cannot deadlock on them.
+    """
+    deltas = deltas.subquery("deltas")
+    count = func.sum(deltas.c.count)
+    amount = func.sum(deltas.c.amount)
+    stmt = pg_insert(SQLAlchemyPaymentDailyTotal).from_select(
+        ["day", "status", "count", "amount"],
+        select(deltas.c.day, deltas.c.status, count, amount)
+        .group_by(deltas.c.day, deltas.c.status)
+        .having(or_(count != 0, amount != 0))
+        .order_by(deltas.c.day, deltas.c.status)
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[SQLAlchemyPaymentDailyTotal.day, SQLAlchemyPaymentDailyTotal.status],
+        set_={
+            "count": SQLAlchemyPaymentDailyTotal.count + stmt.excluded["count"],
+            "amount": SQLAlchemyPaymentDailyTotal.amount + stmt.excluded.amount,
+        },
+    )
+
+
+def insert_many_statement(payments: List[Payment], if_absent: bool = False):
+    """
+    Build a multi-row INSERT of `payments` that returns the inserted rows.
+
+    The order IDs are claimed in payment_order_ids by the same statement,
+    because the partitioned payments table cannot enforce their uniqueness:
+
+        WITH new_payments AS (SELECT * FROM (VALUES ...)),
+             claimed AS (INSERT INTO payment_order_ids ... [ON CONFLICT (order_id) DO NOTHING] RETURNING order_id)
+             totals AS (INSERT INTO payment_daily_totals ... ON CONFLICT (day, status) DO UPDATE ...)
+        INSERT INTO payments ... SELECT ... FROM new_payments WHERE order_id IN (SELECT order_id FROM claimed)
+        RETURNING ...
+
+    Args:
+        payments (List[Payment]): The payments to insert.
+        if_absent (bool): Skip payments whose order ID is already claimed instead
+            of failing with a unique violation. Repeated order IDs in `payments`
+            are also skipped, keeping the first payment of each order.
+    """
+    if if_absent:
+        # ON CONFLICT only skips order IDs claimed before the statement; rows of
+        # the same statement would all pass the `claimed` filter below
+        first_by_order = {}
+        for payment in payments:
+            first_by_order.setdefault(payment.order_id, payment)
+        payments = list(first_by_order.values())
+
+    now = datetime.utcnow()
+    new_payments = select(
+        values(
+            column("order_id", Integer),
+            column("amount", Float),
+            column("status", String),
+            column("created_at", DateTime),
+            column("updated_at", DateTime),
+            name="rows",
+        ).data([
+            (payment.order_id, payment.amount, payment.status.name, now, now)
+            for payment in payments
+        ])
+    ).cte("new_payments")
+
+    claim = pg_insert(SQLAlchemyPaymentOrderId).from_select(
+        ["order_id", "created_at"],
+        select(new_payments.c.order_id, new_payments.c.created_at)
+    )
+    if if_absent:
+        claim = claim.on_conflict_do_nothing(index_elements=[SQLAlchemyPaymentOrderId.order_id])
+    claimed = claim.returning(SQLAlchemyPaymentOrderId.order_id).cte("claimed")
+    is_claimed = new_payments.c.order_id.in_(select(claimed.c.order_id))
+    status = cast(new_payments.c.status, SQLAlchemyPayment.status.type)
+
+    totals = totals_statement(
+        select(
+            cast(new_payments.c.created_at, Date).label("day"),
+            status.label("status"),
+            literal(1).label("count"),
+            cast(new_payments.c.amount, Numeric).label("amount"),
+        ).where(is_claimed)
+    ).cte("totals")
+
+    return insert(SQLAlchemyPayment).from_select(
+        ["order_id", "amount", "status", "created_at", "updated_at"],
+        select(
+            new_payments.c.order_id,
+            new_payments.c.amount,
+            status,
+            new_payments.c.created_at,
+            new_payments.c.updated_at,
+        ).where(is_claimed)
+    ).returning(
+        SQLAlchemyPayment.id,
+        SQLAlchemyPayment.order_id,
+        SQLAlchemyPayment.amount,
+        SQLAlchemyPayment.status,
+    ).add_cte(totals)
+
+
+def order_id_in(order_ids: List[int]):
+    """
+    Build `order_id = ANY(:order_ids)`, binding all the IDs as one array parameter.
+
+    Unlike IN, the statement text does not depend on how many IDs are given.
+    """
+    return SQLAlchemyPayment.order_id == any_(
+        bindparam("order_ids", list(order_ids), type_=ARRAY(Integer), unique=True)
+    )
+
+
+def add_or_get_statement(payment: Payment):
+    """
+    Build one statement that inserts `payment` unless its order ID exists and
+    returns either the inserted row or the existing one, with a `created` flag:
+
+        WITH inserted AS (<insert_many_statement with if_absent>)
+        SELECT ..., true AS created FROM inserted
+        UNION ALL
+        SELECT ..., false FROM payments WHERE order_id = :id AND NOT EXISTS (SELECT FROM inserted)
+    """
+    inserted = insert_many_statement([payment], if_absent=True).cte("inserted")
+    created = select(
+        inserted.c.id,
+        inserted.c.order_id,
+        inserted.c.amount,
+        inserted.c.status,
+        true().label("created"),
+    )
+    existing = select(
+        SQLAlchemyPayment.id,
+        SQLAlchemyPayment.order_id,
+        SQLAlchemyPayment.amount,
+        SQLAlchemyPayment.status,
+        false().label("created"),
+    ).where(
+        SQLAlchemyPayment.order_id == payment.order_id,
+        ~exists(select(inserted.c.id)),
+    )
+    return union_all(created, existing)
+
+
+def refused_update(payment: Payment, current: Payment):
+    """
+    Build the error for an update whose status change was refused.
+    """
+    return InvalidStatusTransition(
+        f"Cannot change payment status from {current.status.name} to {payment.status.name}"
+    )
+
+
+def saved_payments(payments: List[Payment], rows, to_domain) -> List[Payment]:
+    """
+    Match the rows returned by an insert back to the input payments.
+
+    Returns:
+        List[Payment]: The inserted payments, in input order, keeping their payment method.
+    """
+    inserted = {row.order_id: row for row in rows}
+    result = []
+    for payment in payments:
+        row = inserted.pop(payment.order_id, None)
+        if row is None:
+            continue
+        saved_payment = to_domain(row)
+        saved_payment.payment_method = payment.payment_method
+        result.append(saved_payment)
+    return result
+
+
+def status_in(statuses):
+    return SQLAlchemyPayment.status.in_(sorted(status.name for status in statuses))
+
+
+def change_statement(where, **values):
+    """
+    Build one statement that updates the payments matching `where` with
+    `values` and moves them between the buckets of payment_daily_totals:
+
+        WITH previous AS (SELECT id, created_at, status, amount FROM payments WHERE <where> FOR UPDATE),
+             changed AS (UPDATE payments SET ... FROM previous WHERE <same row> RETURNING ..., previous.status, previous.amount),
+             totals AS (INSERT INTO payment_daily_totals <+1 new bucket, -1 previous bucket> ON CONFLICT ...)
+        SELECT id, order_id, amount, status FROM changed
+
+    Locking the rows in `previous` gives their status as of the update, so a
+    concurrent change is never counted twice.
+    """
+    previous = select(
+        SQLAlchemyPayment.id,
+        SQLAlchemyPayment.created_at,
+        SQLAlchemyPayment.status,
+        SQLAlchemyPayment.amount,
+    ).where(*where).with_for_update().cte("previous")
+
+    changed = (
+        update(SQLAlchemyPayment)
+        .where(
+            SQLAlchemyPayment.id == previous.c.id,
+            SQLAlchemyPayment.created_at == previous.c.created_at,
+        )
+        .values(updated_at=datetime.utcnow(), **values)
+        .returning(
+            SQLAlchemyPayment.id,
+            SQLAlchemyPayment.order_id,
+            SQLAlchemyPayment.amount,
+            SQLAlchemyPayment.status,
+            SQLAlchemyPayment.created_at,
+            previous.c.status.label("previous_status"),
+            previous.c.amount.label("previous_amount"),
+        )
+        .cte("changed")
+    )
+
+    day = cast(changed.c.created_at, Date).label("day")
+    totals = totals_statement(union_all(
+        select(
+            day,
+            changed.c.status.label("status"),
+            literal(1).label("count"),
+            cast(changed.c.amount, Numeric).label("amount"),
+        ),
+        select(day, changed.c.previous_status, literal(-1), -cast(changed.c.previous_amount, Numeric)),
+    )).cte("totals")
+
+    return select(
+        changed.c.id,
+        changed.c.order_id,
+        changed.c.amount,
+        changed.c.status,
+    ).add_cte(totals)
+
+
+def claim_stale_statement(order_ids: List[int], older_than: datetime):
+    """
+    Build the UPDATE that refreshes `updated_at` of the payments still in
+    PROCESSING and not updated since `older_than`, returning their order IDs.
+
+    The status does not change, so payment_daily_totals is left alone. When
+    two callers race, the second one re-checks `updated_at` after the first
+    commits and claims nothing.
+    """
+    return (
+        update(SQLAlchemyPayment)
+        .where(
+            order_id_in(order_ids),
+            SQLAlchemyPayment.status == PaymentStatus.PROCESSING.name,
+            SQLAlchemyPayment.updated_at < older_than,
+        )
+        .values(updated_at=datetime.utcnow())
+        .returning(SQLAlchemyPayment.order_id)
+    )
+
+
+def transition_statement(order_id: int, status: PaymentStatus):
+    """
+    Build the change_statement that moves one payment to `status` only if its
+    current status is in `status.allowed_from()`, returning the updated row.
+    """
+    return change_statement(
+        [SQLAlchemyPayment.order_id == order_id, status_in(status.allowed_from())],
+        status=status.name,
+    )
+
+
+def update_statement(payment: Payment):
+    """
+    Build the change_statement that writes the amount and status of one
+    payment, only if its current status may move to the new one.
+    """
+    return change_statement(
+        [SQLAlchemyPayment.order_id == payment.order_id, status_in(payment.status.allowed_from())],
+        amount=payment.amount,
+        status=payment.status.name,
+    )
+
+
+def update_many_statement(payments: List[Payment]):
+    """
+    Build a single change_statement that writes the status of each payment by
+    order ID and returns the rows it changed.
+
+    Each row is only updated if its current status may move to the new one,
+    so a late write cannot undo a transition made concurrently elsewhere.
+    """
+    status_by_order = case(
+        {payment.order_id: payment.status.name for payment in payments},
+        value=SQLAlchemyPayment.order_id,
+    )
+    orders_by_status = defaultdict(list)
+    for payment in payments:
+        orders_by_status[PaymentStatus[payment.status.name]].append(payment.order_id)
+    allowed = or_(*(
+        and_(SQLAlchemyPayment.order_id.in_(order_ids), status_in(status.allowed_from()))
+        for status, order_ids in orders_by_status.items()
+    ))
+    return change_statement(
+        [allowed],
+        status=cast(status_by_order, SQLAlchemyPayment.status.type),
+    )
+
+
+def daily_totals_statement(
+        day_from: Optional[date] = None,
+        day_to: Optional[date] = None,
+        statuses: Optional[Sequence[PaymentStatus]] = None,
+):
+    """
+    Build the query of the rollup rows in a day window, which includes its
+    start and excludes its end, ordered by day and status. Buckets left
+    empty by status changes are skipped.
+    """
+    stmt = select(SQLAlchemyPaymentDailyTotal).where(SQLAlchemyPaymentDailyTotal.count > 0)
+    if day_from is not None:
+        stmt = stmt.where(SQLAlchemyPaymentDailyTotal.day >= day_from)
+    if day_to is not None:
+        stmt = stmt.where(SQLAlchemyPaymentDailyTotal.day < day_to)
+    if statuses:
+        stmt = stmt.where(SQLAlchemyPaymentDailyTotal.status.in_(sorted(status.name for status in statuses)))
+    return stmt.order_by(SQLAlchemyPaymentDailyTotal.day, SQLAlchemyPaymentDailyTotal.status)
+
+
+def daily_total(db_total: SQLAlchemyPaymentDailyTotal) -> PaymentDailyTotal:
+    """
+    Convert a rollup row to a domain PaymentDailyTotal.
+    """
+    return PaymentDailyTotal(
+        day=db_total.day,
+        status=PaymentStatus[db_total.status.name],
+        count=db_total.count,
+        amount=float(db_total.amount),
+    )
+
+
+LIST_FETCH_SIZE = 1000
+
+
+def list_statement(
+        statuses: Optional[Sequence[PaymentStatus]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+        after_order_id: Optional[int] = None,
+        limit: Optional[int] = None,
+):
+    """
+    Build the listing query, paginated by keyset on the order ID, which is
+    unique across partitions (see payment_order_ids):
+
+        SELECT ... WHERE <filters> AND order_id > :after_order_id ORDER BY order_id LIMIT :limit
+
+    With at most one status, ix_payments_status_order_id serves both the seek
+    and the ordering; otherwise ix_payments_order_id does. Either way a page
+    costs the same at any depth, unlike OFFSET. The time windows are checked
+    row by row, apart from created_at pruning the monthly partitions. A narrow
+    window over many payments can therefore read far more rows than it
+    returns. Keying the cursor on the window column instead would need a
+    different cursor, and a different index, for each combination of filters.
+    Time windows include their start and exclude their end.
+    """
+    stmt = select(SQLAlchemyPayment)
+    if statuses:
+        stmt = stmt.where(status_in(statuses))
+    if created_from is not None:
+        stmt = stmt.where(SQLAlchemyPayment.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(SQLAlchemyPayment.created_at < created_to)
+    if updated_from is not None:
+        stmt = stmt.where(SQLAlchemyPayment.updated_at >= updated_from)
+    if updated_to is not None:
+        stmt = stmt.where(SQLAlchemyPayment.updated_at < updated_to)
+    if after_order_id is not None:
+        stmt = stmt.where(SQLAlchemyPayment.order_id > after_order_id)
+    stmt = stmt.order_by(SQLAlchemyPayment.order_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt.execution_options(yield_per=LIST_FETCH_SIZE)
+
+
+def listed_payment(db_payment: SQLAlchemyPayment) -> Payment:
+    """
+    Convert a listed row to a domain Payment, keeping its timestamps.
+    """
+    return Payment(
+        order_id=db_payment.order_id,
+        amount=db_payment.amount,
+        status=PaymentStatus[db_payment.status.name],
+        created_at=db_payment.created_at,
+        updated_at=db_payment.updated_at,
+    )
 
 
 class SQLAlchemyPaymentRepository(PaymentRepository):
@@ -30,11 +439,10 @@ class SQLAlchemyPaymentRepository(PaymentRepository):
         Returns:
             Payment: The corresponding domain model instance.
         """
-        print(f"Valor do status retornado pelo banco: {db_payment.status}")
         return Payment(
             order_id=db_payment.order_id,
             amount=db_payment.amount,
-            status=db_payment.status,
+            status=PaymentStatus[db_payment.status.name],
         )
 
     def _to_db_payment(self, payment: Payment) -> SQLAlchemyPayment:
@@ -63,15 +471,7 @@ class SQLAlchemyPaymentRepository(PaymentRepository):
         Returns:
             Payment: The saved payment with updated attributes.
         """
-        db_payment = SQLAlchemyPayment(
-            order_id=payment.order_id,
-            amount=payment.amount,
-            status=payment.status.name,
-        )
-        self.session.add(db_payment)
-        self.session.commit()
-        self.session.refresh(db_payment)
-        return self._to_domain_payment(db_payment)
+        return self._insert_many([payment])[0]
 
     def get_by_order_id(self, order_id: int) -> Payment:
         """
@@ -93,24 +493,49 @@ class SQLAlchemyPaymentRepository(PaymentRepository):
 
     def update(self, payment: Payment) -> Payment:
         """
-        Update an existing payment.
+        Update the amount and status of an existing payment with a single statement.
 
         Args:
             payment (Payment): The payment to update.
 
         Returns:
             Payment: The updated payment.
+
+        Raises:
+            ValueError: If no payment is found for the given order ID.
+            InvalidStatusTransition: If the stored status cannot move to the new one.
         """
-        db_payment = self.session.query(SQLAlchemyPayment).filter(
-            SQLAlchemyPayment.order_id == payment.order_id).first()
-        if not db_payment:
-            raise ValueError("Payment not found")
+        try:
+            row = self.session.execute(update_statement(payment)).first()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
-        db_payment.amount = payment.amount
-        db_payment.status = payment.status.name
-        self.session.commit()
-        self.session.refresh(db_payment)
-        return self._to_domain_payment(db_payment)
+        if row is None:
+            # Only a refused update pays for the lookup that explains it
+            raise refused_update(payment, self.get_by_order_id(payment.order_id))
+        return self._to_domain_payment(row)
+
+    def transition(self, order_id: int, status: PaymentStatus) -> Optional[Payment]:
+        """
+        Move a payment to a new status in one round trip, if the transition is allowed.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+            status (PaymentStatus): The new status.
+
+        Returns:
+            Optional[Payment]: The updated payment, or None if there is no payment
+            for the order or its current status cannot move to `status`.
+        """
+        try:
+            row = self.session.execute(transition_statement(order_id, status)).first()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return self._to_domain_payment(row) if row is not None else None
 
     def create(self, payment: Payment) -> Payment:
         """
@@ -122,14 +547,208 @@ class SQLAlchemyPaymentRepository(PaymentRepository):
         Returns:
             Payment: The Payment entity with its database ID set.
         """
-        db_payment = SQLAlchemyPayment(
-            order_id=payment.order_id,
-            amount=payment.amount,
-            status=payment.status.value,
+        try:
+            row = self.session.execute(insert_many_statement([payment])).first()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        payment.id = row.id
+        return payment
+
+    def add_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save several new payments with a single multi-row INSERT and one commit.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: The saved payments, in the same order as the input.
+
+        Raises:
+            Exception: If the insert fails. The transaction is rolled back and nothing is saved.
+        """
+        return self._insert_many(payments)
+
+    def add_many_if_absent(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save the payments whose order ID is not stored yet, with a single
+        INSERT ... ON CONFLICT (order_id) DO NOTHING and one commit.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: Only the payments that were inserted, in input order.
+        """
+        return self._insert_many(payments, if_absent=True)
+
+    def add_if_absent(self, payment: Payment) -> Optional[Payment]:
+        """
+        Save a new payment unless a payment for the same order ID already exists.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Optional[Payment]: The saved payment, or None if the order ID was already stored.
+        """
+        inserted = self.add_many_if_absent([payment])
+        return inserted[0] if inserted else None
+
+    def add_or_get(self, payment: Payment) -> Tuple[Payment, bool]:
+        """
+        Save a new payment, or return the stored one if its order ID already
+        exists, in a single round trip.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Tuple[Payment, bool]: The saved or existing payment, and whether it was created.
+        """
+        try:
+            row = self.session.execute(add_or_get_statement(payment)).first()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        if row is None:
+            # The conflicting row was committed after the statement's snapshot was taken
+            return self.get_by_order_id(payment.order_id), False
+        return self._to_domain_payment(row), row.created
+
+    def iter_payments(
+            self,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+            created_from: Optional[datetime] = None,
+            created_to: Optional[datetime] = None,
+            updated_from: Optional[datetime] = None,
+            updated_to: Optional[datetime] = None,
+            after_order_id: Optional[int] = None,
+            limit: Optional[int] = None,
+    ) -> Iterator[Payment]:
+        """
+        Stream the payments matching the filters, ordered by order ID.
+
+        Rows are fetched LIST_FETCH_SIZE at a time, with a server-side cursor
+        on PostgreSQL, so the whole result is never held in memory.
+
+        Args:
+            statuses (Optional[Sequence[PaymentStatus]]): Only payments in one of these statuses.
+            created_from (Optional[datetime]): Only payments created at or after this time.
+            created_to (Optional[datetime]): Only payments created before this time.
+            updated_from (Optional[datetime]): Only payments updated at or after this time.
+            updated_to (Optional[datetime]): Only payments updated before this time.
+            after_order_id (Optional[int]): Only payments with a greater order ID (the cursor).
+            limit (Optional[int]): Maximum number of payments.
+
+        Returns:
+            Iterator[Payment]: The payments, with their timestamps.
+        """
+        stmt = list_statement(
+            statuses, created_from, created_to, updated_from, updated_to, after_order_id, limit
         )
-        self.session.add(db_payment)
-        self.session.commit()
-        self.session.refresh(db_payment)
+        for db_payment in self.session.execute(stmt).scalars():
+            yield listed_payment(db_payment)
+
+    def get_by_order_ids(self, order_ids: List[int]) -> List[Payment]:
+        """
+        Retrieve the payments of several orders with a single
+        `WHERE order_id = ANY(...)` query.
+
+        Args:
+            order_ids (List[int]): The order IDs to look up.
+
+        Returns:
+            List[Payment]: The payments found. Unknown order IDs are omitted.
+        """
+        if not order_ids:
+            return []
+
+        db_payments = self.session.execute(
+            select(SQLAlchemyPayment).where(order_id_in(order_ids))
+        ).scalars()
+        return [self._to_domain_payment(db_payment) for db_payment in db_payments]
+
+    def claim_stale(self, order_ids: List[int], older_than: datetime) -> List[int]:
+        """
+        Claim the payments left in PROCESSING by an interrupted delivery, so
+        that a single caller resumes each of them.
+
+        Args:
+            order_ids (List[int]): The order IDs to check.
+            older_than (datetime): Payments updated at or after this moment are still in progress.
+
+        Returns:
+            List[int]: The order IDs claimed by this call.
+        """
+        if not order_ids:
+            return []
+
+        try:
+            claimed = self.session.execute(claim_stale_statement(order_ids, older_than)).scalars().all()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return list(claimed)
+
+    def daily_totals(
+            self,
+            day_from: Optional[date] = None,
+            day_to: Optional[date] = None,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+    ) -> List[PaymentDailyTotal]:
+        """
+        Read the payment count and amount by creation day and status from the rollup.
+
+        Args:
+            day_from (Optional[date]): Only days on or after this one.
+            day_to (Optional[date]): Only days before this one.
+            statuses (Optional[Sequence[PaymentStatus]]): Only these statuses.
+
+        Returns:
+            List[PaymentDailyTotal]: One total per day and status with payments, ordered by day and status.
+        """
+        db_totals = self.session.execute(daily_totals_statement(day_from, day_to, statuses)).scalars()
+        return [daily_total(db_total) for db_total in db_totals]
+
+    def _insert_many(self, payments: List[Payment], if_absent: bool = False) -> List[Payment]:
+        if not payments:
+            return []
+
+        try:
+            rows = list(self.session.execute(insert_many_statement(payments, if_absent)))
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        return saved_payments(payments, rows, self._to_domain_payment)
+
+    def update_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Write the status of several payments with a single statement and one commit.
+
+        Args:
+            payments (List[Payment]): The payments whose current status should be persisted.
+
+        Returns:
+            List[Payment]: The payments that were written, as stored. Payments whose
+            stored status cannot move to the new one, and unknown order IDs, are omitted.
+        """
+        if not payments:
+            return []
+
+        try:
+            rows = list(self.session.execute(update_many_statement(payments)))
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
-        payment.id = db_payment.id
-        return payment
\ No newline at end of file
+        return [self._to_domain_payment(row) for row in rows]
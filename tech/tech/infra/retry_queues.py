@@ -0,0 +1,113 @@
+import os
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger("retry_queues")
+
+ATTEMPT_HEADER = "x-attempt"
+ERROR_HEADER = "x-last-error"
+
+
+class RetryQueues:
+    """
+    Topologia de reprocessamento com atraso para uma fila de trabalho.
+
+    Cada tentativa N tem sua própria fila de espera `<fila>.retry.N`, sem
+    consumidores, com `x-message-ttl` crescendo exponencialmente. Ao expirar,
+    o RabbitMQ devolve a mensagem para a fila de trabalho via dead-letter.
+    Como todas as mensagens de uma fila de espera têm o mesmo TTL, nenhuma fica
+    presa atrás de outra com atraso maior. O número de tentativas viaja no
+    cabeçalho `x-attempt`; esgotadas as tentativas, a mensagem vai para `<fila>.dlq`.
+    """
+
+    def __init__(self, queue: str, max_retries: int = 5, base_delay_ms: int = 1000, multiplier: int = 2):
+        """
+        Args:
+            queue: Fila de trabalho cujas mensagens com falha serão reprocessadas
+            max_retries: Número de novas tentativas antes de enviar para a DLQ
+            base_delay_ms: Atraso da primeira nova tentativa, em milissegundos
+            multiplier: Fator de crescimento do atraso entre tentativas
+        """
+        self.queue = queue
+        self.max_retries = max(0, max_retries)
+        self.base_delay_ms = base_delay_ms
+        self.multiplier = multiplier
+
+    @property
+    def dead_letter_queue(self) -> str:
+        return f"{self.queue}.dlq"
+
+    def retry_queue(self, attempt: int) -> str:
+        return f"{self.queue}.retry.{attempt}"
+
+    def delay_ms(self, attempt: int) -> int:
+        return self.base_delay_ms * self.multiplier ** (attempt - 1)
+
+    def retry_queue_arguments(self, attempt: int) -> Dict[str, Any]:
+        return {
+            "x-message-ttl": self.delay_ms(attempt),
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": self.queue,
+        }
+
+    async def declare(self, broker) -> None:
+        """
+        Declara as filas de espera e a DLQ no broker.
+        """
+        for attempt in range(1, self.max_retries + 1):
+            await broker.declare_queue(self.retry_queue(attempt), arguments=self.retry_queue_arguments(attempt))
+        await broker.declare_queue(self.dead_letter_queue)
+
+    def destination(self, headers: Dict[str, Any]) -> Tuple[str, int]:
+        """
+        Retorna a fila de destino de uma mensagem que falhou e o número da nova tentativa.
+        """
+        attempt = int((headers or {}).get(ATTEMPT_HEADER, 0)) + 1
+        if attempt > self.max_retries:
+            return self.dead_letter_queue, attempt
+        return self.retry_queue(attempt), attempt
+
+    async def reject(self, broker, messages: List[dict], headers: List[dict], error: str) -> None:
+        """
+        Encaminha mensagens que falharam para a próxima fila de espera ou para a DLQ.
+
+        As mensagens são publicadas com confirmação, agrupadas por destino; só
+        depois disso a entrega original deve ser confirmada.
+
+        Args:
+            broker: Broker com suporte a publish_many
+            messages: Mensagens que falharam
+            headers: Cabeçalhos de cada mensagem, na mesma ordem
+            error: Descrição do erro, gravada no cabeçalho x-last-error
+        """
+        by_destination = defaultdict(list)
+        for message, message_headers in zip(messages, headers):
+            by_destination[self.destination(message_headers)].append(message)
+
+        for (queue, attempt), grouped in by_destination.items():
+            if queue == self.dead_letter_queue:
+                logger.error(f"Moving {len(grouped)} messages to {queue} after {attempt - 1} retries: {error}")
+            else:
+                logger.warning(
+                    f"Retrying {len(grouped)} messages in {self.delay_ms(attempt)}ms "
+                    f"(attempt {attempt}/{self.max_retries}): {error}"
+                )
+            await broker.publish_many(
+                queue,
+                grouped,
+                headers={ATTEMPT_HEADER: attempt, ERROR_HEADER: error[:255]}
+            )
+
+
+def create_retry_queues(queue: str) -> RetryQueues:
+    """
+    Cria a topologia de reprocessamento a partir das variáveis de ambiente.
+
+    Usa PAYMENT_MAX_RETRIES (padrão 5) e PAYMENT_RETRY_BASE_DELAY_MS (padrão 1000).
+    """
+    return RetryQueues(
+        queue,
+        max_retries=int(os.getenv("PAYMENT_MAX_RETRIES", "5")),
+        base_delay_ms=int(os.getenv("PAYMENT_RETRY_BASE_DELAY_MS", "1000"))
+    )
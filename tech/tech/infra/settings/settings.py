@@ -7,4 +7,15 @@ class Settings(BaseSettings):
         env_file_encoding='utf-8',
     )
 
-    DATABASE_URL: str
+    DATABASE_URL: str = "sqlite:///:memory:"  # Default for testing
+
+    # Pool de conexões com o banco, por processo (API e cada processo do worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Com PgBouncer em modo transaction o pooling fica a cargo dele: sem pool
+    # local e sem prepared statements no servidor
+    DB_PGBOUNCER: bool = False
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas assíncronas concorrentes para a mesma chave.
+
+    Enquanto uma chamada para `key` está em andamento, novos chamadores
+    aguardam a mesma execução e recebem o mesmo resultado ou a mesma exceção.
+    A chamada roda em uma task própria: o cancelamento de um chamador não
+    cancela a execução compartilhada pelos demais. Não guarda resultados;
+    assim que a chamada termina, a próxima para a mesma chave executa de novo.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `call` para `key`, ou aguarda a execução que já está em andamento.
+
+        Args:
+            key: Identifica as chamadas que podem ser agrupadas
+            call: Função sem argumentos que retorna o awaitable a executar
+
+        Returns:
+            O resultado da execução compartilhada
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Marca a exceção como lida caso todos os chamadores tenham sido cancelados
+        if not future.cancelled():
+            future.exception()
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class CacheEntry:
+    """
+    Valor em cache com o instante em que deixa de ser válido e o instante
+    até o qual ainda pode ser servido como obsoleto.
+    """
+
+    __slots__ = ("value", "expires_at", "stale_until")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+
+class TTLCache:
+    """
+    Cache em memória limitado por tamanho, com expiração por entrada.
+
+    Ao atingir `max_size`, a entrada usada há mais tempo é descartada (LRU).
+    Cada entrada é válida por `ttl` segundos e, depois disso, ainda é devolvida
+    por `get_entry` durante `stale_ttl` segundos, para que o chamador possa
+    servi-la enquanto busca um valor novo. Não é thread-safe: foi feito para
+    ser usado a partir de um único event loop.
+    """
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_size: Número máximo de entradas
+            ttl: Validade padrão de cada entrada, em segundos
+            stale_ttl: Tempo após a expiração em que a entrada ainda pode ser servida
+            clock: Relógio monotônico usado para as expirações
+        """
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Retorna a entrada de `key`, válida ou obsoleta, ou None se não existir
+        ou já tiver passado da janela de obsolescência.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.clock() >= entry.stale_until:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retorna o valor de `key` apenas se a entrada ainda for válida.
+        """
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh(self.clock()):
+            return None
+        return entry.value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena `value` em `key`, com validade `ttl` (ou a validade padrão).
+        """
+        now = self.clock()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        self._entries[key] = CacheEntry(value, expires_at, expires_at + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a entrada de `key`, se existir.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
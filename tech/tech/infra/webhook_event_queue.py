@@ -0,0 +1,159 @@
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger("webhook_event_queue")
+
+
+class WebhookEventQueue:
+    """
+    Fila em memória, limitada, de eventos de webhook aplicados em lote.
+
+    A rota só valida e enfileira os eventos, respondendo imediatamente; uma
+    task em segundo plano retira até `batch_size` eventos por vez, esperando no
+    máximo `batch_wait` segundos para completar o lote, e os entrega a `apply`.
+    Com a fila cheia, `offer` recusa o lote inteiro para que a rota responda
+    503 e o provedor reenvie mais tarde. Eventos ainda na fila são perdidos se
+    o processo morrer; no encerramento normal, `stop` aplica o que restou.
+
+    Um lote que falha é reaplicado até `max_attempts` vezes, com espera
+    exponencial a partir de `retry_delay`; enquanto isso o consumidor não
+    retira novos eventos, e a fila cheia devolve 503 ao provedor. Se ainda
+    assim falhar, o lote é dividido ao meio e cada metade é aplicada da mesma
+    forma, de modo que só o evento que falha sozinho é descartado (e logado).
+    """
+
+    def __init__(
+            self,
+            apply: Callable[[List], Awaitable[None]],
+            max_size: int = 10000,
+            batch_size: int = 500,
+            batch_wait: float = 0.05,
+            max_attempts: int = 3,
+            retry_delay: float = 0.1
+    ):
+        """
+        Args:
+            apply: Corrotina que aplica um lote de eventos no banco
+            max_size: Número máximo de eventos aguardando na fila
+            batch_size: Número máximo de eventos por lote
+            batch_wait: Tempo máximo de espera para completar um lote, em segundos
+            max_attempts: Tentativas de aplicar um lote antes de dividi-lo
+            retry_delay: Espera antes da primeira nova tentativa, em segundos; dobra a cada falha
+        """
+        self.apply = apply
+        self.max_size = max(1, max_size)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_size)
+        self._consumer: Optional[asyncio.Task] = None
+        self._applying: Optional[asyncio.Future] = None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def offer(self, events: List) -> bool:
+        """
+        Enfileira todos os eventos, ou nenhum se não houver espaço para todos.
+
+        Returns:
+            True se os eventos foram aceitos.
+        """
+        if self.max_size - self._queue.qsize() < len(events):
+            return False
+        for event in events:
+            self._queue.put_nowait(event)
+        return True
+
+    def start(self) -> None:
+        """
+        Inicia a task que consome a fila.
+        """
+        if self._consumer is None:
+            self._consumer = asyncio.ensure_future(self._consume())
+
+    async def stop(self) -> None:
+        """
+        Para o consumidor e aplica os eventos que ainda estão na fila.
+
+        Um lote em aplicação não é interrompido: `stop` espera que ele termine,
+        incluindo suas novas tentativas, antes de aplicar o restante da fila.
+        """
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+
+        if self._applying is not None:
+            await self._applying
+            self._applying = None
+
+        while not self._queue.empty():
+            await self._apply(self._take_ready([]))
+
+    async def _consume(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                batch = self._take_ready(batch)
+                remaining = deadline - asyncio.get_running_loop().time()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Protegido do cancelamento em stop, que espera o lote terminar
+            self._applying = asyncio.ensure_future(self._apply(batch))
+            await asyncio.shield(self._applying)
+            self._applying = None
+
+    def _take_ready(self, batch: List) -> List:
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _apply(self, batch: List) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.apply(batch)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to apply {len(batch)} webhook events "
+                               f"(attempt {attempt}/{self.max_attempts}): {str(e)}")
+            if attempt < self.max_attempts:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+        if len(batch) == 1:
+            logger.error(f"Dropping webhook event after {self.max_attempts} attempts: {batch[0]}")
+            return
+
+        middle = len(batch) // 2
+        logger.warning(f"Splitting {len(batch)} webhook events to isolate the failing ones")
+        await self._apply(batch[:middle])
+        await self._apply(batch[middle:])
+
+
+def create_webhook_event_queue(apply: Callable[[List], Awaitable[None]]) -> WebhookEventQueue:
+    """
+    Cria a fila de eventos de webhook a partir das variáveis de ambiente.
+
+    Usa WEBHOOK_QUEUE_SIZE (padrão 10000), WEBHOOK_BATCH_SIZE (padrão 500),
+    WEBHOOK_BATCH_WAIT_MS (padrão 50), WEBHOOK_APPLY_ATTEMPTS (padrão 3) e
+    WEBHOOK_RETRY_DELAY_MS (padrão 100).
+    """
+    return WebhookEventQueue(
+        apply,
+        max_size=int(os.getenv("WEBHOOK_QUEUE_SIZE", "10000")),
+        batch_size=int(os.getenv("WEBHOOK_BATCH_SIZE", "500")),
+        batch_wait=int(os.getenv("WEBHOOK_BATCH_WAIT_MS", "50")) / 1000,
+        max_attempts=int(os.getenv("WEBHOOK_APPLY_ATTEMPTS", "3")),
+        retry_delay=int(os.getenv("WEBHOOK_RETRY_DELAY_MS", "100")) / 1000
+    )
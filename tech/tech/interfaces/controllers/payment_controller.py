@@ -1,10 +1,12 @@
 from fastapi import HTTPException
 from tech.use_cases.payments.create_payment_use_case import CreatePaymentUseCase
 from tech.use_cases.payments.get_payment_status_use_case import GetPaymentStatusUseCase
+from tech.use_cases.payments.get_payment_totals_use_case import GetPaymentTotalsUseCase
+from tech.use_cases.payments.list_payments_use_case import ListPaymentsUseCase
 from tech.use_cases.payments.webhook_payment_use_case import WebhookHandlerUseCase
 from tech.interfaces.presenters.payment_presenter import PaymentPresenter
 from tech.interfaces.schemas.payment_schema import PaymentCreate
-from tech.domain.entities.payments import PaymentStatus
+from tech.domain.entities.payments import InvalidStatusTransition, PaymentStatus
 
 class PaymentController:
     """
@@ -13,21 +15,27 @@ class PaymentController:
 
     def __init__(
         self,
-        create_payment_use_case: CreatePaymentUseCase,
-        get_payment_status_use_case: GetPaymentStatusUseCase,
-        webhook_handler_use_case: WebhookHandlerUseCase
+        create_payment_use_case: CreatePaymentUseCase = None,
+        get_payment_status_use_case: GetPaymentStatusUseCase = None,
+        webhook_handler_use_case: WebhookHandlerUseCase = None,
+        list_payments_use_case: ListPaymentsUseCase = None,
+        get_payment_totals_use_case: GetPaymentTotalsUseCase = None
     ):
         """
-        Initializes the PaymentController with the required use cases.
+        Initializes the PaymentController with the use cases of the routes it serves.
 
         Args:
             create_payment_use_case (CreatePaymentUseCase): Use case for creating a payment.
             get_payment_status_use_case (GetPaymentStatusUseCase): Use case for retrieving payment status.
             webhook_handler_use_case (WebhookHandlerUseCase): Use case for handling webhook updates.
+            list_payments_use_case (ListPaymentsUseCase): Use case for listing payments.
+            get_payment_totals_use_case (GetPaymentTotalsUseCase): Use case for reporting payment totals.
         """
         self.create_payment_use_case = create_payment_use_case
         self.get_payment_status_use_case = get_payment_status_use_case
         self.webhook_handler_use_case = webhook_handler_use_case
+        self.list_payments_use_case = list_payments_use_case
+        self.get_payment_totals_use_case = get_payment_totals_use_case
 
     async def create_payment(self, payment_data: PaymentCreate) -> dict:
         """
@@ -45,6 +53,19 @@ class PaymentController:
         except ValueError as e:
             raise ValueError(str(e))
 
+    async def create_payments(self, order_ids: list) -> dict:
+        """
+        Creates the payments of several orders.
+
+        Args:
+            order_ids (list): The IDs of the orders.
+
+        Returns:
+            dict: One formatted result per order; orders that failed carry an error.
+        """
+        results = await self.create_payment_use_case.execute_many(order_ids)
+        return PaymentPresenter.present_payment_creations(results)
+
     def get_payment_status(self, order_id: int) -> dict:
         """
         Retrieves the payment status of an order.
@@ -64,6 +85,89 @@ class PaymentController:
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
 
+    def get_payment_statuses(self, order_ids: list) -> dict:
+        """
+        Retrieves the payment statuses of several orders.
+
+        Args:
+            order_ids (list): The IDs of the orders.
+
+        Returns:
+            dict: The formatted statuses and the order IDs without a payment.
+        """
+        statuses = self.get_payment_status_use_case.execute_many(order_ids)
+        not_found = [order_id for order_id in dict.fromkeys(order_ids) if order_id not in statuses]
+        return PaymentPresenter.present_payment_statuses(
+            {order_id: status.name for order_id, status in statuses.items()},
+            not_found
+        )
+
+    async def list_payments(self, statuses: list = None, created_from=None, created_to=None,
+                            updated_from=None, updated_to=None, cursor: int = None, limit: int = 100) -> dict:
+        """
+        Lists payments page by page.
+
+        Args:
+            statuses (list): Only payments in one of these status names.
+            created_from: Only payments created at or after this time.
+            created_to: Only payments created before this time.
+            updated_from: Only payments updated at or after this time.
+            updated_to: Only payments updated before this time.
+            cursor (int): The cursor returned with the previous page.
+            limit (int): Maximum number of payments in the page.
+
+        Returns:
+            dict: The formatted payments and the cursor of the next page.
+
+        Raises:
+            HTTPException: If a status is invalid.
+        """
+        try:
+            payment_statuses = [PaymentStatus(status) for status in statuses or []]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid payment status")
+
+        page = await self.list_payments_use_case.execute(
+            statuses=payment_statuses,
+            created_from=created_from,
+            created_to=created_to,
+            updated_from=updated_from,
+            updated_to=updated_to,
+            cursor=cursor,
+            limit=limit,
+        )
+        return PaymentPresenter.present_payment_page(page.payments, page.next_cursor)
+
+    async def get_payment_totals(self, day_from=None, day_to=None, statuses: list = None) -> dict:
+        """
+        Reports the payment counts and amounts by creation day and status.
+
+        Args:
+            day_from: Only days on or after this one.
+            day_to: Only days before this one.
+            statuses (list): Only these status names.
+
+        Returns:
+            dict: The formatted totals.
+
+        Raises:
+            HTTPException: If a status is invalid or the day window ends before it starts.
+        """
+        try:
+            payment_statuses = [PaymentStatus(status) for status in statuses or []]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid payment status")
+
+        try:
+            totals = await self.get_payment_totals_use_case.execute(
+                day_from=day_from,
+                day_to=day_to,
+                statuses=payment_statuses,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return PaymentPresenter.present_payment_totals(totals)
+
     def webhook_payment(self, order_id: int, status: str) -> dict:
         """
         Handles payment status updates via webhook.
@@ -76,7 +180,8 @@ class PaymentController:
             dict: The updated payment status.
 
         Raises:
-            HTTPException: If the payment is not found or if the status is invalid.
+            HTTPException: If the payment is not found, if the status is invalid
+                or if the payment cannot move to it (409).
         """
         try:
             payment_status = PaymentStatus(status)
@@ -86,5 +191,7 @@ class PaymentController:
         try:
             updated_payment = self.webhook_handler_use_case.execute(order_id, payment_status)
             return PaymentPresenter.present_payment_status(updated_payment.order_id, updated_payment.status.value)
+        except InvalidStatusTransition as e:
+            raise HTTPException(status_code=409, detail=str(e))
         except ValueError as e:
             raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,104 @@
+import os
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from tech.infra.ttl_cache import TTLCache
+from tech.interfaces.gateways.order_gateway import OrderGateway
+
+logger = logging.getLogger("cached_order_gateway")
+
+
+class CachedOrderGateway(OrderGateway):
+    """
+    Order gateway decorator that caches orders in process.
+
+    Fresh entries are served without calling the orders service. Once an entry
+    expires it is still served for `stale_ttl` seconds while a background task
+    fetches the current order, so a slow orders service does not add latency to
+    callers. Failed lookups are never cached.
+    """
+
+    def __init__(self, gateway: OrderGateway, cache: TTLCache):
+        """
+        Initialize the cached gateway.
+
+        Args:
+            gateway: The gateway that actually fetches orders, such as HttpOrderGateway.
+            cache: Bounded TTL cache holding the orders by ID.
+        """
+        self.gateway = gateway
+        self.cache = cache
+        self._refreshing: Dict[int, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get_order(self, order_id: int) -> Dict[str, Any]:
+        """
+        Retrieve order details by ID, from the cache when possible.
+
+        Args:
+            order_id: The unique identifier of the order.
+
+        Returns:
+            A dictionary containing order details.
+
+        Raises:
+            ValueError: If the order is not found or communication fails.
+        """
+        entry = self.cache.get_entry(order_id)
+        if entry is not None:
+            if not entry.is_fresh(self.cache.clock()):
+                self._revalidate(order_id)
+            return dict(entry.value)
+
+        return dict(await self._fetch(order_id))
+
+    async def _fetch(self, order_id: int) -> Dict[str, Any]:
+        order = await self.gateway.get_order(order_id)
+        self.cache.put(order_id, order)
+        return order
+
+    def _revalidate(self, order_id: int) -> None:
+        if order_id in self._refreshing:
+            return
+
+        task = asyncio.ensure_future(self._fetch(order_id))
+        self._refreshing[order_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._revalidated(order_id, done))
+
+    def _revalidated(self, order_id: int, task: asyncio.Task) -> None:
+        self._refreshing.pop(order_id, None)
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to revalidate order {order_id}: {task.exception()}")
+
+    async def close(self) -> None:
+        """
+        Cancel the background revalidations that are still running.
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def create_order_cache() -> Optional[TTLCache]:
+    """
+    Create the order cache from environment variables.
+
+    Uses ORDER_CACHE_SIZE (default 10000, 0 disables the cache),
+    ORDER_CACHE_TTL (default 30 seconds) and ORDER_CACHE_STALE_TTL
+    (default 300 seconds).
+
+    Returns:
+        The cache, or None when caching is disabled.
+    """
+    max_size = int(os.getenv("ORDER_CACHE_SIZE", "10000"))
+    if max_size <= 0:
+        return None
+    return TTLCache(
+        max_size=max_size,
+        ttl=float(os.getenv("ORDER_CACHE_TTL", "30")),
+        stale_ttl=float(os.getenv("ORDER_CACHE_STALE_TTL", "300"))
+    )
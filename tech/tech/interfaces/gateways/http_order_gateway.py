@@ -2,24 +2,32 @@
 import httpx
 from typing import Dict, Any, Optional
 
+from tech.infra.single_flight import SingleFlight
+from tech.interfaces.gateways.order_gateway import OrderGateway
 
-class HttpOrderGateway:
+
+class HttpOrderGateway(OrderGateway):
     """
     Gateway for HTTP communication with the orders service.
 
     This gateway encapsulates the details of HTTP communication with the orders service,
     allowing use cases to access order data without being coupled to HTTP implementation.
+    Concurrent lookups of the same order share one in-flight request.
     """
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the gateway with the base URL of the orders service.
 
         Args:
             base_url: Base URL of the orders service API.
+            client: Long-lived client whose connection pool is reused across calls.
+                The gateway does not close it. Without one, each call opens its own client.
         """
         self.base_url = base_url
+        self.client = client
         self.timeout = 10.0  # Timeout in seconds
+        self._in_flight = SingleFlight()
 
     async def get_order(self, order_id: int) -> Dict[str, Any]:
         """
@@ -34,18 +42,28 @@ class HttpOrderGateway:
         Raises:
             ValueError: If the order is not found or communication fails.
         """
+        order = await self._in_flight.do(order_id, lambda: self._request(order_id))
+        return dict(order)
+
+    async def _request(self, order_id: int) -> Dict[str, Any]:
+        if self.client is not None:
+            return await self._get_order(self.client, order_id)
+
         async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/orders/{order_id}",
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    raise ValueError(f"Order with ID {order_id} not found")
-                else:
-                    raise ValueError(f"Error fetching order {order_id}: {str(e)}")
-            except (httpx.RequestError, Exception) as e:
-                raise ValueError(f"Failed to communicate with orders service: {str(e)}")
\ No newline at end of file
+            return await self._get_order(client, order_id)
+
+    async def _get_order(self, client: httpx.AsyncClient, order_id: int) -> Dict[str, Any]:
+        try:
+            response = await client.get(
+                f"{self.base_url}/orders/{order_id}",
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ValueError(f"Order with ID {order_id} not found")
+            else:
+                raise ValueError(f"Error fetching order {order_id}: {str(e)}")
+        except (httpx.RequestError, Exception) as e:
+            raise ValueError(f"Failed to communicate with orders service: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class OrderGateway(ABC):
+    """
+    Interface for retrieving orders from the orders service.
+
+    Implemented by HttpOrderGateway, which calls the service, and by
+    CachedOrderGateway, which wraps another gateway with an in-process cache.
+    """
+
+    @abstractmethod
+    async def get_order(self, order_id: int) -> Dict[str, Any]:
+        """
+        Retrieve order details by ID.
+
+        Args:
+            order_id: The unique identifier of the order.
+
+        Returns:
+            A dictionary containing order details.
+
+        Raises:
+            ValueError: If the order is not found or communication fails.
+        """
+        pass
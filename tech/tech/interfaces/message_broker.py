@@ -1,5 +1,53 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, List, Optional
+
+
+class MessageBatch:
+    """
+    A batch of decoded messages that is acknowledged or rejected as a whole.
+
+    The broker supplies the callables that settle the underlying deliveries;
+    a batch is settled at most once. `headers` holds the transport headers of
+    each message, in the same order as `messages`.
+    """
+
+    def __init__(
+            self,
+            messages: List[dict],
+            on_ack: Callable[[], None],
+            on_nack: Callable[[bool], None],
+            headers: Optional[List[dict]] = None
+    ):
+        self.messages = messages
+        self.headers = headers if headers is not None else [{} for _ in messages]
+        self._on_ack = on_ack
+        self._on_nack = on_nack
+        self.settled = False
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def ack(self) -> None:
+        """
+        Acknowledge every message in the batch.
+        """
+        if not self.settled:
+            self.settled = True
+            self._on_ack()
+
+    def nack(self, requeue: bool = True) -> None:
+        """
+        Reject every message in the batch.
+
+        Args:
+            requeue (bool): Whether the messages should go back to the queue.
+        """
+        if not self.settled:
+            self.settled = True
+            self._on_nack(requeue)
 
 
 class MessageBroker(ABC):
@@ -11,6 +59,15 @@ class MessageBroker(ABC):
     def consume(self, queue: str, callback: Callable[[dict], None]) -> None:
         pass
 
+    def consume_batch(self, queue: str, max_batch: int, max_wait: float) -> Iterable[MessageBatch]:
+        """
+        Consume a queue in batches of up to `max_batch` messages, waiting at most
+        `max_wait` seconds to fill each batch.
+
+        Brokers that do not support batch consumption raise NotImplementedError.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def close(self) -> None:
-        pass
\ No newline at end of file
+        pass
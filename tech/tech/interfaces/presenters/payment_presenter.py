@@ -19,3 +19,96 @@ class PaymentPresenter:
             "order_id": order_id,
             "status": status
         }
+
+
+    @staticmethod
+    def present_payment_statuses(statuses: dict, not_found: list) -> dict:
+        """
+        Formats a batch payment status response.
+
+        Args:
+            statuses (dict): The status name of each order that has a payment, by order ID.
+            not_found (list): The order IDs without a payment.
+
+        Returns:
+            dict: A dictionary with the formatted payments and the order IDs not found.
+        """
+        return {
+            "payments": [
+                PaymentPresenter.present_payment_status(order_id, status)
+                for order_id, status in statuses.items()
+            ],
+            "not_found": not_found
+        }
+
+
+    @staticmethod
+    def present_payment_creations(results: list) -> dict:
+        """
+        Formats a bulk payment creation response.
+
+        Args:
+            results (list): One PaymentCreationResult per order.
+
+        Returns:
+            dict: The status of each created payment and the error of each order that failed.
+        """
+        return {
+            "results": [
+                PaymentPresenter.present_payment_status(result.order_id, result.payment.status.value)
+                if result.payment is not None
+                else {"order_id": result.order_id, "error": result.error}
+                for result in results
+            ]
+        }
+
+
+    @staticmethod
+    def present_payment_page(payments: list, next_cursor) -> dict:
+        """
+        Formats a page of a payment listing.
+
+        Args:
+            payments (list): The payments in the page.
+            next_cursor (Optional[int]): The cursor of the next page, or None on the last page.
+
+        Returns:
+            dict: The formatted payments and the cursor of the next page.
+        """
+        return {
+            "payments": [
+                {
+                    "order_id": payment.order_id,
+                    "amount": payment.amount,
+                    "status": payment.status.name,
+                    "created_at": payment.created_at.isoformat() if payment.created_at else None,
+                    "updated_at": payment.updated_at.isoformat() if payment.updated_at else None,
+                }
+                for payment in payments
+            ],
+            "next_cursor": next_cursor
+        }
+
+
+    @staticmethod
+    def present_payment_totals(totals: list) -> dict:
+        """
+        Formats the payment totals by day and status.
+
+        Args:
+            totals (list): The PaymentDailyTotal rows, ordered by day and status.
+
+        Returns:
+            dict: The count and amount of each day and status.
+        """
+        return {
+            "totals": [
+                {
+                    "day": total.day.isoformat(),
+                    "status": total.status.name,
+                    "count": total.count,
+                    "amount": total.amount,
+                }
+                for total in totals
+            ]
+        }
@@ -0,0 +1,202 @@
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from tech.domain.entities.payments import Payment, PaymentDailyTotal, PaymentStatus
+
+
+class AsyncPaymentRepository(object):
+    """
+    Interface for a Payment Repository used from async code.
+
+    Offers the operations of PaymentRepository with the same arguments and
+    results, but every method is a coroutine, except iter_payments, which
+    returns an async iterator, so callers never block the event loop on the
+    database.
+    """
+
+    async def add(self, payment: Payment) -> Payment:
+        """
+        Save a new payment to the database.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Payment: The saved payment.
+        """
+        raise NotImplementedError
+
+    async def get_by_order_id(self, order_id: int) -> Optional[Payment]:
+        """
+        Retrieve a payment by its order ID.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+
+        Returns:
+            Optional[Payment]: The payment if found, otherwise None.
+        """
+        raise NotImplementedError
+
+    async def update(self, payment: Payment) -> Payment:
+        """
+        Update an existing payment, if its stored status may move to the new one.
+
+        Args:
+            payment (Payment): The payment to update.
+
+        Returns:
+            Payment: The updated payment.
+
+        Raises:
+            ValueError: If no payment is found for the given order ID.
+            InvalidStatusTransition: If the stored status cannot move to the new one.
+        """
+        raise NotImplementedError
+
+    async def transition(self, order_id: int, status: PaymentStatus) -> Optional[Payment]:
+        """
+        Move a payment to a new status with a single conditional write,
+        only if its current status is in `status.allowed_from()`.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+            status (PaymentStatus): The new status.
+
+        Returns:
+            Optional[Payment]: The updated payment, or None if there is no payment
+            for the order or the transition is not allowed.
+        """
+        raise NotImplementedError
+
+    async def add_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save several new payments in a single write.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: The saved payments, in the same order as the input.
+        """
+        raise NotImplementedError
+
+    async def update_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Persist the status of several payments in a single write.
+
+        Args:
+            payments (List[Payment]): The payments to update.
+
+        Returns:
+            List[Payment]: The payments that were written. Payments whose stored
+            status cannot move to the new one, and unknown order IDs, are omitted.
+        """
+        raise NotImplementedError
+
+    async def add_many_if_absent(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save the payments whose order ID is not stored yet, in a single write.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: Only the payments that were inserted.
+        """
+        raise NotImplementedError
+
+    async def add_if_absent(self, payment: Payment) -> Optional[Payment]:
+        """
+        Save a new payment unless a payment for the same order ID already exists.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Optional[Payment]: The saved payment, or None if the order ID was already stored.
+        """
+        raise NotImplementedError
+
+    async def add_or_get(self, payment: Payment) -> Tuple[Payment, bool]:
+        """
+        Save a new payment, or return the stored payment for the same order ID.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Tuple[Payment, bool]: The saved or existing payment, and whether it was created.
+        """
+        raise NotImplementedError
+
+    async def get_by_order_ids(self, order_ids: List[int]) -> List[Payment]:
+        """
+        Retrieve the payments of several orders.
+
+        Args:
+            order_ids (List[int]): The order IDs to look up.
+
+        Returns:
+            List[Payment]: The payments found.
+        """
+        raise NotImplementedError
+
+    async def claim_stale(self, order_ids: List[int], older_than: datetime) -> List[int]:
+        """
+        Claim the payments still in PROCESSING that were last updated before
+        `older_than`, so that only one caller resumes each of them.
+
+        Args:
+            order_ids (List[int]): The order IDs to check.
+            older_than (datetime): Payments updated at or after this moment are still in progress.
+
+        Returns:
+            List[int]: The order IDs claimed by this call.
+        """
+        raise NotImplementedError
+
+    def iter_payments(
+            self,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+            created_from: Optional[datetime] = None,
+            created_to: Optional[datetime] = None,
+            updated_from: Optional[datetime] = None,
+            updated_to: Optional[datetime] = None,
+            after_order_id: Optional[int] = None,
+            limit: Optional[int] = None,
+    ) -> AsyncIterator[Payment]:
+        """
+        Stream the payments matching the filters, ordered by order ID.
+
+        Args:
+            statuses (Optional[Sequence[PaymentStatus]]): Only payments in one of these statuses.
+            created_from (Optional[datetime]): Only payments created at or after this time.
+            created_to (Optional[datetime]): Only payments created before this time.
+            updated_from (Optional[datetime]): Only payments updated at or after this time.
+            updated_to (Optional[datetime]): Only payments updated before this time.
+            after_order_id (Optional[int]): Only payments with a greater order ID.
+            limit (Optional[int]): Maximum number of payments.
+
+        Returns:
+            AsyncIterator[Payment]: The payments, with their timestamps.
+        """
+        raise NotImplementedError
+
+    async def daily_totals(
+            self,
+            day_from: Optional[date] = None,
+            day_to: Optional[date] = None,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+    ) -> List[PaymentDailyTotal]:
+        """
+        Read the payment count and amount by creation day and status.
+
+        Args:
+            day_from (Optional[date]): Only days on or after this one.
+            day_to (Optional[date]): Only days before this one.
+            statuses (Optional[Sequence[PaymentStatus]]): Only these statuses.
+
+        Returns:
+            List[PaymentDailyTotal]: The totals, ordered by day and status.
+        """
+        raise NotImplementedError
@@ -1,5 +1,6 @@
-from typing import Optional
-from tech.domain.entities.payments import Payment, PaymentStatus
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+from tech.domain.entities.payments import Payment, PaymentDailyTotal, PaymentStatus
 
 
 class PaymentRepository(object):
@@ -10,6 +11,16 @@ class PaymentRepository(object):
         add(payment: Payment) -> Payment: Save a new payment in the database.
         get_by_order_id(order_id: int) -> Optional[Payment]: Retrieve a payment by its order ID.
         update(payment: Payment) -> Payment: Update an existing payment.
+        transition(order_id: int, status: PaymentStatus) -> Optional[Payment]: Move a payment to an allowed status.
+        add_many(payments: List[Payment]) -> List[Payment]: Save several new payments at once.
+        update_many(payments: List[Payment]) -> List[Payment]: Persist the status of several payments at once.
+        add_many_if_absent(payments: List[Payment]) -> List[Payment]: Save only payments for new order IDs.
+        add_if_absent(payment: Payment) -> Optional[Payment]: Save a payment unless its order ID exists.
+        add_or_get(payment: Payment) -> Tuple[Payment, bool]: Save a payment or return the existing one.
+        get_by_order_ids(order_ids: List[int]) -> List[Payment]: Retrieve the payments of several orders.
+        claim_stale(order_ids: List[int], older_than: datetime) -> List[int]: Claim abandoned PROCESSING payments.
+        iter_payments(...) -> Iterator[Payment]: Stream the payments matching filters, by order ID.
+        daily_totals(...) -> List[PaymentDailyTotal]: Read the payment totals by creation day and status.
     """
 
     def add(self, payment: Payment) -> Payment:
@@ -38,12 +49,164 @@ class PaymentRepository(object):
 
     def update(self, payment: Payment) -> Payment:
         """
-        Update an existing payment.
+        Update an existing payment, if its stored status may move to the new one.
 
         Args:
             payment (Payment): The payment to update.
 
         Returns:
             Payment: The updated payment.
+
+        Raises:
+            ValueError: If no payment is found for the given order ID.
+            InvalidStatusTransition: If the stored status cannot move to the new one.
+        """
+        raise NotImplementedError
+
+    def transition(self, order_id: int, status: PaymentStatus) -> Optional[Payment]:
+        """
+        Move a payment to a new status with a single conditional write,
+        only if its current status is in `status.allowed_from()`.
+
+        Args:
+            order_id (int): The order ID associated with the payment.
+            status (PaymentStatus): The new status.
+
+        Returns:
+            Optional[Payment]: The updated payment, or None if there is no payment
+            for the order or the transition is not allowed.
+        """
+        raise NotImplementedError
+
+    def add_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save several new payments in a single write.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: The saved payments, in the same order as the input.
+        """
+        raise NotImplementedError
+
+    def update_many(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Persist the status of several payments in a single write.
+
+        Args:
+            payments (List[Payment]): The payments to update.
+
+        Returns:
+            List[Payment]: The payments that were written. Payments whose stored
+            status cannot move to the new one, and unknown order IDs, are omitted.
+        """
+        raise NotImplementedError
+
+    def add_many_if_absent(self, payments: List[Payment]) -> List[Payment]:
+        """
+        Save the payments whose order ID is not stored yet, in a single write.
+
+        Args:
+            payments (List[Payment]): The payments to save.
+
+        Returns:
+            List[Payment]: Only the payments that were inserted.
+        """
+        raise NotImplementedError
+
+    def add_if_absent(self, payment: Payment) -> Optional[Payment]:
+        """
+        Save a new payment unless a payment for the same order ID already exists.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Optional[Payment]: The saved payment, or None if the order ID was already stored.
+        """
+        raise NotImplementedError
+
+    def add_or_get(self, payment: Payment) -> Tuple[Payment, bool]:
+        """
+        Save a new payment, or return the stored payment for the same order ID.
+
+        Args:
+            payment (Payment): The payment to save.
+
+        Returns:
+            Tuple[Payment, bool]: The saved or existing payment, and whether it was created.
+        """
+        raise NotImplementedError
+
+    def get_by_order_ids(self, order_ids: List[int]) -> List[Payment]:
+        """
+        Retrieve the payments of several orders.
+
+        Args:
+            order_ids (List[int]): The order IDs to look up.
+
+        Returns:
+            List[Payment]: The payments found.
+        """
+        raise NotImplementedError
+
+    def claim_stale(self, order_ids: List[int], older_than: datetime) -> List[int]:
+        """
+        Claim the payments still in PROCESSING that were last updated before
+        `older_than`, so that only one caller resumes each of them.
+
+        Args:
+            order_ids (List[int]): The order IDs to check.
+            older_than (datetime): Payments updated at or after this moment are still in progress.
+
+        Returns:
+            List[int]: The order IDs claimed by this call.
+        """
+        raise NotImplementedError
+
+    def iter_payments(
+            self,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+            created_from: Optional[datetime] = None,
+            created_to: Optional[datetime] = None,
+            updated_from: Optional[datetime] = None,
+            updated_to: Optional[datetime] = None,
+            after_order_id: Optional[int] = None,
+            limit: Optional[int] = None,
+    ) -> Iterator[Payment]:
+        """
+        Stream the payments matching the filters, ordered by order ID.
+
+        Args:
+            statuses (Optional[Sequence[PaymentStatus]]): Only payments in one of these statuses.
+            created_from (Optional[datetime]): Only payments created at or after this time.
+            created_to (Optional[datetime]): Only payments created before this time.
+            updated_from (Optional[datetime]): Only payments updated at or after this time.
+            updated_to (Optional[datetime]): Only payments updated before this time.
+            after_order_id (Optional[int]): Only payments with a greater order ID.
+            limit (Optional[int]): Maximum number of payments.
+
+        Returns:
+            Iterator[Payment]: The payments, with their timestamps.
+        """
+        raise NotImplementedError
+
+    def daily_totals(
+            self,
+            day_from: Optional[date] = None,
+            day_to: Optional[date] = None,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+    ) -> List[PaymentDailyTotal]:
+        """
+        Read the payment count and amount by creation day and status.
+
+        Args:
+            day_from (Optional[date]): Only days on or after this one.
+            day_to (Optional[date]): Only days before this one.
+            statuses (Optional[Sequence[PaymentStatus]]): Only these statuses.
+
+        Returns:
+            List[PaymentDailyTotal]: The totals, ordered by day and status.
         """
         raise NotImplementedError
@@ -1,5 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
+from typing import Annotated, List
+
+MAX_BATCH_ORDER_IDS = 5000
+MAX_BULK_PAYMENTS = 1000
+MAX_WEBHOOK_EVENTS = 1000
+MAX_PAYMENTS_PAGE = 1000
 
 
 
@@ -23,6 +29,17 @@ class PaymentCreate(BaseModel):
 
 
 
+class PaymentBulkCreate(BaseModel):
+    """
+    Schema for creating the payments of several orders at once.
+
+    Attributes:
+        order_ids (List[int]): The IDs of the orders, at most MAX_BULK_PAYMENTS.
+    """
+    order_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_PAYMENTS)
+
+
+
 class PaymentStatusResponse(BaseModel):
     """
     Schema for representing the response of a payment status.
@@ -33,3 +50,31 @@ class PaymentStatusResponse(BaseModel):
     """
     order_id: int
     status: PaymentStatus
+
+
+
+class PaymentStatusBatchRequest(BaseModel):
+    """
+    Schema for looking up the payment status of several orders at once.
+
+    Attributes:
+        order_ids (List[int]): The IDs of the orders, at most MAX_BATCH_ORDER_IDS.
+    """
+    order_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_ORDER_IDS)
+
+
+
+class WebhookEvent(BaseModel):
+    """
+    Schema for a payment status event sent by the payment provider.
+
+    Attributes:
+        order_id (int): The ID of the order.
+        status (PaymentStatus): The new status of its payment.
+    """
+    order_id: int
+    status: PaymentStatus
+
+
+
+WebhookEventBatch = Annotated[List[WebhookEvent], Field(min_length=1, max_length=MAX_WEBHOOK_EVENTS)]
@@ -1,9 +1,25 @@
-from tech.interfaces.gateways.http_order_gateway import HttpOrderGateway
-from tech.interfaces.repositories.payment_repository import PaymentRepository
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional
+
+from tech.interfaces.gateways.order_gateway import OrderGateway
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
 from tech.domain.entities.payments import Payment, PaymentStatus
 from tech.interfaces.schemas.payment_schema import PaymentCreate
 
 
+@dataclass
+class PaymentCreationResult:
+    """
+    Outcome of creating the payment of one order in a bulk creation.
+
+    Exactly one of `payment` and `error` is set.
+    """
+    order_id: int
+    payment: Optional[Payment] = None
+    error: Optional[str] = None
+
+
 class CreatePaymentUseCase:
     """
     Use case for creating a payment.
@@ -15,8 +31,9 @@ class CreatePaymentUseCase:
 
     def __init__(
             self,
-            payment_repository: PaymentRepository,
-            order_gateway: HttpOrderGateway,
+            payment_repository: AsyncPaymentRepository,
+            order_gateway: OrderGateway,
+            max_concurrency: int = 20,
     ):
         """
         Initialize the CreatePaymentUseCase with dependencies.
@@ -24,27 +41,36 @@ class CreatePaymentUseCase:
         Args:
             payment_repository: Repository for storing payment data.
             order_gateway: Gateway for retrieving order information from the orders service.
+            max_concurrency: Maximum concurrent order lookups in a bulk creation.
         """
         self.payment_repository = payment_repository
         self.order_gateway = order_gateway
+        self.max_concurrency = max(1, max_concurrency)
 
     async def execute(self, payment_data: PaymentCreate) -> Payment:
         """
-        Create a new payment for an order.
+        Create a new payment for an order, or return the one it already has.
 
-        Retrieves order details from the orders service, creates a payment record
-        with the appropriate amount, and stores it in the payment database.
+        An existing payment is returned without calling the orders service.
+        Otherwise the order details are retrieved from the orders service and
+        the payment is stored with an insert that returns the existing payment
+        instead of failing if another request created it in the meantime.
 
         Args:
             payment_data: The payment data containing the order ID.
 
         Returns:
-            The created payment with the initial status.
+            The created payment with the initial status, or the existing payment.
 
         Raises:
             ValueError: If the order is not found or communication fails.
         """
         try:
+            # Pagamentos já existentes são devolvidos sem consultar o serviço de pedidos
+            existing = await self.payment_repository.get_by_order_ids([payment_data.order_id])
+            if existing:
+                return existing[0]
+
             # Obter detalhes do pedido via gateway HTTP
             order = await self.order_gateway.get_order(payment_data.order_id)
 
@@ -61,7 +87,7 @@ class CreatePaymentUseCase:
             )
 
             # Salvar no repositório
-            saved_payment = self.payment_repository.add(payment)
+            saved_payment, _ = await self.payment_repository.add_or_get(payment)
             return saved_payment
 
         except ValueError as e:
@@ -69,4 +95,54 @@ class CreatePaymentUseCase:
             raise e
         except Exception as e:
             # Converter outros erros em erros de valor com mensagem apropriada
-            raise ValueError(f"Failed to create payment: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to create payment: {str(e)}")
+
+    async def execute_many(self, order_ids: List[int]) -> List[PaymentCreationResult]:
+        """
+        Create the payments of several orders.
+
+        Order totals are fetched concurrently, with at most `max_concurrency`
+        lookups in flight, and all payments are inserted with a single
+        statement that skips orders which already have a payment. A failure
+        for one order does not fail the others.
+
+        Args:
+            order_ids: The IDs of the orders. Duplicates are created once.
+
+        Returns:
+            One result per distinct order ID, in the order they were given.
+        """
+        unique_ids = list(dict.fromkeys(order_ids))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_amount(order_id: int) -> float:
+            async with semaphore:
+                order = await self.order_gateway.get_order(order_id)
+            amount = order.get("total_price")
+            if amount is None:
+                raise ValueError("Order does not have a valid total price")
+            return amount
+
+        amounts = await asyncio.gather(*(fetch_amount(order_id) for order_id in unique_ids), return_exceptions=True)
+
+        results = {}
+        payments = []
+        for order_id, amount in zip(unique_ids, amounts):
+            if isinstance(amount, ValueError):
+                results[order_id] = PaymentCreationResult(order_id, error=str(amount))
+            elif isinstance(amount, BaseException):
+                results[order_id] = PaymentCreationResult(order_id, error=f"Failed to create payment: {str(amount)}")
+            else:
+                payments.append(Payment(order_id=order_id, amount=amount, status=PaymentStatus.PENDING))
+
+        saved_payments = await self.payment_repository.add_many_if_absent(payments)
+
+        for payment in saved_payments:
+            results[payment.order_id] = PaymentCreationResult(payment.order_id, payment=payment)
+        for payment in payments:
+            results.setdefault(
+                payment.order_id,
+                PaymentCreationResult(payment.order_id, error="Payment already exists for this order")
+            )
+
+        return [results[order_id] for order_id in unique_ids]
@@ -1,3 +1,4 @@
+from typing import Dict, List
 from tech.interfaces.repositories.payment_repository import PaymentRepository
 from tech.domain.entities.payments import PaymentStatus
 
@@ -34,3 +35,22 @@ class GetPaymentStatusUseCase(object):
             raise ValueError("Payment not found for the given order ID.")
 
         return payment.status
+
+
+    def execute_many(self, order_ids: List[int]) -> Dict[int, PaymentStatus]:
+        """
+        Retrieve the payment statuses of several orders with a single repository call.
+
+        Args:
+            order_ids (List[int]): The IDs of the orders. Duplicates are looked up once.
+
+        Returns:
+            Dict[int, PaymentStatus]: The status of each order that has a payment,
+            in the order the IDs were given. Orders without a payment are omitted.
+        """
+        unique_ids = list(dict.fromkeys(order_ids))
+        statuses = {
+            payment.order_id: payment.status
+            for payment in self.payment_repository.get_by_order_ids(unique_ids)
+        }
+        return {order_id: statuses[order_id] for order_id in unique_ids if order_id in statuses}
@@ -0,0 +1,44 @@
+from datetime import date
+from typing import List, Optional, Sequence
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+from tech.domain.entities.payments import PaymentDailyTotal, PaymentStatus
+
+
+class GetPaymentTotalsUseCase(object):
+    """
+    Use case to report payment counts and amounts by creation day and status.
+    """
+
+    def __init__(self, payment_repository: AsyncPaymentRepository):
+        """
+        Initialize the use case with a payment repository.
+
+        Args:
+            payment_repository (AsyncPaymentRepository): The repository for accessing payment data.
+        """
+        self.payment_repository = payment_repository
+
+    async def execute(
+            self,
+            day_from: Optional[date] = None,
+            day_to: Optional[date] = None,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+    ) -> List[PaymentDailyTotal]:
+        """
+        Retrieve the totals of a day window from the rollup, without scanning payments.
+
+        Args:
+            day_from (Optional[date]): Only days on or after this one.
+            day_to (Optional[date]): Only days before this one.
+            statuses (Optional[Sequence[PaymentStatus]]): Only these statuses.
+
+        Returns:
+            List[PaymentDailyTotal]: One total per day and status with payments, ordered by day and status.
+
+        Raises:
+            ValueError: If the window ends before it starts.
+        """
+        if day_from is not None and day_to is not None and day_to < day_from:
+            raise ValueError("day_to must not be before day_from")
+
+        return await self.payment_repository.daily_totals(day_from=day_from, day_to=day_to, statuses=statuses)
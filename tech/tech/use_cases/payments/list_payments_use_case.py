@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+from tech.domain.entities.payments import Payment, PaymentStatus
+
+
+@dataclass
+class PaymentPage:
+    """
+    One page of a payment listing.
+
+    `next_cursor` is the order ID to pass as the cursor of the next page, or
+    None on the last page.
+    """
+    payments: List[Payment] = field(default_factory=list)
+    next_cursor: Optional[int] = None
+
+
+def _as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored as naive UTC
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class ListPaymentsUseCase(object):
+    """
+    Use case to list payments page by page, filtered by status and time window.
+    """
+
+    def __init__(self, payment_repository: AsyncPaymentRepository):
+        """
+        Initialize the use case with a payment repository.
+
+        Args:
+            payment_repository (AsyncPaymentRepository): The repository for accessing payment data.
+        """
+        self.payment_repository = payment_repository
+
+    async def execute(
+            self,
+            statuses: Optional[Sequence[PaymentStatus]] = None,
+            created_from: Optional[datetime] = None,
+            created_to: Optional[datetime] = None,
+            updated_from: Optional[datetime] = None,
+            updated_to: Optional[datetime] = None,
+            cursor: Optional[int] = None,
+            limit: int = 100,
+    ) -> PaymentPage:
+        """
+        Retrieve one page of payments ordered by order ID.
+
+        One extra payment is read to tell whether another page follows, so the
+        last page never points to an empty one.
+
+        Args:
+            statuses (Optional[Sequence[PaymentStatus]]): Only payments in one of these statuses.
+            created_from (Optional[datetime]): Only payments created at or after this time.
+            created_to (Optional[datetime]): Only payments created before this time.
+            updated_from (Optional[datetime]): Only payments updated at or after this time.
+            updated_to (Optional[datetime]): Only payments updated before this time.
+            cursor (Optional[int]): The `next_cursor` of the previous page.
+            limit (int): Maximum number of payments in the page.
+
+        Returns:
+            PaymentPage: The payments and the cursor of the next page.
+        """
+        payments = []
+        async for payment in self.payment_repository.iter_payments(
+                statuses=statuses,
+                created_from=_as_utc(created_from),
+                created_to=_as_utc(created_to),
+                updated_from=_as_utc(updated_from),
+                updated_to=_as_utc(updated_to),
+                after_order_id=cursor,
+                limit=limit + 1,
+        ):
+            payments.append(payment)
+            if len(payments) > limit:
+                break
+
+        if len(payments) <= limit:
+            return PaymentPage(payments)
+        payments = payments[:limit]
+        return PaymentPage(payments, next_cursor=payments[-1].order_id)
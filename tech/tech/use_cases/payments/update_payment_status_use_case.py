@@ -1,4 +1,4 @@
-from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentStatus
 from tech.interfaces.repositories.payment_repository import PaymentRepository
 
 class UpdatePaymentStatusUseCase(object):
@@ -25,10 +25,16 @@ class UpdatePaymentStatusUseCase(object):
 
         Raises:
             ValueError: If the payment is not found or the status is invalid.
+            InvalidStatusTransition: If the payment cannot move to the new status.
         """
-        payment = self.payment_repository.get_by_order_id(order_id)
-        if not payment:
-            raise ValueError("Payment not found for this order.")
+        payment = self.payment_repository.transition(order_id, new_status)
+        if payment is not None:
+            return payment
 
-        payment.status = new_status
-        return self.payment_repository.update(payment)
+        # Only a refused update pays for the extra lookup that explains it
+        current = self.payment_repository.get_by_order_id(order_id)
+        if not current:
+            raise ValueError("Payment not found for this order.")
+        raise InvalidStatusTransition(
+            f"Cannot change payment status from {current.status.name} to {new_status.name}"
+        )
@@ -1,4 +1,6 @@
-from tech.domain.entities.payments import PaymentStatus
+from typing import Iterable, List, Tuple
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentStatus
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
 from tech.interfaces.repositories.payment_repository import PaymentRepository
 
 class WebhookHandlerUseCase(object):
@@ -26,6 +28,7 @@ class WebhookHandlerUseCase(object):
 
         Raises:
             ValueError: If the payment is not found or the status is invalid.
+            InvalidStatusTransition: If the payment cannot move to the new status.
         """
         if isinstance(payment_status, PaymentStatus):
             payment_status_enum = payment_status
@@ -34,10 +37,50 @@ class WebhookHandlerUseCase(object):
                 raise ValueError(f"Invalid payment status: {payment_status}")
             payment_status_enum = PaymentStatus[payment_status]
 
-        payment = self.payment_repository.get_by_order_id(order_id)
-        if not payment:
+        payment = self.payment_repository.transition(order_id, payment_status_enum)
+        if payment is not None:
+            return payment
+
+        # Only a refused update pays for the extra lookup that explains it
+        current = self.payment_repository.get_by_order_id(order_id)
+        if not current:
             raise ValueError("Payment not found for this order.")
+        raise InvalidStatusTransition(
+            f"Cannot change payment status from {current.status.name} to {payment_status_enum.name}"
+        )
+
+
+class WebhookBatchHandlerUseCase(object):
+    """
+    Applies batches of payment status events received via webhooks.
+
+    Args:
+        payment_repository (AsyncPaymentRepository): The async repository interface for Payment-related operations.
+    """
+
+    def __init__(self, payment_repository: AsyncPaymentRepository):
+        self.payment_repository = payment_repository
+
+    async def execute(self, events: Iterable[Tuple[int, PaymentStatus]]) -> List[Payment]:
+        """
+        Applies a batch of webhook status events with a single bulk update.
+
+        When an order appears more than once, the last event wins. Events for
+        unknown orders, and events whose status the stored one cannot move to,
+        change nothing.
+
+        Args:
+            events (Iterable[Tuple[int, PaymentStatus]]): (order_id, status) pairs, in arrival order.
+
+        Returns:
+            List[Payment]: The payments whose status was actually written, as stored.
+        """
+        statuses = {}
+        for order_id, payment_status in events:
+            statuses[order_id] = payment_status
 
-        payment.status = payment_status_enum
-        self.payment_repository.update(payment)
-        return payment
+        payments = [
+            Payment(order_id=order_id, amount=None, status=payment_status)
+            for order_id, payment_status in statuses.items()
+        ]
+        return await self.payment_repository.update_many(payments)
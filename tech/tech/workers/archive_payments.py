@@ -0,0 +1,176 @@
+import os
+import sys
+import gzip
+import logging
+import argparse
+import traceback
+from datetime import date
+from typing import List, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("archive_payments")
+
+from sqlalchemy import text
+from tech.infra.databases.partitions import (
+    PAYMENTS_TABLE,
+    ensure_partitions,
+    expired_partitions,
+    list_detached_partitions,
+    list_partitions,
+    list_pending_detach_partitions,
+)
+
+PAYMENT_RETENTION_MONTHS = int(os.getenv("PAYMENT_RETENTION_MONTHS", "12"))
+PAYMENT_PARTITIONS_AHEAD = int(os.getenv("PAYMENT_PARTITIONS_AHEAD", "3"))
+PAYMENT_ARCHIVE_DIR = os.getenv("PAYMENT_ARCHIVE_DIR", "./archive")
+
+
+def export_partition(driver_connection, name: str, archive_dir: str) -> str:
+    """
+    Exporta uma partição para um CSV compactado com gzip, em streaming.
+
+    O COPY ... TO STDOUT é lido em blocos e escrito direto no arquivo, sem
+    carregar a partição em memória. O arquivo é gravado com sufixo .partial e
+    só é renomeado depois de sincronizado com o disco, para que um arquivo
+    final nunca fique incompleto.
+
+    Args:
+        driver_connection: Conexão psycopg 3
+        name: Nome da partição
+        archive_dir: Diretório de destino
+
+    Returns:
+        O caminho do arquivo gerado.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    partial = f"{path}.partial"
+
+    with open(partial, "wb") as raw:
+        with gzip.GzipFile(filename=f"{name}.csv", mode="wb", fileobj=raw) as archive:
+            with driver_connection.cursor() as cursor:
+                with cursor.copy(f"COPY {name} TO STDOUT (FORMAT csv, HEADER)") as copy:
+                    for chunk in copy:
+                        archive.write(chunk)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    os.replace(partial, path)
+    return path
+
+
+def archive_partition(
+        connection,
+        name: str,
+        archive_dir: str,
+        attached: bool = True,
+        detach_pending: bool = False
+) -> str:
+    """
+    Desanexa, exporta e remove uma partição de `payments`.
+
+    O DETACH ... CONCURRENTLY não bloqueia leituras e escritas na tabela e
+    exige uma conexão em autocommit. Ele roda em duas transações: se o
+    processo parar entre elas, a partição fica com o desanexo pendente e a
+    próxima execução o conclui com DETACH ... FINALIZE; se parar depois do
+    DETACH, a tabela desanexada é exportada na próxima execução. Os order IDs
+    continuam em payment_order_ids, para que um pedido arquivado não receba
+    outro pagamento.
+
+    Args:
+        connection: Conexão SQLAlchemy em autocommit
+        name: Nome da partição
+        archive_dir: Diretório de destino
+        attached: Se a partição ainda está anexada a `payments`
+        detach_pending: Se um DETACH CONCURRENTLY anterior foi interrompido
+
+    Returns:
+        O caminho do arquivo gerado.
+    """
+    if detach_pending:
+        connection.execute(text(f"ALTER TABLE {PAYMENTS_TABLE} DETACH PARTITION {name} FINALIZE"))
+    elif attached:
+        connection.execute(text(f"ALTER TABLE {PAYMENTS_TABLE} DETACH PARTITION {name} CONCURRENTLY"))
+
+    path = export_partition(connection.connection.driver_connection, name, archive_dir)
+    connection.execute(text(f"DROP TABLE {name}"))
+    logger.info(f"Archived partition {name} to {path}")
+    return path
+
+
+def archive_expired_partitions(
+        engine,
+        archive_dir: str,
+        retention_months: int,
+        months_ahead: int,
+        today: Optional[date] = None
+) -> List[str]:
+    """
+    Garante as partições futuras e arquiva as que passaram da retenção.
+
+    Args:
+        engine: Engine SQLAlchemy do PostgreSQL
+        archive_dir: Diretório de destino dos arquivos
+        retention_months: Meses completos mantidos antes do mês atual
+        months_ahead: Meses futuros que devem ter partição
+        today: Data de referência. Padrão: hoje, em UTC
+
+    Returns:
+        Os caminhos dos arquivos gerados.
+    """
+    with engine.connect() as connection:
+        ensure_partitions(connection, months_ahead, today)
+
+    archived = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name in expired_partitions(list_detached_partitions(connection), retention_months, today):
+            archived.append(archive_partition(connection, name, archive_dir, attached=False))
+        for name in expired_partitions(list_pending_detach_partitions(connection), retention_months, today):
+            archived.append(archive_partition(connection, name, archive_dir, detach_pending=True))
+        for name in expired_partitions(list_partitions(connection), retention_months, today):
+            archived.append(archive_partition(connection, name, archive_dir))
+    return archived
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Cria as partições futuras de payments e arquiva as partições antigas."
+    )
+    parser.add_argument("--retention-months", type=int, default=PAYMENT_RETENTION_MONTHS,
+                        help="meses completos mantidos antes do mês atual")
+    parser.add_argument("--months-ahead", type=int, default=PAYMENT_PARTITIONS_AHEAD,
+                        help="meses futuros que devem ter partição")
+    parser.add_argument("--archive-dir", default=PAYMENT_ARCHIVE_DIR,
+                        help="diretório dos arquivos .csv.gz")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Função principal do job de arquivamento de pagamentos.
+    """
+    args = parse_args(argv)
+
+    from tech.infra.databases.database import engine
+
+    try:
+        archived = archive_expired_partitions(
+            engine,
+            archive_dir=args.archive_dir,
+            retention_months=args.retention_months,
+            months_ahead=args.months_ahead
+        )
+        logger.info(f"Archived {len(archived)} payment partitions")
+    except Exception as e:
+        logger.error(f"Error archiving payment partitions: {str(e)}")
+        logger.error(traceback.format_exc())
+        sys.exit(1)
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import logging
+import argparse
+import traceback
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("rebuild_payment_totals")
+
+from sqlalchemy import text
+from tech.infra.databases.partitions import add_months, month_start
+
+PAYMENT_RETENTION_MONTHS = int(os.getenv("PAYMENT_RETENTION_MONTHS", "12"))
+
+
+def rebuild_totals(connection, day_from: date, day_to: date, retention_months: int,
+                   today: Optional[date] = None) -> int:
+    """
+    Recalcula payment_daily_totals a partir de `payments` para os dias em [day_from, day_to).
+
+    Os escritores do repositório mantêm o rollup no mesmo comando que grava os
+    pagamentos; este job só corrige dias gravados por fora dele, como as
+    escritas de réplicas antigas durante o deploy da migração. A tabela do
+    rollup fica bloqueada para escrita até o commit, então escritas concorrentes
+    de pagamentos esperam e são somadas sobre o resultado recalculado. Dias
+    cujas partições podem já ter sido arquivadas são recusados, pois seriam zerados.
+
+    Args:
+        connection: Conexão SQLAlchemy; a transação é confirmada ao final
+        day_from: Primeiro dia recalculado
+        day_to: Dia seguinte ao último recalculado
+        retention_months: Meses completos mantidos antes do mês atual
+        today: Data de referência. Padrão: hoje, em UTC
+
+    Returns:
+        O número de linhas do rollup gravadas.
+    """
+    cutoff = add_months(month_start(today or datetime.utcnow().date()), -retention_months)
+    if day_from < cutoff:
+        raise ValueError(f"Days before {cutoff.isoformat()} may be archived and cannot be rebuilt")
+    if day_to <= day_from:
+        raise ValueError("day_to must be after day_from")
+
+    window = {"day_from": day_from, "day_to": day_to}
+    connection.execute(text("LOCK TABLE payment_daily_totals IN EXCLUSIVE MODE"))
+    connection.execute(text(
+        "DELETE FROM payment_daily_totals WHERE day >= :day_from AND day < :day_to"
+    ), window)
+    result = connection.execute(text(
+        "INSERT INTO payment_daily_totals (day, status, count, amount) "
+        "SELECT CAST(created_at AS DATE), status, count(*), sum(CAST(amount AS NUMERIC)) FROM payments "
+        "WHERE created_at >= :day_from AND created_at < :day_to "
+        "GROUP BY 1, 2"
+    ), window)
+    connection.commit()
+    return result.rowcount
+
+
+def parse_args(argv=None):
+    today = datetime.utcnow().date()
+    parser = argparse.ArgumentParser(
+        description="Recalcula o rollup diário de pagamentos a partir da tabela payments."
+    )
+    parser.add_argument("--day-from", type=date.fromisoformat, default=today - timedelta(days=1),
+                        help="primeiro dia recalculado (AAAA-MM-DD). Padrão: ontem")
+    parser.add_argument("--day-to", type=date.fromisoformat, default=today + timedelta(days=1),
+                        help="dia seguinte ao último recalculado (AAAA-MM-DD). Padrão: amanhã")
+    parser.add_argument("--retention-months", type=int, default=PAYMENT_RETENTION_MONTHS,
+                        help="meses completos mantidos antes do mês atual")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Função principal do job de reconstrução do rollup de pagamentos.
+    """
+    args = parse_args(argv)
+
+    from tech.infra.databases.database import engine
+
+    try:
+        with engine.connect() as connection:
+            rows = rebuild_totals(connection, args.day_from, args.day_to, args.retention_months)
+        logger.info(f"Rebuilt {rows} payment totals from {args.day_from} to {args.day_to}")
+    except Exception as e:
+        logger.error(f"Error rebuilding payment totals: {str(e)}")
+        logger.error(traceback.format_exc())
+        sys.exit(1)
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import traceback
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("replay_dead_letters")
+
+from tech.infra.rabbitmq_broker import RabbitMQBroker, message_properties
+from tech.infra.retry_queues import ATTEMPT_HEADER, create_retry_queues
+
+RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "localhost")
+RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", "5672"))
+RABBITMQ_USER = os.getenv("RABBITMQ_USER", "user")
+RABBITMQ_PASS = os.getenv("RABBITMQ_PASS", "password")
+PAYMENT_REQUESTS_QUEUE = "payment_requests"
+
+
+def replay_dead_letters(channel, retry_queues, rate: float, limit: int = None, sleep=time.sleep) -> int:
+    """
+    Move mensagens da DLQ de volta para a fila de trabalho a uma taxa controlada.
+
+    Cada mensagem é republicada com o contador de tentativas zerado e só então
+    removida da DLQ, com o canal em modo confirm: se a republicação falhar, a
+    mensagem continua na DLQ.
+
+    Args:
+        channel: Canal bloqueante do pika
+        retry_queues: Topologia de reprocessamento da fila de trabalho
+        rate: Mensagens por segundo (0 para não limitar)
+        limit: Número máximo de mensagens a reprocessar (None para esvaziar a DLQ)
+        sleep: Função de espera entre mensagens
+
+    Returns:
+        O número de mensagens reprocessadas.
+    """
+    channel.queue_declare(queue=retry_queues.queue, durable=True)
+    channel.queue_declare(queue=retry_queues.dead_letter_queue, durable=True)
+    channel.confirm_delivery()
+
+    interval = 1.0 / rate if rate > 0 else 0
+    replayed = 0
+
+    while limit is None or replayed < limit:
+        method, properties, body = channel.basic_get(queue=retry_queues.dead_letter_queue, auto_ack=False)
+        if method is None:
+            break
+
+        headers = dict(properties.headers or {})
+        headers.pop(ATTEMPT_HEADER, None)
+        channel.basic_publish(
+            exchange='',
+            routing_key=retry_queues.queue,
+            body=body,
+            properties=message_properties(headers)
+        )
+        channel.basic_ack(delivery_tag=method.delivery_tag)
+        replayed += 1
+
+        if interval:
+            sleep(interval)
+
+    return replayed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Reprocessa mensagens da dead-letter queue de requisições de pagamento."
+    )
+    parser.add_argument("--rate", type=float, default=10.0,
+                        help="mensagens por segundo (0 para não limitar)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="número máximo de mensagens (padrão: esvaziar a DLQ)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Função principal do comando de reprocessamento da DLQ.
+    """
+    args = parse_args(argv)
+    retry_queues = create_retry_queues(PAYMENT_REQUESTS_QUEUE)
+    broker = None
+
+    try:
+        broker = RabbitMQBroker(
+            host=RABBITMQ_HOST,
+            port=RABBITMQ_PORT,
+            user=RABBITMQ_USER,
+            password=RABBITMQ_PASS
+        )
+        replayed = replay_dead_letters(broker.channel, retry_queues, rate=args.rate, limit=args.limit)
+        logger.info(f"Replayed {replayed} messages from '{retry_queues.dead_letter_queue}'")
+    except KeyboardInterrupt:
+        logger.info("Replay interrupted by user")
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Error replaying dead letters: {str(e)}")
+        logger.error(traceback.format_exc())
+        sys.exit(1)
+    finally:
+        if broker is not None:
+            broker.close()
+
+
+if __name__ == "__main__":
+    main()
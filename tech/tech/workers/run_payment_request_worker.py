@@ -1,13 +1,13 @@
 import os
 import sys
-import json
+import signal
 import logging
 import asyncio
-import pika
 import traceback
 import uuid
-from datetime import datetime
-from sqlalchemy.orm import Session
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -15,10 +15,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger("payment_request_worker")
 
-from tech.infra.databases.database import get_session
-from tech.infra.async_rabbitmq_broker import create_async_rabbitmq_broker
+from tech.infra.databases.database import engine
+from tech.infra.asyncio_rabbitmq_broker import create_asyncio_rabbitmq_broker
+from tech.infra.retry_queues import create_retry_queues
 from tech.infra.repositories.sql_alchemy_payment_repository import SQLAlchemyPaymentRepository
-from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentStatus
 from tech.infra.mock_payment_provider import MockPaymentProvider
 
 RABBITMQ_HOST = os.getenv("RABBITMQ_HOST", "localhost")
@@ -26,6 +27,62 @@ RABBITMQ_PORT = int(os.getenv("RABBITMQ_PORT", "5672"))
 RABBITMQ_USER = os.getenv("RABBITMQ_USER", "user")
 RABBITMQ_PASS = os.getenv("RABBITMQ_PASS", "password")
 PAYMENT_REQUESTS_QUEUE = "payment_requests"
+PAYMENT_RESPONSES_QUEUE = "payment_responses"
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
+WORKER_BATCH_SIZE = int(os.getenv("WORKER_BATCH_SIZE", "1"))
+WORKER_BATCH_WAIT_MS = int(os.getenv("WORKER_BATCH_WAIT_MS", "10"))
+WORKER_PREFETCH = int(os.getenv("WORKER_PREFETCH", str(max(WORKER_CONCURRENCY, WORKER_BATCH_SIZE))))
+WORKER_DRAIN_TIMEOUT = float(os.getenv("WORKER_DRAIN_TIMEOUT", "25"))
+WORKER_IDEMPOTENCY_CACHE_SIZE = int(os.getenv("WORKER_IDEMPOTENCY_CACHE_SIZE", "10000"))
+# Deve ser maior que a chamada mais longa ao provedor e menor que a soma das
+# esperas das filas de retry (padrão 1+2+4+8+16 s), ou o pedido vai para a DLQ
+WORKER_PROCESSING_TIMEOUT = float(os.getenv("WORKER_PROCESSING_TIMEOUT", "30"))
+
+
+class BatchInsertError(Exception):
+    """
+    Falha ao gravar as linhas PROCESSING de um lote; nada do lote foi persistido.
+    """
+
+
+class PaymentsInProgressError(Exception):
+    """
+    Pedidos ainda em PROCESSING por outra entrega em andamento; as mensagens
+    não foram respondidas e devem ser reprocessadas mais tarde, não confirmadas.
+    """
+
+    def __init__(self, order_ids, payments=None):
+        super().__init__(f"Payments still in progress for orders {order_ids}")
+        self.order_ids = order_ids
+        self.payments = payments or []
+
+
+class CompletedOrderCache:
+    """
+    LRU limitado dos order_ids concluídos recentemente por este worker.
+
+    Guarda a resposta publicada para cada pedido, para que reentregas sejam
+    respondidas sem acessar o banco nem o provedor de pagamento.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max(1, max_size)
+        self._responses = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, order_id):
+        response = self._responses.get(order_id)
+        if response is not None:
+            self._responses.move_to_end(order_id)
+        return response
+
+    def put(self, order_id, response) -> None:
+        self._responses[order_id] = response
+        self._responses.move_to_end(order_id)
+        while len(self._responses) > self.max_size:
+            self._responses.popitem(last=False)
 
 
 class SimplePaymentProcessor:
@@ -33,12 +90,15 @@ class SimplePaymentProcessor:
     Classe simplificada para processar pagamentos sem depender de implementações complexas.
     """
 
-    def __init__(self, repository, broker):
+    def __init__(self, repository, broker, provider=None, completed_orders=None,
+                 processing_timeout=WORKER_PROCESSING_TIMEOUT):
         self.repository = repository
         self.broker = broker
+        self.completed_orders = completed_orders if completed_orders is not None else CompletedOrderCache()
+        self.processing_timeout = processing_timeout
 
         try:
-            self.provider = MockPaymentProvider()
+            self.provider = provider if provider is not None else MockPaymentProvider()
             logger.debug(f"Provider created: {self.provider}")
 
             import inspect
@@ -98,6 +158,12 @@ class SimplePaymentProcessor:
 
         logger.debug(f"Processing order: {order_id}, amount: {amount}")
 
+        cached_response = self.completed_orders.get(order_id)
+        if cached_response is not None:
+            logger.info(f"Order {order_id} already processed, republishing stored result")
+            await self._publish(cached_response)
+            return None
+
         payment = Payment(
             order_id=order_id,
             amount=amount,
@@ -108,7 +174,14 @@ class SimplePaymentProcessor:
         )
 
         logger.debug("Saving initial payment")
-        saved_payment = self.repository.add(payment)
+        saved_payment = await self._call(self.repository.add_if_absent, payment)
+        if saved_payment is None:
+            answered, resumed, in_progress = await self._answer_duplicates([order_id])
+            if in_progress:
+                raise PaymentsInProgressError(in_progress)
+            if not resumed:
+                return answered[0] if answered else None
+            saved_payment = payment
         logger.debug(f"Payment saved for order: {saved_payment.order_id}")
 
         try:
@@ -122,14 +195,7 @@ class SimplePaymentProcessor:
                 )
                 logger.debug(f"Transaction result: {transaction_result}")
 
-                transaction_status = transaction_result.get('status', '').upper()
-
-                if transaction_status == 'APPROVED':
-                    payment_status = PaymentStatus.APPROVED
-                elif transaction_status == 'PENDING_CONFIRMATION':
-                    payment_status = PaymentStatus.PENDING
-                else:
-                    payment_status = PaymentStatus.PROCESSING
+                payment_status = self._status_from_transaction(transaction_result)
 
                 saved_payment.transaction_id = transaction_result.get('transaction_id')
                 saved_payment.status = payment_status
@@ -137,8 +203,8 @@ class SimplePaymentProcessor:
 
                 logger.debug(f"Updating payment with status: {payment_status}")
 
-                self.repository.update(saved_payment)
-                logger.debug(f"Payment updated with status: {payment_status}")
+                saved_payment = await self._store(saved_payment)
+                logger.debug(f"Payment updated with status: {saved_payment.status}")
 
             except TypeError as te:
                 logger.error(f"TypeError in process_payment: {str(te)}")
@@ -165,7 +231,7 @@ class SimplePaymentProcessor:
                     saved_payment.transaction_id = transaction_result.get('transaction_id')
                     saved_payment.status = PaymentStatus.APPROVED
                     saved_payment.updated_at = datetime.now()
-                    self.repository.update(saved_payment)
+                    saved_payment = await self._store(saved_payment)
                     logger.debug("Payment approved via emergency process")
                 else:
                     raise
@@ -180,6 +246,7 @@ class SimplePaymentProcessor:
                 status=saved_payment.status.value,
                 transaction_id=saved_payment.transaction_id
             )
+            self._remember(saved_payment)
 
             return saved_payment
 
@@ -190,18 +257,209 @@ class SimplePaymentProcessor:
             saved_payment.status = PaymentStatus.ERROR
             saved_payment.error_message = str(e)
             saved_payment.updated_at = datetime.now()
-            self.repository.update(saved_payment)
+            saved_payment = await self._store(saved_payment)
 
             await self.publish_response(
                 order_id=order_id,
-                status=PaymentStatus.ERROR.value,
-                error=str(e)
+                status=saved_payment.status.value,
+                transaction_id=saved_payment.transaction_id,
+                error=saved_payment.error_message
             )
+            self._remember(saved_payment)
 
             return saved_payment
 
-    async def publish_response(self, order_id, status, transaction_id=None, error=None):
-        """Publica resposta na fila de resultados"""
+    async def process_batch(self, payments_data, limiter=None):
+        """
+        Processa um lote de pagamentos com escritas agrupadas no banco.
+
+        Pedidos já concluídos por este worker são respondidos a partir do cache.
+        Os demais são inseridos como PROCESSING em um único INSERT que ignora
+        order_ids já gravados; esses duplicados recebem o resultado armazenado,
+        sem nova chamada ao provedor, ou são retomados se ficaram abandonados em
+        PROCESSING. Os pagamentos novos são cobrados em paralelo, seus status
+        finais gravados em um único UPDATE e as respostas publicadas em bloco.
+
+        Args:
+            payments_data: Mensagens de requisição de pagamento do lote
+            limiter: Semáforo opcional que limita as chamadas simultâneas ao provedor
+
+        Returns:
+            Os pagamentos inseridos e cobrados neste lote.
+
+        Raises:
+            BatchInsertError: Se a inserção do lote falhar; nenhum pagamento foi gravado.
+            PaymentsInProgressError: Depois de concluir o restante do lote, se algum pedido
+                ainda está sendo processado por outra entrega.
+        """
+        responses = []
+        payments = {}
+        now = datetime.now()
+
+        for payment_data in payments_data:
+            order_id = payment_data.get('order_id')
+            cached_response = self.completed_orders.get(order_id)
+            if cached_response is not None:
+                responses.append(cached_response)
+            elif order_id not in payments:
+                payments[order_id] = Payment(
+                    order_id=order_id,
+                    amount=payment_data.get('amount'),
+                    status=PaymentStatus.PROCESSING,
+                    created_at=now,
+                    updated_at=now,
+                    payment_method=payment_data.get('payment_method', 'credit_card')
+                )
+
+        if len(payments) < len(payments_data):
+            logger.info(f"Skipping {len(payments_data) - len(payments)} duplicate payment requests")
+
+        try:
+            saved_payments = await self._call(self.repository.add_many_if_absent, list(payments.values()))
+        except Exception as e:
+            raise BatchInsertError(str(e)) from e
+        logger.debug(f"Batch of {len(saved_payments)} payments saved")
+
+        saved_order_ids = {payment.order_id for payment in saved_payments}
+        duplicates = [order_id for order_id in payments if order_id not in saved_order_ids]
+        in_progress = []
+        if duplicates:
+            _, resumed, in_progress = await self._answer_duplicates(duplicates)
+            saved_payments.extend(payments[order_id] for order_id in resumed)
+
+        await asyncio.gather(*(self._charge(payment, limiter) for payment in saved_payments))
+
+        written = await self._call(self.repository.update_many, saved_payments)
+        logger.debug(f"Batch of {len(written)} payments updated")
+        saved_payments = await self._adopt_refused(saved_payments, written)
+
+        responses.extend(self._remember(payment) for payment in saved_payments)
+        await self.publish_responses(responses)
+
+        if in_progress:
+            raise PaymentsInProgressError(in_progress, saved_payments)
+        return saved_payments
+
+    async def _call(self, method, *args):
+        """
+        Executa uma chamada síncrona ao repositório numa thread, fora do event loop.
+
+        Assim, as idas ao banco não param os outros lotes, as chamadas ao
+        provedor, as confirmações de publicação e os heartbeats do broker. Se
+        a tarefa for cancelada durante a chamada, a thread termina antes que o
+        cancelamento se propague, para que a sessão não seja fechada em uso.
+        """
+        call = asyncio.ensure_future(asyncio.to_thread(method, *args))
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            await asyncio.wait({call})
+            raise
+
+    async def _store(self, payment):
+        """
+        Grava o status final de um pagamento.
+
+        Se o banco recusar a transição (outra entrega ou um webhook já gravou
+        um status que não pode voltar atrás), devolve o pagamento armazenado,
+        para que a resposta publicada seja a mesma que está no banco.
+        """
+        try:
+            await self._call(self.repository.update, payment)
+            return payment
+        except InvalidStatusTransition as e:
+            logger.warning(f"Order {payment.order_id}: {str(e)}, publishing stored status")
+            return await self._call(self.repository.get_by_order_id, payment.order_id)
+
+    async def _adopt_refused(self, payments, written):
+        """Troca os pagamentos cuja transição foi recusada pelo UPDATE do lote pelos pagamentos armazenados"""
+        written_order_ids = {payment.order_id for payment in written}
+        refused = [payment.order_id for payment in payments if payment.order_id not in written_order_ids]
+        if not refused:
+            return payments
+
+        logger.warning(f"Status transitions refused for orders {refused}, publishing stored status")
+        stored_payments = await self._call(self.repository.get_by_order_ids, refused)
+        stored = {payment.order_id: payment for payment in stored_payments}
+        return [stored.get(payment.order_id, payment) for payment in payments]
+
+    async def _answer_duplicates(self, order_ids):
+        """
+        Responde pedidos já gravados no banco com o resultado armazenado, sem chamar o provedor.
+
+        Um pagamento em PROCESSING sem atualização há mais de `processing_timeout`
+        segundos foi abandonado por uma entrega interrompida (queda do worker) e é
+        reivindicado para ser cobrado de novo; a nova cobrança usa o mesmo order_id,
+        para que o provedor a reconheça. Os demais PROCESSING pertencem a outra
+        entrega em andamento e não são respondidos aqui.
+
+        Returns:
+            Tupla com os pagamentos respondidos, os order_ids retomados e os order_ids em andamento.
+        """
+        logger.info(f"Orders already stored, skipping provider call: {order_ids}")
+        stored_payments = await self._call(self.repository.get_by_order_ids, order_ids)
+        finished = [payment for payment in stored_payments if payment.status != PaymentStatus.PROCESSING]
+        await self.publish_responses([self._remember(payment) for payment in finished])
+
+        processing = [payment.order_id for payment in stored_payments if payment.status == PaymentStatus.PROCESSING]
+        if not processing:
+            return finished, [], []
+
+        older_than = datetime.utcnow() - timedelta(seconds=self.processing_timeout)
+        resumed = await self._call(self.repository.claim_stale, processing, older_than)
+        if resumed:
+            logger.warning(f"Resuming payments abandoned in PROCESSING: {resumed}")
+        in_progress = [order_id for order_id in processing if order_id not in resumed]
+        return finished, resumed, in_progress
+
+    def _remember(self, payment):
+        """Guarda no cache de idempotência a resposta de um pagamento concluído"""
+        response = self._response_message(
+            order_id=payment.order_id,
+            status=payment.status.value,
+            transaction_id=payment.transaction_id,
+            error=payment.error_message
+        )
+        self.completed_orders.put(payment.order_id, response)
+        return response
+
+    async def _charge(self, payment, limiter=None):
+        """Chama o provedor para um pagamento do lote e atualiza seu status em memória"""
+        try:
+            if limiter is not None:
+                async with limiter:
+                    transaction_result = await self._call_provider(payment)
+            else:
+                transaction_result = await self._call_provider(payment)
+
+            payment.transaction_id = transaction_result.get('transaction_id')
+            payment.status = self._status_from_transaction(transaction_result)
+        except Exception as e:
+            logger.error(f"Error processing payment for order {payment.order_id}: {str(e)}")
+            payment.status = PaymentStatus.ERROR
+            payment.error_message = str(e)
+        payment.updated_at = datetime.now()
+
+    async def _call_provider(self, payment):
+        return await self.provider.process_payment(
+            order_id=payment.order_id,
+            amount=payment.amount,
+            payment_method=payment.payment_method
+        )
+
+    @staticmethod
+    def _status_from_transaction(transaction_result):
+        """Converte o status retornado pelo provedor em PaymentStatus"""
+        transaction_status = transaction_result.get('status', '').upper()
+
+        if transaction_status == 'APPROVED':
+            return PaymentStatus.APPROVED
+        if transaction_status == 'PENDING_CONFIRMATION':
+            return PaymentStatus.PENDING
+        return PaymentStatus.PROCESSING
+
+    @staticmethod
+    def _response_message(order_id, status, transaction_id=None, error=None):
         message = {
             'order_id': order_id,
             'status': status
@@ -212,14 +470,38 @@ class SimplePaymentProcessor:
         if error:
             message['error'] = error
 
+        return message
+
+    async def publish_responses(self, messages):
+        """Publica as respostas de um lote na fila de resultados"""
+        if not messages:
+            return
+
+        if not hasattr(self.broker, 'publish_many'):
+            for message in messages:
+                await self._publish(message)
+            return
+
+        try:
+            await self.broker.publish_many(queue=PAYMENT_RESPONSES_QUEUE, messages=messages)
+            logger.debug(f"{len(messages)} responses published")
+        except Exception as e:
+            logger.error(f"Error publishing responses: {str(e)}")
+            logger.error(traceback.format_exc())
+
+    async def publish_response(self, order_id, status, transaction_id=None, error=None):
+        """Publica resposta na fila de resultados"""
+        await self._publish(self._response_message(order_id, status, transaction_id, error))
+
+    async def _publish(self, message):
         try:
             if hasattr(self.broker, 'publish_async'):
-                await self.broker.publish_async(queue='payment_responses', message=message)
+                await self.broker.publish_async(queue=PAYMENT_RESPONSES_QUEUE, message=message)
             else:
                 loop = asyncio.get_running_loop()
                 await loop.run_in_executor(
                     None,
-                    lambda: self.broker.publish(queue='payment_responses', message=message)
+                    lambda: self.broker.publish(queue=PAYMENT_RESPONSES_QUEUE, message=message)
                 )
             logger.debug(f"Response published: {message}")
         except Exception as e:
@@ -227,103 +509,334 @@ class SimplePaymentProcessor:
             logger.error(traceback.format_exc())
 
 
-async def process_message(message_data: dict):
+class PaymentWorkerRuntime:
     """
-    Processa uma mensagem de requisição de pagamento.
-    """
-    try:
-        logger.info(f"Processing payment request for order {message_data.get('order_id')}")
+    Runtime persistente do worker de pagamentos.
 
-        session = next(get_session())
+    Cria uma única vez a fábrica de sessões, o broker e o provedor de pagamento,
+    reutilizando-os em todas as mensagens em vez de recriá-los a cada entrega.
 
-        try:
-            repository = SQLAlchemyPaymentRepository(session)
+    Consumo e publicação de respostas rodam no mesmo loop de eventos através do
+    broker asyncio. As entregas são agrupadas em lotes de até `batch_size`
+    mensagens (ou o que chegar em `batch_wait` segundos): cada lote é gravado com
+    um INSERT e um UPDATE e confirmado com um único ack, enquanto até
+    `concurrency` chamadas ao provedor rodam ao mesmo tempo.
+
+    Mensagens que falham não voltam direto para a fila: são republicadas nas
+    filas de espera com backoff exponencial e, esgotadas as tentativas, na DLQ.
+
+    Em stop(), o consumo é cancelado e os lotes em andamento têm até
+    `drain_timeout` segundos para terminar; os que não terminam são devolvidos
+    à fila. As publicações pendentes são confirmadas antes de fechar a conexão.
+    """
 
-            broker = create_async_rabbitmq_broker(
+    def __init__(
+            self,
+            session_factory=None,
+            broker=None,
+            provider=None,
+            concurrency: int = 1,
+            prefetch: int = None,
+            batch_size: int = 1,
+            batch_wait: float = 0.01,
+            retry_queues=None,
+            completed_orders=None,
+            drain_timeout: float = WORKER_DRAIN_TIMEOUT
+    ):
+        """
+        Inicializa o runtime com as dependências compartilhadas.
+
+        Args:
+            session_factory: Fábrica de sessões SQLAlchemy. Por padrão usa o engine global.
+            broker: Broker asyncio usado para consumir e publicar. Criado em start() se omitido.
+            provider: Provedor de pagamento. Criado em start() se omitido.
+            concurrency: Número máximo de mensagens processadas simultaneamente.
+            prefetch: Número máximo de entregas não confirmadas. Padrão: o maior entre concurrency e batch_size.
+            batch_size: Número máximo de mensagens gravadas em um mesmo lote.
+            batch_wait: Tempo máximo, em segundos, para completar um lote.
+            retry_queues: Topologia de reprocessamento. Por padrão lida das variáveis de ambiente.
+            completed_orders: Cache de idempotência compartilhado entre as mensagens.
+            drain_timeout: Tempo máximo, em segundos, para concluir os lotes em andamento ao parar.
+        """
+        self.session_factory = session_factory or sessionmaker(bind=engine)
+        self.broker = broker
+        self.provider = provider
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.retry_queues = retry_queues or create_retry_queues(PAYMENT_REQUESTS_QUEUE)
+        self.completed_orders = (
+            completed_orders if completed_orders is not None
+            else CompletedOrderCache(WORKER_IDEMPOTENCY_CACHE_SIZE)
+        )
+        self.prefetch = prefetch or max(self.concurrency, self.batch_size)
+        self.drain_timeout = drain_timeout
+        self.metrics = Counter()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._batch_tasks = set()
+        self._consumer = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """
+        Cria a conexão e o provedor que serão reutilizados durante toda a vida do worker.
+        """
+        if self.broker is None:
+            self.broker = create_asyncio_rabbitmq_broker(
                 host=RABBITMQ_HOST,
                 port=RABBITMQ_PORT,
                 user=RABBITMQ_USER,
                 password=RABBITMQ_PASS
             )
+        if self.provider is None:
+            self.provider = MockPaymentProvider()
 
-            processor = SimplePaymentProcessor(repository, broker)
+        await self.broker.connect()
+        await self.broker.declare_queue(PAYMENT_RESPONSES_QUEUE)
+        await self.retry_queues.declare(self.broker)
+        logger.info(f"Worker runtime started with concurrency {self.concurrency}")
+
+    async def process_message(self, message_data: dict) -> bool:
+        """
+        Processa uma mensagem de requisição de pagamento.
+
+        Returns:
+            True se a mensagem foi processada, False se falhou.
+        """
+        logger.info(f"Processing payment request for order {message_data.get('order_id')}")
+
+        session = self.session_factory()
+
+        try:
+            repository = SQLAlchemyPaymentRepository(session)
+
+            processor = SimplePaymentProcessor(
+                repository, self.broker, provider=self.provider, completed_orders=self.completed_orders
+            )
 
             await processor.process(message_data)
             logger.info(f"Payment processed successfully for order {message_data.get('order_id')}")
+            return True
 
         except Exception as e:
             logger.error(f"Error processing payment: {str(e)}")
             logger.error(traceback.format_exc())
+            return False
         finally:
-            session.close()
+            await asyncio.to_thread(session.close)
 
-    except Exception as e:
-        logger.error(f"Critical error processing message: {str(e)}")
-        logger.error(traceback.format_exc())
+    async def handle_message(self, message_data: dict) -> bool:
+        """
+        Processa uma mensagem respeitando o limite de concorrência.
+        """
+        logger.info(f"Message received: {message_data}")
+        async with self._semaphore:
+            return await self.process_message(message_data)
 
+    async def process_batch(self, messages: list) -> list:
+        """
+        Processa um lote de requisições com escritas agrupadas no banco.
 
-def callback(ch, method, properties, body):
-    """
-    Callback para processar mensagens do RabbitMQ.
-    """
-    try:
-        message_data = json.loads(body)
-        logger.info(f"Message received: {message_data}")
+        O lote usa uma sessão própria, acessada em threads para não bloquear o
+        event loop. Se a inserção do lote falhar (por exemplo, um order_id
+        repetido), cada mensagem é processada individualmente para que uma
+        entrega ruim não impeça as demais.
 
-        asyncio.run(process_message(message_data))
+        Returns:
+            As posições, no lote, das mensagens que falharam no processamento individual
+            ou cujos pedidos ainda estão sendo processados por outra entrega.
 
-        ch.basic_ack(delivery_tag=method.delivery_tag)
+        Raises:
+            Exception: Se o lote falhar depois da inserção; todas as mensagens devem ser reprocessadas.
+        """
+        logger.info(f"Processing batch of {len(messages)} payment requests")
 
-    except json.JSONDecodeError:
-        logger.error(f"Error decoding message: {body}")
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-    except Exception as e:
-        logger.error(f"Error processing message: {str(e)}")
-        logger.error(traceback.format_exc())
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        session = self.session_factory()
 
+        try:
+            repository = SQLAlchemyPaymentRepository(session)
+            processor = SimplePaymentProcessor(
+                repository, self.broker, provider=self.provider, completed_orders=self.completed_orders
+            )
+            saved_payments = await processor.process_batch(messages, limiter=self._semaphore)
+            self.metrics["processed"] += len(saved_payments)
+            logger.info(f"Batch of {len(messages)} payments processed successfully")
+            return []
+        except PaymentsInProgressError as e:
+            # Os pedidos em andamento voltam pelas filas de retry; o restante do lote já foi respondido
+            logger.info(f"Orders still in progress, scheduling retry: {e.order_ids}")
+            self.metrics["processed"] += len(e.payments)
+            return [position for position, message in enumerate(messages)
+                    if message.get('order_id') in e.order_ids]
+        except BatchInsertError as e:
+            logger.warning(f"Batch insert failed, processing messages individually: {str(e)}")
+            results = await asyncio.gather(*(self.handle_message(message) for message in messages))
+            self.metrics["processed"] += sum(results)
+            return [position for position, processed in enumerate(results) if not processed]
+        finally:
+            await asyncio.to_thread(session.close)
 
-def main():
-    """
-    Função principal que inicia o worker.
-    """
-    logger.info("Starting payment processing worker")
+    async def handle_batch(self, batch) -> None:
+        """
+        Processa um lote e o confirma em bloco.
 
-    try:
-        credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
-        connection_params = pika.ConnectionParameters(
-            host=RABBITMQ_HOST,
-            port=RABBITMQ_PORT,
-            credentials=credentials,
-            heartbeat=600,
-            blocked_connection_timeout=300
-        )
+        Mensagens que falharam são encaminhadas para reprocessamento com atraso
+        (ou para a DLQ) antes do ack. Se nem isso for possível, ou se o lote for
+        cancelado durante o encerramento, ele volta para a fila.
+        """
+        self.metrics["batches"] += 1
+        self.metrics["messages"] += len(batch.messages)
 
-        connection = pika.BlockingConnection(connection_params)
-        channel = connection.channel()
+        try:
+            await self._settle_batch(batch)
+        except asyncio.CancelledError:
+            logger.warning(f"Batch of {len(batch.messages)} messages interrupted, requeueing")
+            self.metrics["requeued"] += len(batch.messages)
+            batch.nack(requeue=True)
+            raise
+
+    async def _settle_batch(self, batch) -> None:
+        try:
+            failed = await self.process_batch(batch.messages)
+            error = "Payment request processing failed"
+        except Exception as e:
+            logger.error(f"Error processing batch: {str(e)}")
+            logger.error(traceback.format_exc())
+            failed = list(range(len(batch.messages)))
+            error = str(e)
 
-        channel.queue_declare(queue=PAYMENT_REQUESTS_QUEUE, durable=True)
+        if failed:
+            self.metrics["failed"] += len(failed)
+            try:
+                await self.retry_queues.reject(
+                    self.broker,
+                    [batch.messages[position] for position in failed],
+                    [batch.headers[position] for position in failed],
+                    error
+                )
+            except Exception as e:
+                logger.error(f"Error scheduling retries, requeueing batch: {str(e)}")
+                self.metrics["requeued"] += len(batch.messages)
+                batch.nack(requeue=True)
+                return
 
-        channel.queue_declare(queue="payment_responses", durable=True)
+        batch.ack()
 
-        channel.basic_qos(prefetch_count=1)
+    async def run(self) -> None:
+        """
+        Inicia o consumo da fila de requisições e roda até stop() ou até a conexão ser fechada.
 
-        channel.basic_consume(
-            queue=PAYMENT_REQUESTS_QUEUE,
-            on_message_callback=callback
-        )
+        Raises:
+            Exception: Se a conexão com o RabbitMQ cair.
+        """
+        try:
+            await self.start()
+            logger.info(
+                f"Consuming messages from queue '{PAYMENT_REQUESTS_QUEUE}' "
+                f"(prefetch={self.prefetch}, concurrency={self.concurrency}, batch_size={self.batch_size})"
+            )
+            self._consumer = asyncio.ensure_future(self._consume())
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                if not self._stopping:
+                    raise
+            await self.drain()
+        finally:
+            await self.close()
+
+    async def _consume(self) -> None:
+        async for batch in self.broker.consume_batch(
+                PAYMENT_REQUESTS_QUEUE,
+                max_batch=self.batch_size,
+                max_wait=self.batch_wait,
+                prefetch_count=self.prefetch
+        ):
+            task = asyncio.ensure_future(self.handle_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def stop(self) -> None:
+        """
+        Solicita o encerramento gracioso: para de consumir e deixa run() drenar e fechar a conexão.
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("Stopping worker runtime")
+
+        if self._consumer is not None and not self._consumer.done():
+            self._consumer.cancel()
+        elif self._consumer is None:
+            await self.close()
+
+    async def drain(self) -> None:
+        """
+        Aguarda os lotes em andamento até `drain_timeout`, devolve à fila os que
+        não terminarem e aguarda as confirmações das publicações pendentes.
+        """
+        pending = set(self._batch_tasks)
+        if pending:
+            logger.info(f"Draining {len(pending)} in-flight batches")
+            _, pending = await asyncio.wait(pending, timeout=self.drain_timeout)
+
+        if pending:
+            logger.warning(f"{len(pending)} batches did not finish in {self.drain_timeout}s, requeueing")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if hasattr(self.broker, 'flush'):
+            try:
+                await self.broker.flush(timeout=self.drain_timeout)
+            except Exception as e:
+                logger.error(f"Error flushing publishes: {str(e)}")
+
+    async def close(self) -> None:
+        """
+        Fecha a conexão do broker.
+        """
+        try:
+            if self.broker is not None:
+                await self.broker.close_async()
+        except Exception as e:
+            logger.error(f"Error closing broker: {str(e)}")
+
+
+async def serve(runtime: PaymentWorkerRuntime, signals=(signal.SIGTERM, signal.SIGINT)) -> None:
+    """
+    Roda o runtime até o fim, iniciando o encerramento gracioso ao receber um dos sinais.
+    """
+    loop = asyncio.get_running_loop()
+    for signum in signals:
+        loop.add_signal_handler(signum, lambda: asyncio.ensure_future(runtime.stop()))
+    await runtime.run()
+
+
+def main():
+    """
+    Função principal que inicia o worker.
+    """
+    logger.info("Starting payment processing worker")
 
-        logger.info(f"Consuming messages from queue '{PAYMENT_REQUESTS_QUEUE}'")
-        channel.start_consuming()
+    runtime = PaymentWorkerRuntime(
+        concurrency=WORKER_CONCURRENCY,
+        prefetch=WORKER_PREFETCH,
+        batch_size=WORKER_BATCH_SIZE,
+        batch_wait=WORKER_BATCH_WAIT_MS / 1000
+    )
+
+    try:
+        asyncio.run(serve(runtime))
 
     except KeyboardInterrupt:
         logger.info("Worker interrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Error starting worker: {str(e)}")
+        logger.error(f"Error running worker: {str(e)}")
         logger.error(traceback.format_exc())
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
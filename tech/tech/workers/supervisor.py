@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import queue
+import signal
+import asyncio
+import logging
+import traceback
+import multiprocessing
+from collections import Counter
+from typing import Callable, Dict
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(processName)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("payment_worker_supervisor")
+
+from tech.infra.databases.database import engine
+from tech.infra.databases.pool_metrics import CUMULATIVE_POOL_METRICS, pool_status
+from tech.workers.run_payment_request_worker import (
+    PaymentWorkerRuntime,
+    serve,
+    WORKER_CONCURRENCY,
+    WORKER_PREFETCH,
+    WORKER_BATCH_SIZE,
+    WORKER_BATCH_WAIT_MS,
+)
+
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", str(os.cpu_count() or 1)))
+WORKER_RESTART_DELAY = float(os.getenv("WORKER_RESTART_DELAY", "1.0"))
+WORKER_SHUTDOWN_TIMEOUT = float(os.getenv("WORKER_SHUTDOWN_TIMEOUT", "30"))
+WORKER_METRICS_INTERVAL = float(os.getenv("WORKER_METRICS_INTERVAL", "30"))
+
+
+def _database_pool_metrics() -> Dict[str, float]:
+    # Só os contadores cumulativos, que podem ser somados entre os processos
+    status = pool_status(engine.pool)
+    return {f"db_pool_{key}": status[key] for key in CUMULATIVE_POOL_METRICS if key in status}
+
+
+async def _run_runtime(runtime: PaymentWorkerRuntime, index: int, metrics_queue, metrics_interval: float) -> None:
+    def report():
+        if metrics_queue is not None:
+            metrics_queue.put((index, os.getpid(), {**runtime.metrics, **_database_pool_metrics()}))
+
+    async def report_periodically():
+        while True:
+            await asyncio.sleep(metrics_interval)
+            report()
+
+    reporter = asyncio.ensure_future(report_periodically())
+    try:
+        await serve(runtime, signals=(signal.SIGTERM,))
+    finally:
+        reporter.cancel()
+        report()
+
+
+def run_worker_process(index: int, metrics_queue=None, metrics_interval: float = WORKER_METRICS_INTERVAL) -> None:
+    """
+    Ponto de entrada de cada processo filho.
+
+    Cada filho tem sua própria conexão com o RabbitMQ, seu próprio pool de
+    conexões com o banco e seu próprio runtime. SIGINT é ignorado, pois o
+    supervisor repassa o encerramento como SIGTERM.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Conexões herdadas do processo pai não podem ser compartilhadas após o fork
+    engine.dispose(close=False)
+
+    runtime = PaymentWorkerRuntime(
+        concurrency=WORKER_CONCURRENCY,
+        prefetch=WORKER_PREFETCH,
+        batch_size=WORKER_BATCH_SIZE,
+        batch_wait=WORKER_BATCH_WAIT_MS / 1000
+    )
+    logger.info(f"Worker process {index} started (pid {os.getpid()})")
+
+    try:
+        asyncio.run(_run_runtime(runtime, index, metrics_queue, metrics_interval))
+    except Exception as e:
+        logger.error(f"Worker process {index} failed: {str(e)}")
+        logger.error(traceback.format_exc())
+        sys.exit(1)
+
+
+class WorkerSupervisor:
+    """
+    Supervisor de processos do worker de pagamentos.
+
+    Inicia `processes` processos filhos, reinicia os que terminam enquanto o
+    supervisor está ativo, repassa SIGTERM para um encerramento gracioso e
+    agrega as métricas que cada filho envia por uma fila compartilhada.
+    """
+
+    def __init__(
+            self,
+            processes: int,
+            target: Callable[..., None] = run_worker_process,
+            restart_delay: float = WORKER_RESTART_DELAY,
+            shutdown_timeout: float = WORKER_SHUTDOWN_TIMEOUT,
+            metrics_interval: float = WORKER_METRICS_INTERVAL,
+            context=None
+    ):
+        """
+        Args:
+            processes: Número de processos filhos
+            target: Função executada em cada filho, recebendo (índice, fila de métricas)
+            restart_delay: Espera antes de reiniciar um filho que terminou
+            shutdown_timeout: Tempo máximo para os filhos encerrarem após o SIGTERM
+            metrics_interval: Intervalo entre os registros das métricas agregadas
+            context: Contexto do multiprocessing. Padrão: fork
+        """
+        self.processes = max(1, processes)
+        self.target = target
+        self.restart_delay = restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.metrics_interval = metrics_interval
+        self.context = context or multiprocessing.get_context("fork")
+        self.metrics_queue = self.context.Queue()
+        self.children: Dict[int, multiprocessing.Process] = {}
+        self.restarts = 0
+        self._stopping = False
+        self._restart_at: Dict[int, float] = {}
+        self._live_metrics: Dict[int, Counter] = {}
+        self._finished_metrics = Counter()
+        self._metrics_pid: Dict[int, int] = {}
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopping
+
+    def start(self) -> None:
+        """
+        Inicia todos os processos filhos.
+        """
+        for index in range(self.processes):
+            self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        process = self.context.Process(
+            target=self.target,
+            args=(index, self.metrics_queue),
+            name=f"payment-worker-{index}"
+        )
+        process.start()
+        self.children[index] = process
+        self._restart_at.pop(index, None)
+        logger.info(f"Started worker process {index} (pid {process.pid})")
+
+    def poll(self) -> None:
+        """
+        Coleta métricas e reinicia filhos que terminaram.
+        """
+        self.collect_metrics()
+        if self._stopping:
+            return
+
+        now = time.monotonic()
+        for index, process in list(self.children.items()):
+            if process.is_alive():
+                continue
+
+            if index not in self._restart_at:
+                logger.warning(
+                    f"Worker process {index} (pid {process.pid}) exited with code {process.exitcode}; "
+                    f"restarting in {self.restart_delay}s"
+                )
+                self._retire_metrics(index)
+                self._restart_at[index] = now + self.restart_delay
+            elif now >= self._restart_at[index]:
+                self.restarts += 1
+                self._spawn(index)
+
+    def collect_metrics(self, timeout: float = 0) -> None:
+        """
+        Lê as métricas enviadas pelos filhos, aguardando até `timeout` segundos pela primeira.
+        """
+        block = timeout > 0
+        while True:
+            try:
+                index, pid, metrics = self.metrics_queue.get(block=block, timeout=timeout if block else None)
+            except queue.Empty:
+                return
+            block = False
+            if self._metrics_pid.get(index) not in (None, pid):
+                self._retire_metrics(index)
+            self._metrics_pid[index] = pid
+            self._live_metrics[index] = Counter(metrics)
+
+    def _retire_metrics(self, index: int) -> None:
+        # Mantém os totais de filhos que terminaram para que reinícios não zerem as métricas
+        self._finished_metrics.update(self._live_metrics.pop(index, Counter()))
+        self._metrics_pid.pop(index, None)
+
+    def aggregate_metrics(self) -> Dict[str, int]:
+        """
+        Soma as métricas de todos os filhos, incluindo os que já terminaram.
+        """
+        total = Counter(self._finished_metrics)
+        for metrics in self._live_metrics.values():
+            total.update(metrics)
+        total["processes"] = sum(1 for process in self.children.values() if process.is_alive())
+        total["restarts"] = self.restarts
+        return dict(total)
+
+    def stop(self, signum=None, frame=None) -> None:
+        """
+        Repassa SIGTERM para os filhos e para de reiniciá-los.
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info(f"Stopping {len(self.children)} worker processes")
+        for process in self.children.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    def wait(self) -> None:
+        """
+        Aguarda o encerramento dos filhos, matando os que excederem o prazo.
+        """
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in self.children.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"Worker process {process.name} did not stop in time, killing it")
+                process.kill()
+                process.join()
+        self.collect_metrics()
+
+    def run(self) -> None:
+        """
+        Inicia os filhos e os supervisiona até receber SIGTERM ou SIGINT.
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.start()
+        next_report = time.monotonic() + self.metrics_interval
+        while not self._stopping:
+            self.collect_metrics(timeout=min(self.restart_delay, 1.0) or 0.1)
+            self.poll()
+            if time.monotonic() >= next_report:
+                logger.info(f"Worker metrics: {self.aggregate_metrics()}")
+                next_report = time.monotonic() + self.metrics_interval
+
+        self.wait()
+        logger.info(f"Worker metrics: {self.aggregate_metrics()}")
+
+
+def main():
+    """
+    Função principal que inicia o supervisor dos workers.
+    """
+    logger.info(f"Starting payment worker supervisor with {WORKER_PROCESSES} processes")
+
+    supervisor = WorkerSupervisor(processes=WORKER_PROCESSES)
+
+    try:
+        supervisor.run()
+    except Exception as e:
+        logger.error(f"Error running supervisor: {str(e)}")
+        logger.error(traceback.format_exc())
+        supervisor.stop()
+        supervisor.wait()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
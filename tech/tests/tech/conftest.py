@@ -0,0 +1,59 @@
+import os
+import uuid
+import pytest
+from sqlalchemy import create_engine, text
+from tech.infra.repositories.sql_alchemy_models import table_registry
+
+
+@pytest.fixture(scope="session")
+def postgres_url():
+    """
+    URL of a PostgreSQL server for the tests that need real SQL.
+
+    Uses TEST_DATABASE_URL when set, otherwise starts a PostgreSQL 16
+    container with testcontainers. The tests are skipped when neither is available.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if url:
+        yield url
+        return
+
+    try:
+        from testcontainers.postgres import PostgresContainer
+    except ImportError:
+        pytest.skip("Set TEST_DATABASE_URL or install testcontainers to run the PostgreSQL tests")
+
+    try:
+        container = PostgresContainer("postgres:16", driver="psycopg").start()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL container unavailable: {str(e)}")
+
+    try:
+        yield container.get_connection_url()
+    finally:
+        container.stop()
+
+
+@pytest.fixture
+def postgres_engine(postgres_url):
+    """
+    Engine bound to a fresh schema with the application tables, dropped after the test.
+
+    `payments` gets a single DEFAULT partition, so any created_at can be inserted.
+    """
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(postgres_url)
+    with admin.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+
+    engine = create_engine(postgres_url, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        table_registry.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE payments_default PARTITION OF payments DEFAULT"))
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
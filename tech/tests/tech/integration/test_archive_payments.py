@@ -0,0 +1,55 @@
+import gzip
+from datetime import date
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from tech.infra.databases.partitions import list_partitions, list_pending_detach_partitions
+from tech.workers.archive_payments import archive_expired_partitions
+
+
+def interrupt_detach(engine, name):
+    """
+    Leaves `name` with a pending detach, as if the archive job died between the
+    two transactions of DETACH ... CONCURRENTLY.
+
+    An open snapshot on `payments` makes the second transaction wait, and the
+    statement timeout cancels it there.
+    """
+    reader = engine.connect().execution_options(isolation_level="REPEATABLE READ")
+    reader.execute(text("SELECT count(*) FROM payments"))
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("SET statement_timeout = '500ms'"))
+            with pytest.raises(OperationalError):
+                connection.execute(text(f"ALTER TABLE payments DETACH PARTITION {name} CONCURRENTLY"))
+    finally:
+        reader.rollback()
+        reader.close()
+
+
+class TestPostgresArchivePayments:
+    def test_finalizes_partition_left_with_pending_detach(self, postgres_engine, tmp_path):
+        with postgres_engine.begin() as connection:
+            # DETACH CONCURRENTLY is refused while the parent has a DEFAULT partition
+            connection.execute(text("DROP TABLE payments_default"))
+            connection.execute(text(
+                "CREATE TABLE payments_y2025m01 PARTITION OF payments "
+                "FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')"
+            ))
+            connection.execute(text(
+                "INSERT INTO payments (order_id, amount, status, created_at, updated_at) "
+                "VALUES (1, 10.0, 'APPROVED', '2025-01-15', '2025-01-15')"
+            ))
+        interrupt_detach(postgres_engine, "payments_y2025m01")
+
+        with postgres_engine.connect() as connection:
+            assert list_pending_detach_partitions(connection) == ["payments_y2025m01"]
+            assert "payments_y2025m01" not in list_partitions(connection)
+
+        archived = archive_expired_partitions(postgres_engine, str(tmp_path), 12, 0, today=date(2026, 10, 17))
+
+        assert archived == [str(tmp_path / "payments_y2025m01.csv.gz")]
+        with gzip.open(archived[0], "rt") as archive:
+            assert len(archive.read().splitlines()) == 2
+        with postgres_engine.connect() as connection:
+            assert connection.execute(text("SELECT to_regclass('payments_y2025m01')")).scalar() is None
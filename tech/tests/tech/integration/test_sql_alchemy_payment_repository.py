@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentStatus
+from tech.infra.repositories.sql_alchemy_payment_repository import SQLAlchemyPaymentRepository
+
+
+def payment(order_id, amount=10.0, status=PaymentStatus.PENDING):
+    return Payment(order_id=order_id, amount=amount, status=status)
+
+
+@pytest.fixture
+def session(postgres_engine):
+    with Session(postgres_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def repository(session):
+    return SQLAlchemyPaymentRepository(session)
+
+
+def stored(session):
+    return session.execute(text("SELECT order_id, amount, status::text FROM payments ORDER BY order_id, id")).all()
+
+
+def totals(session):
+    return session.execute(text("SELECT status::text, count, amount FROM payment_daily_totals WHERE count > 0 "
+                                "ORDER BY status")).all()
+
+
+class TestPostgresPaymentRepository:
+    def test_add_many_if_absent_keeps_one_payment_per_order(self, repository, session):
+        repository.add(payment(100))
+
+        saved = repository.add_many_if_absent([payment(200, 10.0), payment(200, 99.0), payment(100)])
+
+        assert [(p.order_id, p.amount) for p in saved] == [(200, 10.0)]
+        assert stored(session) == [(100, 10.0, "PENDING"), (200, 10.0, "PENDING")]
+        assert totals(session) == [("PENDING", 2, 20)]
+
+    def test_update_many_skips_refused_transitions(self, repository, session):
+        repository.add_many([payment(1, status=PaymentStatus.APPROVED), payment(2, status=PaymentStatus.PROCESSING),
+                             payment(3, status=PaymentStatus.PROCESSING)])
+
+        written = repository.update_many([payment(1, status=PaymentStatus.ERROR), payment(2, status=PaymentStatus.ERROR),
+                                          payment(3, status=PaymentStatus.PENDING)])
+
+        assert sorted((p.order_id, p.status) for p in written) == [(2, PaymentStatus.ERROR),
+                                                                   (3, PaymentStatus.PENDING)]
+        assert stored(session) == [(1, 10.0, "APPROVED"), (2, 10.0, "ERROR"), (3, 10.0, "PENDING")]
+        assert sorted(totals(session)) == [("APPROVED", 1, 10), ("ERROR", 1, 10), ("PENDING", 1, 10)]
+
+    def test_update_refuses_transition_from_final_status(self, repository, session):
+        repository.add(payment(1, status=PaymentStatus.REFUNDED))
+
+        with pytest.raises(InvalidStatusTransition, match="from REFUNDED to APPROVED"):
+            repository.update(payment(1, status=PaymentStatus.APPROVED))
+
+        assert stored(session) == [(1, 10.0, "REFUNDED")]
+
+    def test_claim_stale_claims_abandoned_processing_payments_once(self, repository, session):
+        repository.add_many([payment(1, status=PaymentStatus.PROCESSING), payment(2, status=PaymentStatus.PROCESSING),
+                             payment(3, status=PaymentStatus.APPROVED)])
+        session.execute(text("UPDATE payments SET updated_at = updated_at - interval '5 minutes' "
+                             "WHERE order_id IN (1, 3)"))
+        session.commit()
+        older_than = datetime.utcnow() - timedelta(minutes=1)
+
+        assert repository.claim_stale([1, 2, 3, 4], older_than) == [1]
+        assert repository.claim_stale([1, 2, 3, 4], older_than) == []
+        assert stored(session) == [(1, 10.0, "PROCESSING"), (2, 10.0, "PROCESSING"), (3, 10.0, "APPROVED")]
@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from tech.api.app import app
+
+
+class TestApp:
+    def test_lifespan_disposes_engine_on_shutdown(self):
+        with patch('tech.api.app.engine') as mock_engine, \
+                patch('tech.api.app.dispose_async_engine', new_callable=AsyncMock) as mock_dispose_async:
+            with TestClient(app) as client:
+                response = client.get('/')
+
+                assert response.status_code == 200
+                mock_engine.dispose.assert_not_called()
+                mock_dispose_async.assert_not_awaited()
+
+            mock_engine.dispose.assert_called_once()
+            mock_dispose_async.assert_awaited_once()
+
+    def test_lifespan_shares_and_closes_orders_http_client(self):
+        with patch('tech.api.app.engine'), \
+                patch('tech.api.app.dispose_async_engine', new_callable=AsyncMock), \
+                patch('tech.api.app.create_orders_http_client') as create_client:
+            create_client.return_value.aclose = AsyncMock()
+
+            with TestClient(app):
+                assert app.state.orders_http_client is create_client.return_value
+                create_client.return_value.aclose.assert_not_awaited()
+
+            create_client.assert_called_once()
+            create_client.return_value.aclose.assert_awaited_once()
+
+    def test_database_pool_metrics(self):
+        with patch('tech.api.app.database_pool_status', return_value={"sync": {"pool": "NullPool"}}):
+            response = TestClient(app).get('/metrics/database-pool')
+
+        assert response.status_code == 200
+        assert response.json() == {"sync": {"pool": "NullPool"}}
@@ -0,0 +1,207 @@
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import pytest
+from fastapi.testclient import TestClient
+from tech.api.app import app
+from tech.api.payments_router import (
+    apply_webhook_events,
+    get_async_payment_controller,
+    get_async_payment_repository,
+    get_payment_controller,
+    get_payment_repository,
+    get_webhook_event_queue,
+)
+from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.infra.databases.database import get_async_session, get_session
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+from tech.interfaces.schemas.payment_schema import (
+    MAX_BATCH_ORDER_IDS,
+    MAX_BULK_PAYMENTS,
+    MAX_PAYMENTS_PAGE,
+    WebhookEvent,
+)
+
+
+class TestPaymentsRouter:
+    @pytest.fixture
+    def controller(self):
+        controller = Mock()
+        app.dependency_overrides[get_payment_controller] = lambda: controller
+        app.dependency_overrides[get_async_payment_controller] = lambda: controller
+        yield controller
+        app.dependency_overrides.clear()
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_get_payment_statuses(self, client, controller):
+        controller.get_payment_statuses.return_value = {
+            "payments": [{"order_id": 1, "status": "APPROVED"}],
+            "not_found": [2]
+        }
+
+        response = client.post('/payments/payments/statuses', json={"order_ids": [1, 2]})
+
+        assert response.status_code == 200
+        assert response.json()["not_found"] == [2]
+        controller.get_payment_statuses.assert_called_once_with([1, 2])
+
+    def test_get_payment_statuses_rejects_oversized_batches(self, client, controller):
+        order_ids = list(range(MAX_BATCH_ORDER_IDS + 1))
+
+        response = client.post('/payments/payments/statuses', json={"order_ids": order_ids})
+
+        assert response.status_code == 422
+        controller.get_payment_statuses.assert_not_called()
+
+    def test_get_payment_statuses_rejects_empty_batches(self, client, controller):
+        response = client.post('/payments/payments/statuses', json={"order_ids": []})
+
+        assert response.status_code == 422
+
+    def test_list_payments(self, client, controller):
+        controller.list_payments = AsyncMock(return_value={"payments": [], "next_cursor": None})
+
+        response = client.get(
+            '/payments/payments',
+            params={"status": ["APPROVED", "REFUNDED"], "created_from": "2024-01-01T00:00:00", "cursor": 10}
+        )
+
+        assert response.status_code == 200
+        kwargs = controller.list_payments.await_args.kwargs
+        assert kwargs["statuses"] == ["APPROVED", "REFUNDED"]
+        assert kwargs["cursor"] == 10
+        assert kwargs["limit"] == 100
+
+    def test_list_payments_rejects_oversized_pages(self, client, controller):
+        response = client.get('/payments/payments', params={"limit": MAX_PAYMENTS_PAGE + 1})
+
+        assert response.status_code == 422
+        controller.list_payments.assert_not_called()
+
+    def test_get_payment_totals(self, client, controller):
+        controller.get_payment_totals = AsyncMock(return_value={"totals": []})
+
+        response = client.get(
+            '/payments/payments/totals',
+            params={"day_from": "2026-10-01", "day_to": "2026-11-01", "status": ["APPROVED"]}
+        )
+
+        assert response.status_code == 200
+        kwargs = controller.get_payment_totals.await_args.kwargs
+        assert kwargs["day_from"].isoformat() == "2026-10-01"
+        assert kwargs["day_to"].isoformat() == "2026-11-01"
+        assert kwargs["statuses"] == ["APPROVED"]
+        controller.get_payment_status.assert_not_called()
+
+    def test_create_payments(self, client, controller):
+        controller.create_payments = AsyncMock(return_value={"results": [{"order_id": 1, "status": "PENDING"}]})
+
+        response = client.post('/payments/payments/bulk', json={"order_ids": [1]})
+
+        assert response.status_code == 200
+        assert response.json() == {"results": [{"order_id": 1, "status": "PENDING"}]}
+        controller.create_payments.assert_awaited_once_with([1])
+
+    def test_create_payments_rejects_oversized_batches(self, client, controller):
+        response = client.post('/payments/payments/bulk', json={"order_ids": list(range(MAX_BULK_PAYMENTS + 1))})
+
+        assert response.status_code == 422
+
+
+class TestWebhookBatchRoute:
+    @pytest.fixture
+    def queue(self):
+        queue = Mock()
+        app.dependency_overrides[get_webhook_event_queue] = lambda: queue
+        yield queue
+        app.dependency_overrides.clear()
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_events_are_queued_and_acknowledged(self, client, queue):
+        queue.offer.return_value = True
+
+        response = client.post('/payments/webhook/batch', json=[
+            {"order_id": 1, "status": "APPROVED"},
+            {"order_id": 2, "status": "REJECTED"},
+        ])
+
+        assert response.status_code == 202
+        assert response.json() == {"accepted": 2}
+        events = queue.offer.call_args.args[0]
+        assert [(event.order_id, event.status.value) for event in events] == [(1, "APPROVED"), (2, "REJECTED")]
+
+    def test_full_queue_returns_503(self, client, queue):
+        queue.offer.return_value = False
+
+        response = client.post('/payments/webhook/batch', json=[{"order_id": 1, "status": "APPROVED"}])
+
+        assert response.status_code == 503
+
+    def test_invalid_status_is_rejected(self, client, queue):
+        response = client.post('/payments/webhook/batch', json=[{"order_id": 1, "status": "PAID"}])
+
+        assert response.status_code == 422
+        queue.offer.assert_not_called()
+
+
+def unavailable_session():
+    raise AssertionError("this route must not open this kind of session")
+
+
+class TestPaymentControllerDependencies:
+    @pytest.fixture
+    def client(self):
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_sync_routes_do_not_open_an_async_session(self, client):
+        repository = Mock()
+        repository.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)
+        app.dependency_overrides[get_payment_repository] = lambda: repository
+        app.dependency_overrides[get_async_session] = unavailable_session
+
+        response = client.get('/payments/payments/1')
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "APPROVED"
+
+    def test_async_routes_do_not_open_a_sync_session(self, client):
+        repository = Mock(spec=AsyncPaymentRepository)
+        repository.daily_totals.return_value = []
+        app.dependency_overrides[get_async_payment_repository] = lambda: repository
+        app.dependency_overrides[get_session] = unavailable_session
+
+        response = client.get('/payments/payments/totals')
+
+        assert response.status_code == 200
+        repository.daily_totals.assert_awaited_once()
+
+
+class TestApplyWebhookEvents:
+    @pytest.mark.asyncio
+    async def test_updates_in_bulk_and_invalidates_changed_orders(self):
+        session = AsyncMock()
+        session_class = MagicMock()
+        session_class.return_value.__aenter__.return_value = session
+        repository = Mock()
+        repository.update_many = AsyncMock(side_effect=lambda payments: payments[1:])
+        cache = Mock()
+
+        with patch('tech.api.payments_router.AsyncSession', session_class), \
+                patch('tech.api.payments_router.get_async_engine'), \
+                patch('tech.api.payments_router.SQLAlchemyAsyncPaymentRepository', return_value=repository):
+            await apply_webhook_events([
+                WebhookEvent(order_id=1, status="APPROVED"),
+                WebhookEvent(order_id=2, status="REJECTED"),
+            ], cache)
+
+        written = repository.update_many.await_args.args[0]
+        assert [(payment.order_id, payment.status) for payment in written] == [
+            (1, PaymentStatus.APPROVED),
+            (2, PaymentStatus.REJECTED),
+        ]
+        assert [call.args[0] for call in cache.invalidate.call_args_list] == [2]
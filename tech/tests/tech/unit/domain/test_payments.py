@@ -0,0 +1,29 @@
+from tech.domain.entities.payments import PaymentStatus
+
+
+class TestPaymentStatusTransitions:
+    def test_allowed_transitions(self):
+        assert PaymentStatus.PENDING.can_transition_to(PaymentStatus.PROCESSING)
+        assert PaymentStatus.PROCESSING.can_transition_to(PaymentStatus.APPROVED)
+        assert PaymentStatus.ERROR.can_transition_to(PaymentStatus.PROCESSING)
+        assert PaymentStatus.APPROVED.can_transition_to(PaymentStatus.REFUNDED)
+        assert PaymentStatus.PROCESSING.can_transition_to(PaymentStatus.PENDING)
+
+    def test_forbidden_transitions(self):
+        assert not PaymentStatus.APPROVED.can_transition_to(PaymentStatus.REJECTED)
+        assert not PaymentStatus.REJECTED.can_transition_to(PaymentStatus.APPROVED)
+        assert not PaymentStatus.REFUNDED.can_transition_to(PaymentStatus.APPROVED)
+        assert not PaymentStatus.APPROVED.can_transition_to(PaymentStatus.PENDING)
+
+    def test_repeating_a_status_is_allowed(self):
+        for status in PaymentStatus:
+            assert status.can_transition_to(status)
+
+    def test_final_statuses(self):
+        assert {status for status in PaymentStatus if status.is_final()} == {
+            PaymentStatus.REJECTED, PaymentStatus.REFUNDED
+        }
+
+    def test_allowed_from(self):
+        assert PaymentStatus.REFUNDED.allowed_from() == {PaymentStatus.APPROVED, PaymentStatus.REFUNDED}
+        assert PaymentStatus.PENDING.allowed_from() == {PaymentStatus.PENDING, PaymentStatus.PROCESSING}
@@ -0,0 +1,265 @@
+import asyncio
+import itertools
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+from pika import spec
+from pika.exceptions import ConnectionClosedByClient, StreamLostError
+
+
+class StandInAMQPServer:
+    """
+    In-process stand-in for a RabbitMQ server.
+
+    Exposes a connection factory with the same callback-based surface as
+    pika's AsyncioConnection, so brokers built on it can be exercised on a
+    real event loop without a running RabbitMQ.
+    """
+
+    def __init__(self):
+        self.queues = defaultdict(deque)
+        self.declared = {}
+        self.declare_calls = []
+        self.published = []
+        self.acked = []
+        self.ack_frames = []
+        self.nacked = []
+        self.connections = []
+        self.fail_connect = False
+        self.nack_routing_keys = set()
+        self.confirm_frames = []
+        self._consumers = defaultdict(list)
+
+    def connection_factory(self, parameters, on_open_callback, on_open_error_callback,
+                           on_close_callback, custom_ioloop):
+        connection = StandInConnection(
+            self, custom_ioloop, on_open_callback, on_open_error_callback, on_close_callback
+        )
+        self.connections.append(connection)
+        return connection
+
+    def declare(self, queue, arguments=None):
+        self.declare_calls.append(queue)
+        self.declared.setdefault(queue, arguments or {})
+
+    def route(self, routing_key, body, properties):
+        self.published.append((routing_key, body, properties))
+        self.queues[routing_key].append((body, properties, False))
+        self.dispatch(routing_key)
+
+    def dispatch(self, queue):
+        for consumer in list(self._consumers[queue]):
+            while self.queues[queue] and consumer.can_receive():
+                body, properties, redelivered = self.queues[queue].popleft()
+                consumer.deliver(body, properties, redelivered)
+
+    def requeue(self, queue, body, properties):
+        self.queues[queue].appendleft((body, properties, True))
+        self.dispatch(queue)
+
+    def add_consumer(self, queue, consumer):
+        self._consumers[queue].append(consumer)
+        self.dispatch(queue)
+
+    def remove_consumer(self, consumer):
+        for consumers in self._consumers.values():
+            if consumer in consumers:
+                consumers.remove(consumer)
+
+    def messages(self, queue):
+        return list(self.queues[queue])
+
+
+class StandInConnection:
+    def __init__(self, server, loop, on_open_callback, on_open_error_callback, on_close_callback):
+        self.server = server
+        self.loop = loop
+        self.is_open = False
+        self.is_opening = True
+        self.is_closed = False
+        self.channels = []
+        self._on_close_callback = on_close_callback
+        if server.fail_connect:
+            loop.call_soon(on_open_error_callback, self, ConnectionRefusedError("refused"))
+        else:
+            loop.call_soon(self._open, on_open_callback)
+
+    def _open(self, on_open_callback):
+        self.is_open = True
+        self.is_opening = False
+        on_open_callback(self)
+
+    def channel(self, channel_number=None, on_open_callback=None):
+        channel = StandInChannel(self)
+        self.channels.append(channel)
+        self.loop.call_soon(on_open_callback, channel)
+        return channel
+
+    def close(self, reply_code=200, reply_text='Normal shutdown'):
+        self._shutdown(ConnectionClosedByClient(reply_code, reply_text))
+
+    def drop(self):
+        """Simulates the TCP connection being lost."""
+        self._shutdown(StreamLostError("connection lost"))
+
+    def _shutdown(self, reason):
+        if self.is_closed:
+            return
+        self.is_open = False
+        self.is_opening = False
+        self.is_closed = True
+        for channel in self.channels:
+            channel._shutdown(reason)
+        self.loop.call_soon(self._on_close_callback, self, reason)
+
+
+class StandInConsumer:
+    def __init__(self, channel, queue, tag, on_message_callback):
+        self.channel = channel
+        self.queue = queue
+        self.tag = tag
+        self.on_message_callback = on_message_callback
+
+    def can_receive(self):
+        prefetch = self.channel.prefetch_count
+        return self.channel.is_open and (not prefetch or len(self.channel.unacked) < prefetch)
+
+    def deliver(self, body, properties, redelivered):
+        delivery_tag = next(self.channel._delivery_tags)
+        self.channel.unacked[delivery_tag] = (self.queue, body, properties)
+        method = SimpleNamespace(
+            delivery_tag=delivery_tag,
+            redelivered=redelivered,
+            routing_key=self.queue,
+            consumer_tag=self.tag,
+        )
+        self.channel.loop.call_soon(self.on_message_callback, self.channel, method, properties, body)
+
+
+class StandInChannel:
+    def __init__(self, connection):
+        self.connection = connection
+        self.server = connection.server
+        self.loop = connection.loop
+        self.is_open = True
+        self.is_closed = False
+        self.prefetch_count = 0
+        self.unacked = {}
+        self.consumers = {}
+        self._delivery_tags = itertools.count(1)
+        self._consumer_tags = itertools.count(1)
+        self._on_close_callbacks = []
+        self.confirming = False
+        self._confirm_callback = None
+        self._publish_tags = itertools.count(1)
+        self._unconfirmed = []
+
+    def add_on_close_callback(self, callback):
+        self._on_close_callbacks.append(callback)
+
+    def queue_declare(self, queue, passive=False, durable=False, exclusive=False,
+                      auto_delete=False, arguments=None, callback=None):
+        self.server.declare(queue, arguments)
+        if callback:
+            self.loop.call_soon(callback, SimpleNamespace(method=SimpleNamespace(queue=queue)))
+
+    def basic_qos(self, prefetch_size=0, prefetch_count=0, global_qos=False, callback=None):
+        self.prefetch_count = prefetch_count
+        if callback:
+            self.loop.call_soon(callback, SimpleNamespace())
+
+    def confirm_delivery(self, ack_nack_callback, callback=None):
+        self.confirming = True
+        self._confirm_callback = ack_nack_callback
+        if callback:
+            self.loop.call_soon(callback, SimpleNamespace())
+
+    def basic_publish(self, exchange, routing_key, body, properties=None, mandatory=False):
+        if not self.is_open:
+            raise ConnectionClosedByClient(504, "channel closed")
+
+        rejected = routing_key in self.server.nack_routing_keys
+        if not rejected:
+            self.server.route(routing_key, body, properties)
+
+        if self.confirming:
+            self._unconfirmed.append((next(self._publish_tags), rejected))
+            if len(self._unconfirmed) == 1:
+                self.loop.call_soon(self._flush_confirms)
+
+    def _flush_confirms(self):
+        # Like RabbitMQ, acks for a burst of publishes are coalesced with multiple=True
+        unconfirmed, self._unconfirmed = self._unconfirmed, []
+        if not self.is_open:
+            return
+        acked = [tag for tag, rejected in unconfirmed if not rejected]
+        for tag, rejected in unconfirmed:
+            if rejected:
+                self._confirm(spec.Basic.Nack(delivery_tag=tag, multiple=False))
+        if acked:
+            self._confirm(spec.Basic.Ack(delivery_tag=acked[-1], multiple=len(acked) > 1))
+
+    def _confirm(self, method):
+        self.server.confirm_frames.append(method)
+        self._confirm_callback(SimpleNamespace(method=method))
+
+    def basic_consume(self, queue, on_message_callback, auto_ack=False, exclusive=False,
+                      consumer_tag=None, arguments=None, callback=None):
+        tag = consumer_tag or f"ctag{next(self._consumer_tags)}"
+        consumer = StandInConsumer(self, queue, tag, on_message_callback)
+        self.consumers[tag] = consumer
+        if callback:
+            self.loop.call_soon(callback, SimpleNamespace())
+        self.loop.call_soon(self.server.add_consumer, queue, consumer)
+        return tag
+
+    def basic_cancel(self, consumer_tag='', callback=None):
+        consumer = self.consumers.pop(consumer_tag, None)
+        if consumer:
+            self.server.remove_consumer(consumer)
+        if callback:
+            self.loop.call_soon(callback, SimpleNamespace())
+
+    def _settled_tags(self, delivery_tag, multiple):
+        if multiple:
+            return sorted(tag for tag in self.unacked if tag <= delivery_tag)
+        return [delivery_tag] if delivery_tag in self.unacked else []
+
+    def basic_ack(self, delivery_tag=0, multiple=False):
+        self.server.ack_frames.append((delivery_tag, multiple))
+        for tag in self._settled_tags(delivery_tag, multiple):
+            queue, body, _ = self.unacked.pop(tag)
+            self.server.acked.append((queue, body))
+            self.server.dispatch(queue)
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        for tag in self._settled_tags(delivery_tag, multiple):
+            queue, body, properties = self.unacked.pop(tag)
+            self.server.nacked.append((queue, body))
+            if requeue:
+                self.server.requeue(queue, body, properties)
+            else:
+                self.server.dispatch(queue)
+
+    def close(self, reply_code=0, reply_text='Normal shutdown'):
+        self._shutdown(ConnectionClosedByClient(reply_code, reply_text))
+
+    def _shutdown(self, reason):
+        if self.is_closed:
+            return
+        self.is_open = False
+        self.is_closed = True
+        for consumer in self.consumers.values():
+            self.server.remove_consumer(consumer)
+        # Unacked messages go back to the queue, as RabbitMQ does
+        for queue, body, properties in self.unacked.values():
+            self.server.requeue(queue, body, properties)
+        self.unacked.clear()
+        for callback in self._on_close_callbacks:
+            self.loop.call_soon(callback, self, reason)
+
+
+async def settle(loop_iterations=20):
+    """Lets pending call_soon callbacks on the running loop run."""
+    for _ in range(loop_iterations):
+        await asyncio.sleep(0)
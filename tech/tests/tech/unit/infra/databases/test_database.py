@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+from tech.infra.databases import database
+from tech.infra.databases.database import create_database_engine, engine_options
+from tech.infra.databases.pool_metrics import InstrumentedQueuePool, PoolMetrics, pool_status
+from tech.infra.settings.settings import Settings
+
+POSTGRES_URL = "postgresql+psycopg://user:secret@db:5432/payments"
+
+
+class TestEngineOptions:
+    def test_pool_settings_come_from_environment(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_SIZE", "7")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "3")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+        monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+        options = engine_options(Settings(), POSTGRES_URL)
+
+        assert options == {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": 7,
+            "max_overflow": 3,
+            "pool_timeout": 2.5,
+            "pool_recycle": 600,
+            "pool_pre_ping": False,
+        }
+
+    def test_pgbouncer_mode_disables_pool_and_prepared_statements(self, monkeypatch):
+        monkeypatch.setenv("DB_PGBOUNCER", "true")
+
+        options = engine_options(Settings(), POSTGRES_URL)
+
+        assert options == {"poolclass": NullPool, "connect_args": {"prepare_threshold": None}}
+
+    def test_sqlite_keeps_default_pool(self):
+        assert engine_options(Settings(), "sqlite:///:memory:") == {}
+
+    def test_create_database_engine_instruments_pool(self, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", POSTGRES_URL)
+        monkeypatch.setenv("DB_POOL_SIZE", "4")
+
+        engine = create_database_engine(Settings())
+
+        assert pool_status(engine.pool)["size"] == 4
+        engine.dispose()
+        assert isinstance(engine.pool.metrics, PoolMetrics)
+
+    def test_async_engine_reports_missing_driver(self, monkeypatch):
+        monkeypatch.setattr(database, "settings", Settings(DATABASE_URL="sqlite:///:memory:"))
+        monkeypatch.setattr(database, "_async_engine", None)
+
+        def missing_driver(url, **options):
+            raise ModuleNotFoundError("No module named 'aiosqlite'", name="aiosqlite")
+
+        monkeypatch.setattr(database, "create_async_engine", missing_driver)
+
+        with pytest.raises(ValueError, match="async driver 'aiosqlite'"):
+            database.get_async_engine()
+
+
+class TestPoolMetrics:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.01,
+        )
+        engine.pool.metrics = PoolMetrics()
+        yield engine
+        engine.dispose()
+
+    def test_tracks_checkouts_overflow_and_timeouts(self, engine):
+        first = engine.connect()
+        second = engine.connect()
+
+        status = pool_status(engine.pool)
+        assert status["in_use"] == 2
+        assert status["overflow"] == 1
+        assert status["checkouts"] == 2
+        assert status["overflow_events"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        assert pool_status(engine.pool)["timeouts"] == 1
+        assert pool_status(engine.pool)["wait_max_ms"] >= 10
+
+        first.close()
+        second.close()
+        assert pool_status(engine.pool)["in_use"] == 0
+
+    def test_uninstrumented_pool_reports_only_its_type(self):
+        assert pool_status(NullPool(lambda: None)) == {"pool": "NullPool"}
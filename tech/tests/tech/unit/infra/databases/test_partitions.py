@@ -0,0 +1,77 @@
+from datetime import date
+from unittest.mock import MagicMock
+from tech.infra.databases.partitions import (
+    add_months,
+    create_partition_sql,
+    ensure_partitions,
+    ensure_partitions_on_startup,
+    expired_partitions,
+    partition_month,
+    partition_name,
+)
+
+
+def postgres_connection(partitions):
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+    executed = []
+
+    def execute(statement, params=None):
+        executed.append(str(statement))
+        if "pg_inherits" in str(statement):
+            return [(name,) for name in partitions]
+        return MagicMock()
+
+    connection.execute.side_effect = execute
+    return connection, executed
+
+
+class TestPartitions:
+    def test_month_arithmetic_and_names(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert partition_name(date(2027, 2, 1)) == "payments_y2027m02"
+        assert partition_month("payments_y2027m02") == date(2027, 2, 1)
+        assert partition_month("payments_legacy") is None
+        assert create_partition_sql(date(2026, 12, 1)) == (
+            "CREATE TABLE IF NOT EXISTS payments_y2026m12 PARTITION OF payments "
+            "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+        )
+
+    def test_ensure_partitions_creates_missing_months_after_newest(self):
+        connection, executed = postgres_connection(["payments_legacy", "payments_y2026m11"])
+
+        created = ensure_partitions(connection, months_ahead=2, today=date(2026, 10, 17))
+
+        assert created == ["payments_y2026m12"]
+        assert "pg_advisory_xact_lock" in executed[0]
+        assert any("payments_y2026m12 PARTITION OF payments" in sql for sql in executed)
+        connection.commit.assert_called_once()
+
+    def test_ensure_partitions_starts_at_current_month_without_partitions(self):
+        connection, _ = postgres_connection([])
+
+        created = ensure_partitions(connection, months_ahead=1, today=date(2026, 10, 17))
+
+        assert created == ["payments_y2026m10", "payments_y2026m11"]
+
+    def test_ensure_partitions_ignores_other_databases(self):
+        connection = MagicMock()
+        connection.dialect.name = "sqlite"
+
+        assert ensure_partitions(connection) == []
+        connection.execute.assert_not_called()
+
+    def test_ensure_partitions_on_startup_only_logs_failures(self):
+        engine = MagicMock()
+        engine.connect.side_effect = OSError("connection refused")
+
+        ensure_partitions_on_startup(engine)
+
+    def test_expired_partitions_respect_retention(self):
+        names = ["payments_legacy", "payments_y2025m08", "payments_y2025m09", "payments_y2025m10", "payments_y2026m10"]
+
+        assert expired_partitions(names, retention_months=12, today=date(2026, 10, 17)) == [
+            "payments_y2025m08",
+            "payments_y2025m09",
+        ]
@@ -0,0 +1,138 @@
+import pytest
+from unittest.mock import Mock
+from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.interfaces.repositories.payment_repository import PaymentRepository
+from tech.infra.repositories.cached_payment_repository import (
+    CachedPaymentRepository,
+    PaymentCache,
+    create_payment_cache,
+)
+
+
+class TestCachedPaymentRepository:
+    @pytest.fixture
+    def inner(self):
+        return Mock(spec=PaymentRepository)
+
+    @pytest.fixture
+    def cache(self):
+        return PaymentCache(max_size=100, ttl=1, terminal_ttl=60)
+
+    @pytest.fixture
+    def repository(self, inner, cache):
+        return CachedPaymentRepository(inner, cache)
+
+    def test_get_by_order_id_reads_through(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)
+
+        first = repository.get_by_order_id(1)
+        second = repository.get_by_order_id(1)
+
+        inner.get_by_order_id.assert_called_once_with(1)
+        assert first == second
+        assert first is not second
+
+    def test_cached_payment_is_copied(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)
+
+        repository.get_by_order_id(1).status = PaymentStatus.REFUNDED
+
+        assert repository.get_by_order_id(1).status == PaymentStatus.APPROVED
+
+    def test_not_found_is_not_cached(self, repository, inner):
+        inner.get_by_order_id.side_effect = ValueError("Payment not found")
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                repository.get_by_order_id(1)
+
+        assert inner.get_by_order_id.call_count == 2
+
+    def test_update_refreshes_cached_entry(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.PROCESSING)
+        repository.get_by_order_id(1)
+        inner.update.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)
+
+        repository.update(Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED))
+
+        assert repository.get_by_order_id(1).status == PaymentStatus.APPROVED
+        inner.get_by_order_id.assert_called_once()
+
+    def test_failed_write_invalidates_entry(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.PROCESSING)
+        repository.get_by_order_id(1)
+        inner.update.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            repository.update(Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED))
+        repository.get_by_order_id(1)
+
+        assert inner.get_by_order_id.call_count == 2
+
+    def test_update_many_invalidates_refused_entries(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=2, amount=20.0, status=PaymentStatus.PROCESSING)
+        repository.get_by_order_id(2)
+        inner.update_many.return_value = [Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)]
+        repository.update_many([
+            Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED),
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.REJECTED),
+        ])
+        inner.get_by_order_id.return_value = Payment(order_id=2, amount=20.0, status=PaymentStatus.REJECTED)
+
+        assert repository.get_by_order_id(2).status == PaymentStatus.REJECTED
+        assert repository.get_by_order_id(1).status == PaymentStatus.APPROVED
+        assert inner.get_by_order_id.call_count == 2
+
+    def test_transition_refreshes_or_invalidates_entry(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.PENDING)
+        repository.get_by_order_id(1)
+        inner.transition.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)
+
+        repository.transition(1, PaymentStatus.APPROVED)
+        assert repository.get_by_order_id(1).status == PaymentStatus.APPROVED
+
+        inner.transition.return_value = None
+        repository.transition(1, PaymentStatus.PENDING)
+        repository.get_by_order_id(1)
+        assert inner.get_by_order_id.call_count == 2
+
+    def test_get_by_order_ids_queries_only_misses(self, repository, inner):
+        inner.get_by_order_id.return_value = Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)
+        repository.get_by_order_id(1)
+        inner.get_by_order_ids.return_value = [Payment(order_id=2, amount=20.0, status=PaymentStatus.PENDING)]
+
+        payments = repository.get_by_order_ids([1, 2, 3])
+
+        inner.get_by_order_ids.assert_called_once_with([2, 3])
+        assert sorted(payment.order_id for payment in payments) == [1, 2]
+
+
+class TestPaymentCache:
+    def test_final_statuses_live_longer(self):
+        cache = PaymentCache(max_size=10, ttl=1, terminal_ttl=60)
+
+        assert cache.ttl_for(Payment(order_id=1, amount=1.0, status=PaymentStatus.PROCESSING)) == 1
+        assert cache.ttl_for(Payment(order_id=1, amount=1.0, status=PaymentStatus.REFUNDED)) == 60
+        assert cache.ttl_for(Payment(order_id=1, amount=1.0, status="REJECTED")) == 60
+
+    def test_approved_expires_like_in_flight_since_it_may_be_refunded(self):
+        cache = PaymentCache(max_size=10, ttl=1, terminal_ttl=60)
+
+        assert cache.ttl_for(Payment(order_id=1, amount=1.0, status=PaymentStatus.APPROVED)) == 1
+
+    def test_in_flight_entry_expires(self):
+        clock = Mock(return_value=0.0)
+        cache = PaymentCache(max_size=10, ttl=1, terminal_ttl=60)
+        cache.entries.clock = clock
+        cache.put(Payment(order_id=1, amount=1.0, status=PaymentStatus.PROCESSING))
+        cache.put(Payment(order_id=2, amount=1.0, status=PaymentStatus.REJECTED))
+
+        clock.return_value = 5.0
+
+        assert cache.get(1) is None
+        assert cache.get(2).status == PaymentStatus.REJECTED
+
+    def test_disabled_with_zero_size(self, monkeypatch):
+        monkeypatch.setenv("PAYMENT_CACHE_SIZE", "0")
+
+        assert create_payment_cache() is None
@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.infra.repositories.sql_alchemy_models import PaymentStatus as DBPaymentStatus
+from tech.infra.repositories.sql_alchemy_async_payment_repository import SQLAlchemyAsyncPaymentRepository
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+
+
+def compiled(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def result(rows=(), scalars=()):
+    result_mock = Mock()
+    result_mock.__iter__ = Mock(return_value=iter(rows))
+    result_mock.first.return_value = rows[0] if rows else None
+    result_mock.scalars.return_value.first.return_value = scalars[0] if scalars else None
+    result_mock.scalars.return_value.__iter__ = Mock(return_value=iter(scalars))
+    return result_mock
+
+
+class TestSQLAlchemyAsyncPaymentRepository:
+    @pytest.fixture
+    def session_mock(self):
+        return AsyncMock(spec=AsyncSession)
+
+    @pytest.fixture
+    def repository(self, session_mock):
+        return SQLAlchemyAsyncPaymentRepository(session_mock)
+
+    def test_implements_every_async_interface_method(self, repository):
+        assert isinstance(repository, AsyncPaymentRepository)
+        for name, method in vars(AsyncPaymentRepository).items():
+            if callable(method):
+                assert getattr(SQLAlchemyAsyncPaymentRepository, name) is not method, name
+
+    @pytest.mark.asyncio
+    async def test_add(self, repository, session_mock):
+        session_mock.execute.return_value = result(
+            rows=[SimpleNamespace(id=1, order_id=123, amount=100.5, status=DBPaymentStatus.PENDING)]
+        )
+
+        saved = await repository.add(Payment(order_id=123, amount=100.5, status=PaymentStatus.PENDING))
+
+        sql = compiled(session_mock.execute.await_args.args[0])
+        assert "INSERT INTO payment_order_ids" in sql
+        assert "INSERT INTO payments" in sql
+        assert "RETURNING payments.id" in sql
+        session_mock.commit.assert_awaited_once()
+        assert saved.order_id == 123
+        assert saved.status.name == "PENDING"
+
+    @pytest.mark.asyncio
+    async def test_add_rolls_back_on_error(self, repository, session_mock):
+        session_mock.execute.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            await repository.add(Payment(order_id=123, amount=100.5, status=PaymentStatus.PENDING))
+
+        session_mock.rollback.assert_awaited_once()
+        session_mock.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_by_order_id(self, repository, session_mock):
+        session_mock.execute.return_value = result(
+            scalars=[SimpleNamespace(order_id=123, amount=100.5, status=DBPaymentStatus.APPROVED)]
+        )
+
+        payment = await repository.get_by_order_id(123)
+
+        assert "WHERE payments.order_id =" in compiled(session_mock.execute.await_args.args[0])
+        assert payment.status.name == "APPROVED"
+
+    @pytest.mark.asyncio
+    async def test_get_by_order_id_not_found(self, repository, session_mock):
+        session_mock.execute.return_value = result()
+
+        with pytest.raises(ValueError, match="Payment not found"):
+            await repository.get_by_order_id(999)
+
+    @pytest.mark.asyncio
+    async def test_update(self, repository, session_mock):
+        session_mock.execute.return_value = result(
+            rows=[SimpleNamespace(order_id=123, amount=100.5, status=DBPaymentStatus.APPROVED)]
+        )
+
+        updated = await repository.update(Payment(order_id=123, amount=100.5, status=PaymentStatus.APPROVED))
+
+        assert "UPDATE payments SET amount=" in compiled(session_mock.execute.await_args.args[0])
+        session_mock.commit.assert_awaited_once()
+        assert updated.status.name == "APPROVED"
+
+    @pytest.mark.asyncio
+    async def test_update_not_found(self, repository, session_mock):
+        session_mock.execute.return_value = result()
+
+        with pytest.raises(ValueError, match="Payment not found"):
+            await repository.update(Payment(order_id=999, amount=1.0, status=PaymentStatus.APPROVED))
+
+    @pytest.mark.asyncio
+    async def test_add_if_absent_returns_none_on_conflict(self, repository, session_mock):
+        session_mock.execute.return_value = result()
+
+        saved = await repository.add_if_absent(Payment(order_id=123, amount=1.0, status=PaymentStatus.PROCESSING))
+
+        assert "ON CONFLICT (order_id) DO NOTHING" in compiled(session_mock.execute.await_args.args[0])
+        assert saved is None
+
+    @pytest.mark.asyncio
+    async def test_add_or_get_reports_whether_the_payment_was_created(self, repository, session_mock):
+        session_mock.execute.return_value = result([
+            SimpleNamespace(id=1, order_id=123, amount=1.0, status=DBPaymentStatus.PENDING, created=True)
+        ])
+
+        payment, created = await repository.add_or_get(Payment(order_id=123, amount=1.0, status=PaymentStatus.PENDING))
+
+        assert "UNION ALL" in compiled(session_mock.execute.await_args.args[0])
+        session_mock.commit.assert_awaited_once()
+        assert created is True
+        assert payment.order_id == 123
+
+    @pytest.mark.asyncio
+    async def test_get_by_order_ids_skips_empty_input(self, repository, session_mock):
+        assert await repository.get_by_order_ids([]) == []
+        session_mock.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_claim_stale_refreshes_only_abandoned_processing_rows(self, repository, session_mock):
+        claimed = result()
+        claimed.scalars.return_value.all.return_value = [7]
+        session_mock.execute.return_value = claimed
+
+        assert await repository.claim_stale([7, 8], datetime(2026, 10, 17, 12)) == [7]
+
+        sql = str(session_mock.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "UPDATE payments SET updated_at=" in sql
+        assert "payments.status = %(status_1)s AND payments.updated_at < %(updated_at_1)s" in sql
+        assert "RETURNING payments.order_id" in sql
+        session_mock.commit.assert_awaited_once()
+        assert await repository.claim_stale([], datetime(2026, 10, 17, 12)) == []
@@ -1,9 +1,13 @@
 import pytest
+from datetime import date, datetime
+from decimal import Decimal
 from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
 from sqlalchemy.orm import Session
-from tech.domain.entities.payments import Payment, PaymentStatus
+from sqlalchemy.dialects import postgresql
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentDailyTotal, PaymentStatus
 from tech.infra.repositories.sql_alchemy_payment_repository import SQLAlchemyPaymentRepository
-from tech.infra.repositories.sql_alchemy_models import SQLAlchemyPayment
+from tech.infra.repositories.sql_alchemy_models import PaymentStatus as DBPaymentStatus, SQLAlchemyPayment
 
 
 class TestSQLAlchemyPaymentRepository:
@@ -29,7 +33,7 @@ class TestSQLAlchemyPaymentRepository:
         db_payment.id = 1
         db_payment.order_id = 123
         db_payment.amount = 100.5
-        db_payment.status = "PENDING"
+        db_payment.status = DBPaymentStatus.PENDING
         return db_payment
 
 
@@ -49,22 +53,21 @@ class TestSQLAlchemyPaymentRepository:
             assert isinstance(result.status, str)
             assert result.status == payment_data.status.name
 
-    def test_add(self, repository, session_mock, payment_data, db_payment):
-        session_mock.add.return_value = None
-        session_mock.commit.return_value = None
-        session_mock.refresh.return_value = None
+    def test_add(self, repository, session_mock, payment_data):
+        session_mock.execute.return_value = [
+            SimpleNamespace(id=1, order_id=123, amount=100.5, status=PaymentStatus.PENDING)
+        ]
 
-        # Mock a criação do SQLAlchemyPayment para garantir o tipo correto de status
-        db_payment.status = "PENDING"  # Explicitamente definir como string
+        with patch('builtins.print'):
+            result = repository.add(payment_data)
 
-        with patch('tech.infra.repositories.sql_alchemy_payment_repository.SQLAlchemyPayment', return_value=db_payment):
-            with patch.object(repository, '_to_domain_payment', return_value=payment_data):
-                result = repository.add(payment_data)
-
-                session_mock.add.assert_called_once()
-                session_mock.commit.assert_called_once()
-                session_mock.refresh.assert_called_once()
-                assert result == payment_data
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "INSERT INTO payment_order_ids" in sql
+        assert "ON CONFLICT (order_id) DO NOTHING" not in sql
+        assert "totals AS \n(INSERT INTO payment_daily_totals (day, status, count, amount)" in sql
+        assert "ON CONFLICT (day, status) DO UPDATE SET count = (payment_daily_totals.count + excluded.count)" in sql
+        session_mock.commit.assert_called_once()
+        assert result.order_id == 123
 
     def test_get_by_order_id_found(self, repository, session_mock, db_payment, payment_data):
         query_mock = Mock()
@@ -89,44 +92,233 @@ class TestSQLAlchemyPaymentRepository:
         with pytest.raises(ValueError, match="Payment not found"):
             repository.get_by_order_id(999)
 
-    def test_update(self, repository, session_mock, payment_data, db_payment):
-        query_mock = Mock()
-        session_mock.query.return_value = query_mock
-        query_mock.filter.return_value = query_mock
-        query_mock.first.return_value = db_payment
+    def test_update(self, repository, session_mock, payment_data):
+        session_mock.execute.return_value.first.return_value = SimpleNamespace(
+            id=1, order_id=123, amount=100.5, status=PaymentStatus.PENDING
+        )
 
-        with patch.object(repository, '_to_domain_payment', return_value=payment_data):
+        with patch('builtins.print'):
             result = repository.update(payment_data)
 
-            assert db_payment.amount == payment_data.amount
-            assert db_payment.status == payment_data.status.name
-            session_mock.commit.assert_called_once()
-            session_mock.refresh.assert_called_once()
-            assert result == payment_data
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "UPDATE payments SET amount=" in sql
+        assert "INSERT INTO payment_daily_totals" in sql
+        session_mock.commit.assert_called_once()
+        assert result == payment_data
 
     def test_update_not_found(self, repository, session_mock, payment_data):
-        query_mock = Mock()
-        session_mock.query.return_value = query_mock
-        query_mock.filter.return_value = query_mock
-        query_mock.first.return_value = None
+        session_mock.execute.return_value.first.return_value = None
+        session_mock.query.return_value.filter.return_value.first.return_value = None
 
         with pytest.raises(ValueError, match="Payment not found"):
             repository.update(payment_data)
 
-    def test_create(self, repository, session_mock, payment_data, db_payment):
-        db_payment.id = 42
-        session_mock.add.return_value = None
-        session_mock.commit.return_value = None
-        session_mock.refresh.return_value = None
+    def test_update_refused_transition(self, repository, session_mock, db_payment):
+        session_mock.execute.return_value.first.return_value = None
+        db_payment.status = PaymentStatus.APPROVED
+        session_mock.query.return_value.filter.return_value.first.return_value = db_payment
+
+        with pytest.raises(InvalidStatusTransition, match="from APPROVED to PENDING"):
+            repository.update(Payment(order_id=123, amount=100.5, status=PaymentStatus.PENDING))
+
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "payments.status IN (__[POSTCOMPILE_status_1]) FOR UPDATE" in sql
+
+    def test_create(self, repository, session_mock, payment_data):
+        session_mock.execute.return_value.first.return_value = SimpleNamespace(id=42, order_id=123)
+
+        result = repository.create(payment_data)
+
+        session_mock.execute.assert_called_once()
+        session_mock.commit.assert_called_once()
+        assert result.id == 42
+        assert result == payment_data
+
+    def test_add_many_inserts_batch_in_one_statement(self, repository, session_mock):
+        payments = [
+            Payment(order_id=1, amount=10.0, status=PaymentStatus.PROCESSING, payment_method="pix"),
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.PROCESSING)
+        ]
+        session_mock.execute.return_value = [
+            SimpleNamespace(id=8, order_id=2, amount=20.0, status=PaymentStatus.PROCESSING),
+            SimpleNamespace(id=7, order_id=1, amount=10.0, status=PaymentStatus.PROCESSING)
+        ]
+
+        with patch('builtins.print'):
+            result = repository.add_many(payments)
+
+        session_mock.execute.assert_called_once()
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH new_payments AS")
+        assert "claimed AS \n(INSERT INTO payment_order_ids (order_id, created_at)" in sql
+        assert "INSERT INTO payments (order_id, amount, status, created_at, updated_at)" in sql
+        assert "WHERE new_payments.order_id IN (SELECT claimed.order_id" in sql
+        assert "RETURNING payments.id" in sql
+        session_mock.commit.assert_called_once()
+        assert [p.order_id for p in result] == [1, 2]
+        assert result[0].payment_method == "pix"
+
+    def test_add_many_rolls_back_on_error(self, repository, session_mock):
+        session_mock.execute.side_effect = Exception("duplicate key")
+
+        with pytest.raises(Exception, match="duplicate key"):
+            repository.add_many([Payment(order_id=1, amount=10.0, status=PaymentStatus.PROCESSING)])
+
+        session_mock.rollback.assert_called_once()
+        session_mock.commit.assert_not_called()
+
+    def test_add_many_empty(self, repository, session_mock):
+        assert repository.add_many([]) == []
+        session_mock.execute.assert_not_called()
+
+    def test_update_many_updates_batch_in_one_statement(self, repository, session_mock):
+        session_mock.execute.return_value = [SimpleNamespace(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)]
+        payments = [
+            Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED),
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.ERROR)
+        ]
+
+        repository.update_many(payments)
+
+        session_mock.execute.assert_called_once()
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("WITH previous AS")
+        assert "UPDATE payments SET status=CAST(CASE payments.order_id" in sql
+        assert "AS paymentstatus)" in sql
+        session_mock.commit.assert_called_once()
+
+    def test_update_many_only_updates_allowed_transitions(self, repository, session_mock):
+        session_mock.execute.return_value = []
+        repository.update_many([Payment(order_id=1, amount=10.0, status=PaymentStatus.REFUNDED)])
+
+        compiled = session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "payments.status IN (__[POSTCOMPILE_status_1])" in str(compiled)
+        assert compiled.params["status_1"] == ["APPROVED", "REFUNDED"]
+
+    def test_transition_in_one_statement(self, repository, session_mock):
+        session_mock.execute.return_value.first.return_value = SimpleNamespace(
+            id=1, order_id=123, amount=100.5, status=PaymentStatus.APPROVED
+        )
+
+        with patch('builtins.print'):
+            payment = repository.transition(123, PaymentStatus.APPROVED)
+
+        compiled = session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "WHERE payments.order_id = %(order_id_1)s::INTEGER AND payments.status IN (__[POSTCOMPILE_status_1]) " \
+               "FOR UPDATE" in sql
+        assert "changed AS \n(UPDATE payments SET status=" in sql
+        assert "previous.status AS previous_status" in sql
+        assert sql.endswith("SELECT changed.id, changed.order_id, changed.amount, changed.status \nFROM changed")
+        assert compiled.params["status_1"] == ["APPROVED", "ERROR", "PENDING", "PROCESSING"]
+        session_mock.commit.assert_called_once()
+        assert payment.status == PaymentStatus.APPROVED
+
+    def test_transition_refused_returns_none(self, repository, session_mock):
+        session_mock.execute.return_value.first.return_value = None
+
+        assert repository.transition(123, PaymentStatus.PENDING) is None
+
+    def test_update_many_empty(self, repository, session_mock):
+        repository.update_many([])
+        session_mock.execute.assert_not_called()
+
+    def test_add_many_if_absent_skips_existing_orders(self, repository, session_mock):
+        payments = [
+            Payment(order_id=1, amount=10.0, status=PaymentStatus.PROCESSING),
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.PROCESSING)
+        ]
+        session_mock.execute.return_value = [
+            SimpleNamespace(id=9, order_id=2, amount=20.0, status=PaymentStatus.PROCESSING)
+        ]
+
+        with patch('builtins.print'):
+            result = repository.add_many_if_absent(payments)
+
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (order_id) DO NOTHING RETURNING" in sql
+        session_mock.commit.assert_called_once()
+        assert [p.order_id for p in result] == [2]
+
+    def test_add_if_absent_returns_none_for_existing_order(self, repository, session_mock, payment_data):
+        session_mock.execute.return_value = []
+
+        assert repository.add_if_absent(payment_data) is None
+
+    def test_add_or_get_inserts_or_returns_existing_in_one_statement(self, repository, session_mock, payment_data):
+        session_mock.execute.return_value.first.return_value = SimpleNamespace(
+            id=1, order_id=123, amount=90.0, status=PaymentStatus.APPROVED, created=False
+        )
+
+        payment, created = repository.add_or_get(payment_data)
+
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "inserted AS \n(INSERT INTO payments" in sql
+        assert "ON CONFLICT (order_id) DO NOTHING RETURNING" in sql
+        assert "UNION ALL" in sql
+        assert "NOT (EXISTS (SELECT inserted.id" in sql
+        session_mock.execute.assert_called_once()
+        session_mock.commit.assert_called_once()
+        assert created is False
+        assert payment.amount == 90.0
+        assert payment.status == PaymentStatus.APPROVED
+
+    def test_add_or_get_falls_back_to_lookup_when_no_row(self, repository, session_mock, payment_data, db_payment):
+        session_mock.execute.return_value.first.return_value = None
+        session_mock.query.return_value.filter.return_value.first.return_value = db_payment
+
+        with patch('builtins.print'):
+            payment, created = repository.add_or_get(payment_data)
+
+        assert created is False
+        assert payment.order_id == db_payment.order_id
+
+    def test_get_by_order_ids(self, repository, session_mock, db_payment):
+        session_mock.execute.return_value.scalars.return_value = [db_payment]
+
+        with patch('builtins.print'):
+            result = repository.get_by_order_ids([123, 456])
+
+        assert [p.order_id for p in result] == [123]
+        assert repository.get_by_order_ids([]) == []
+        session_mock.execute.assert_called_once()
+        stmt = session_mock.execute.call_args.args[0]
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        assert "payments.order_id = ANY (%(order_ids_1)s::INTEGER[])" in str(compiled)
+        assert compiled.params == {"order_ids_1": [123, 456]}
+
+    def test_daily_totals_reads_the_rollup(self, repository, session_mock):
+        session_mock.execute.return_value.scalars.return_value = [
+            SimpleNamespace(day=date(2026, 10, 17), status=DBPaymentStatus.APPROVED, count=2, amount=Decimal("15.50"))
+        ]
+
+        totals = repository.daily_totals(day_from=date(2026, 10, 1), statuses=[PaymentStatus.APPROVED])
+
+        assert totals == [PaymentDailyTotal(day=date(2026, 10, 17), status=PaymentStatus.APPROVED, count=2, amount=15.5)]
+        sql = str(session_mock.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM payment_daily_totals" in sql
+        assert "payment_daily_totals.day >= %(day_1)s::DATE" in sql
+        assert "ORDER BY payment_daily_totals.day, payment_daily_totals.status" in sql
 
-        # Garantir que status é string
-        db_payment.status = "PENDING"
+    def test_iter_payments_uses_keyset_pagination(self, repository, session_mock, db_payment):
+        db_payment.created_at = datetime(2024, 1, 1)
+        db_payment.updated_at = datetime(2024, 1, 2)
+        session_mock.execute.return_value.scalars.return_value = [db_payment]
 
-        with patch('tech.infra.repositories.sql_alchemy_payment_repository.SQLAlchemyPayment', return_value=db_payment):
-            result = repository.create(payment_data)
+        payments = list(repository.iter_payments(
+            statuses=[PaymentStatus.APPROVED],
+            created_from=datetime(2024, 1, 1),
+            created_to=datetime(2024, 2, 1),
+            after_order_id=100,
+            limit=51,
+        ))
 
-            session_mock.add.assert_called_once()
-            session_mock.commit.assert_called_once()
-            session_mock.refresh.assert_called_once()
-            assert result.id == 42
-            assert result == payment_data
\ No newline at end of file
+        stmt = session_mock.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "payments.created_at >= %(created_at_1)s::TIMESTAMP WITHOUT TIME ZONE" in sql
+        assert "payments.created_at < %(created_at_2)s::TIMESTAMP WITHOUT TIME ZONE" in sql
+        assert "payments.order_id > %(order_id_1)s::INTEGER ORDER BY payments.order_id" in sql
+        assert "OFFSET" not in sql
+        assert stmt.get_execution_options()["yield_per"] > 0
+        assert payments[0].created_at == datetime(2024, 1, 1)
+        assert payments[0].updated_at == datetime(2024, 1, 2)
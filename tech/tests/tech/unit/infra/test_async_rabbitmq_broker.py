@@ -73,6 +73,12 @@ class TestAsyncRabbitMQBroker:
 
         sync_broker_mock.consume.assert_called_once_with(queue, callback)
 
+    def test_consume_batch(self, broker, sync_broker_mock):
+        result = broker.consume_batch("test_queue", max_batch=10, max_wait=0.1)
+
+        sync_broker_mock.consume_batch.assert_called_once_with("test_queue", 10, 0.1, prefetch_count=None)
+        assert result is sync_broker_mock.consume_batch.return_value
+
     def test_close(self, broker, sync_broker_mock):
         broker.close()
 
@@ -0,0 +1,379 @@
+import pytest
+import asyncio
+import json
+from unittest.mock import Mock, patch
+from pika.exceptions import AMQPConnectionError, ChannelClosed, NackError, StreamLostError
+from tech.infra.asyncio_rabbitmq_broker import AsyncioRabbitMQBroker, create_asyncio_rabbitmq_broker
+from tests.tech.unit.infra.amqp_stand_in import StandInAMQPServer, settle
+
+
+class TestAsyncioRabbitMQBroker:
+    @pytest.fixture
+    def server(self):
+        return StandInAMQPServer()
+
+    @pytest.fixture
+    def broker(self, server):
+        return AsyncioRabbitMQBroker(
+            host="localhost",
+            port=5672,
+            user="guest",
+            password="password",
+            connection_factory=server.connection_factory
+        )
+
+    @pytest.mark.asyncio
+    async def test_connect(self, broker, server):
+        await broker.connect()
+
+        assert broker.is_open
+        assert len(server.connections) == 1
+
+        await broker.connect()
+        assert len(server.connections) == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_error(self, broker, server):
+        server.fail_connect = True
+
+        with pytest.raises(AMQPConnectionError):
+            await broker.connect()
+
+        assert not broker.is_open
+
+    @pytest.mark.asyncio
+    async def test_publish_async_connects_and_declares_once(self, broker, server):
+        await broker.publish_async("test_queue", {"key": "value"})
+        await broker.publish_async("test_queue", {"key": "other"})
+
+        assert server.declare_calls == ["test_queue"]
+        bodies = [json.loads(body) for _, body, _ in server.published]
+        assert bodies == [{"key": "value"}, {"key": "other"}]
+        properties = server.published[0][2]
+        assert properties.delivery_mode == 2
+        assert properties.content_type == 'application/json'
+
+    @pytest.mark.asyncio
+    async def test_publish_many_waits_for_confirms_in_bulk(self, broker, server):
+        messages = [{"order_id": order_id} for order_id in range(50)]
+
+        await broker.publish_many("payment_responses", messages)
+
+        assert [json.loads(body) for _, body, _ in server.published] == messages
+        assert server.declare_calls == ["payment_responses"]
+        assert len(server.confirm_frames) == 1
+        assert server.confirm_frames[0].multiple is True
+
+    @pytest.mark.asyncio
+    async def test_publish_many_empty_batch(self, broker, server):
+        await broker.publish_many("payment_responses", [])
+
+        assert server.connections == []
+
+    @pytest.mark.asyncio
+    async def test_publish_many_raises_on_nack(self, broker, server):
+        server.nack_routing_keys.add("rejected")
+
+        with pytest.raises(NackError) as exc_info:
+            await broker.publish_many("rejected", [{"order_id": 1}, {"order_id": 2}])
+
+        assert exc_info.value.messages == [{"order_id": 1}, {"order_id": 2}]
+
+    @pytest.mark.asyncio
+    async def test_publisher_pool_round_robin(self, server):
+        broker = AsyncioRabbitMQBroker(
+            host="localhost",
+            port=5672,
+            user="guest",
+            password="password",
+            publisher_channels=3,
+            connection_factory=server.connection_factory
+        )
+
+        await asyncio.gather(*(
+            broker.publish_async("payment_responses", {"order_id": order_id})
+            for order_id in range(9)
+        ))
+
+        channels = server.connections[0].channels
+        publishers = [channel for channel in channels if channel.confirming]
+        assert len(publishers) == 3
+        assert len(channels) == 4
+        assert len(server.published) == 9
+
+    @pytest.mark.asyncio
+    async def test_publisher_channel_closed_fails_pending_and_reopens(self, server):
+        broker = AsyncioRabbitMQBroker(
+            host="localhost",
+            port=5672,
+            user="guest",
+            password="password",
+            publisher_channels=1,
+            connection_factory=server.connection_factory
+        )
+        await broker.publish_async("payment_responses", {"order_id": 1})
+        publisher_channel = next(ch for ch in server.connections[0].channels if ch.confirming)
+
+        pending = asyncio.ensure_future(broker.publish_many("payment_responses", [{"order_id": 2}]))
+        await asyncio.sleep(0)
+        publisher_channel.close()
+
+        with pytest.raises(ChannelClosed):
+            await pending
+
+        await broker.publish_async("payment_responses", {"order_id": 3})
+
+        assert len([ch for ch in server.connections[0].channels if ch.confirming]) == 2
+        assert len(server.connections) == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_requires_connection(self, broker):
+        with pytest.raises(ChannelClosed):
+            broker.publish("test_queue", {"key": "value"})
+
+    @pytest.mark.asyncio
+    async def test_publish_sync_after_connect(self, broker, server):
+        await broker.connect()
+
+        broker.publish("test_queue", {"key": "value"})
+
+        assert server.declare_calls == ["test_queue"]
+        assert len(server.published) == 1
+
+    @pytest.mark.asyncio
+    async def test_consume_async_acks_after_coroutine(self, broker, server):
+        received = []
+        done = asyncio.Event()
+
+        async def handler(message):
+            received.append(message)
+            if len(received) == 2:
+                done.set()
+
+        await broker.consume_async("requests", handler, prefetch_count=5)
+        await broker.publish_async("requests", {"order_id": 1})
+        await broker.publish_async("requests", {"order_id": 2})
+
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await settle()
+
+        assert received == [{"order_id": 1}, {"order_id": 2}]
+        assert len(server.acked) == 2
+        assert server.nacked == []
+
+    @pytest.mark.asyncio
+    async def test_consume_async_runs_up_to_prefetch_concurrently(self, broker, server):
+        active = 0
+        max_active = 0
+        processed = 0
+
+        async def handler(message):
+            nonlocal active, max_active, processed
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            processed += 1
+
+        for order_id in range(6):
+            await broker.publish_async("requests", {"order_id": order_id})
+
+        await broker.consume_async("requests", handler, prefetch_count=3)
+
+        for _ in range(100):
+            if processed == 6:
+                break
+            await asyncio.sleep(0.01)
+        await settle()
+
+        assert processed == 6
+        assert max_active == 3
+        assert len(server.acked) == 6
+
+    @pytest.mark.asyncio
+    async def test_consume_async_nacks_failed_handler(self, broker, server):
+        attempts = []
+
+        async def handler(message):
+            attempts.append(message)
+            if len(attempts) == 1:
+                raise Exception("Handler error")
+
+        await broker.consume_async("requests", handler)
+        await broker.publish_async("requests", {"order_id": 1})
+
+        for _ in range(100):
+            if server.acked:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(server.nacked) == 1
+        assert len(attempts) == 2
+        assert len(server.acked) == 1
+
+    @pytest.mark.asyncio
+    async def test_consume_async_sync_callback_and_invalid_json(self, broker, server):
+        callback = Mock()
+
+        await broker.consume_async("requests", callback)
+        broker.channel.basic_publish(exchange='', routing_key="requests", body=b"invalid json")
+        await broker.publish_async("requests", {"order_id": 1})
+        await settle()
+
+        callback.assert_called_once_with({"order_id": 1})
+        assert len(server.acked) == 2
+
+    @pytest.mark.asyncio
+    async def test_consume_schedules_consumer(self, broker, server):
+        task = broker.consume("requests", Mock())
+        consumer_tag = await task
+
+        assert consumer_tag in broker.channel.consumers
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_deliveries(self, broker, server):
+        callback = Mock()
+        consumer_tag = await broker.consume_async("requests", callback)
+        await settle()
+
+        await broker.cancel(consumer_tag)
+        await broker.publish_async("requests", {"order_id": 1})
+        await settle()
+
+        callback.assert_not_called()
+        assert len(server.messages("requests")) == 1
+
+    @staticmethod
+    async def _next_batch(batches):
+        return await asyncio.wait_for(batches.__anext__(), 1)
+
+    @pytest.mark.asyncio
+    async def test_consume_batch_groups_deliveries(self, broker, server):
+        await broker.connect()
+        for order_id in range(5):
+            broker.publish("requests", {"order_id": order_id})
+        batches = broker.consume_batch("requests", max_batch=3, max_wait=0.05)
+
+        first = await self._next_batch(batches)
+        first.ack()
+        second = await self._next_batch(batches)
+
+        assert [m["order_id"] for m in first.messages] == [0, 1, 2]
+        assert [m["order_id"] for m in second.messages] == [3, 4]
+        assert broker.channel.prefetch_count == 3
+        await batches.aclose()
+
+    @pytest.mark.asyncio
+    async def test_consume_batch_acks_contiguous_batches_with_multiple(self, broker, server):
+        await broker.connect()
+        for order_id in range(4):
+            broker.publish("requests", {"order_id": order_id})
+        batches = broker.consume_batch("requests", max_batch=2, max_wait=0.05, prefetch_count=4)
+        first = await self._next_batch(batches)
+        second = await self._next_batch(batches)
+
+        second.ack()
+        assert server.ack_frames == []
+
+        first.ack()
+        assert server.ack_frames == [(4, True)]
+        assert len(server.acked) == 4
+        await batches.aclose()
+
+    @pytest.mark.asyncio
+    async def test_consume_batch_nack_requeues_batch(self, broker, server):
+        await broker.connect()
+        for order_id in range(2):
+            broker.publish("requests", {"order_id": order_id})
+        batches = broker.consume_batch("requests", max_batch=2, max_wait=0.05)
+        batch = await self._next_batch(batches)
+
+        batch.nack(requeue=True)
+        redelivered = await self._next_batch(batches)
+
+        assert len(server.nacked) == 2
+        assert [m["order_id"] for m in redelivered.messages] == [0, 1]
+        await batches.aclose()
+
+    @pytest.mark.asyncio
+    async def test_consume_batch_acks_invalid_json(self, broker, server):
+        await broker.connect()
+        broker.channel.basic_publish(exchange='', routing_key="requests", body="not-json")
+        broker.publish("requests", {"order_id": 1})
+        batches = broker.consume_batch("requests", max_batch=2, max_wait=0.05)
+
+        batch = await self._next_batch(batches)
+
+        assert batch.messages == [{"order_id": 1}]
+        assert server.acked == [("requests", "not-json")]
+        await batches.aclose()
+
+    @pytest.mark.asyncio
+    async def test_consume_batch_ends_on_close_and_raises_on_connection_loss(self, broker, server):
+        await broker.connect()
+        batches = broker.consume_batch("requests", max_batch=2, max_wait=0.05)
+        consuming = asyncio.ensure_future(self._next_batch(batches))
+        await settle()
+
+        await broker.close_async()
+        with pytest.raises(StopAsyncIteration):
+            await consuming
+
+        await broker.connect()
+        batches = broker.consume_batch("requests", max_batch=2, max_wait=0.05)
+        consuming = asyncio.ensure_future(self._next_batch(batches))
+        await settle()
+
+        server.connections[-1].drop()
+        with pytest.raises(StreamLostError):
+            await consuming
+
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_pending_confirms(self, broker, server):
+        await broker.publish_async("requests", {"order_id": 0})
+        publisher = broker._open_publishers()[0]
+        confirmation = publisher.publish("requests", '{"order_id": 1}', None)
+        assert publisher.pending == 1
+
+        await broker.flush(timeout=1)
+
+        assert confirmation.done() and confirmation.result() is True
+        assert publisher.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_close_async(self, broker, server):
+        await broker.connect()
+
+        await broker.close_async()
+
+        assert not broker.is_open
+        assert broker.closed.done()
+        assert broker.closed.exception() is None
+
+    @pytest.mark.asyncio
+    async def test_connection_lost_resolves_closed_with_error(self, broker, server):
+        await broker.connect()
+
+        server.connections[0].drop()
+        await settle()
+
+        assert not broker.is_open
+        assert isinstance(broker.closed.exception(), StreamLostError)
+
+        await broker.publish_async("test_queue", {"key": "value"})
+        assert len(server.connections) == 2
+
+    def test_create_asyncio_rabbitmq_broker_from_env(self):
+        env = {
+            "RABBITMQ_HOST": "rabbit",
+            "RABBITMQ_PORT": "1234",
+            "RABBITMQ_USER": "test_user",
+            "RABBITMQ_PASS": "test_password",
+        }
+        with patch.dict('os.environ', env):
+            broker = create_asyncio_rabbitmq_broker()
+
+        assert broker.connection_params.host == "rabbit"
+        assert broker.connection_params.port == 1234
+        assert broker.connection_params.credentials.username == "test_user"
+        assert broker.connection is None
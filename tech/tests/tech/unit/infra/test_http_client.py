@@ -0,0 +1,38 @@
+import pytest
+from unittest.mock import patch
+from tech.infra.http_client import create_orders_http_client
+
+
+class TestCreateOrdersHttpClient:
+    @pytest.mark.asyncio
+    async def test_pool_limits_from_environment(self, monkeypatch):
+        monkeypatch.setenv("ORDERS_HTTP_MAX_CONNECTIONS", "50")
+        monkeypatch.setenv("ORDERS_HTTP_MAX_KEEPALIVE", "10")
+        monkeypatch.setenv("ORDERS_HTTP_KEEPALIVE_EXPIRY", "15")
+
+        with patch('tech.infra.http_client.httpx.AsyncClient') as client_class:
+            create_orders_http_client()
+
+        limits = client_class.call_args.kwargs["limits"]
+        assert limits.max_connections == 50
+        assert limits.max_keepalive_connections == 10
+        assert limits.keepalive_expiry == 15.0
+        assert client_class.call_args.kwargs["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_http2_when_h2_is_installed(self, monkeypatch):
+        monkeypatch.setenv("ORDERS_HTTP2", "true")
+
+        with patch('tech.infra.http_client.http2_available', return_value=True), \
+                patch('tech.infra.http_client.httpx.AsyncClient') as client_class:
+            create_orders_http_client()
+
+        assert client_class.call_args.kwargs["http2"] is True
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self):
+        with patch('tech.infra.http_client.http2_available', return_value=False), \
+                patch('tech.infra.http_client.httpx.AsyncClient') as client_class:
+            create_orders_http_client(http2=True)
+
+        assert client_class.call_args.kwargs["http2"] is False
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import Mock, patch, call, MagicMock
 import pika
-from tech.infra.rabbitmq_broker import RabbitMQBroker
+from types import SimpleNamespace
+from tech.infra.rabbitmq_broker import RabbitMQBroker, AckTracker
 
 
 class TestRabbitMQBroker:
@@ -75,6 +76,17 @@ class TestRabbitMQBroker:
         assert 'body' in publish_call.kwargs
         assert 'properties' in publish_call.kwargs
 
+    def test_publish_declares_queue_once(self, broker, channel_mock):
+        broker.publish("test_queue", {"key": "value"})
+        broker.publish("test_queue", {"key": "other"})
+        broker.publish("other_queue", {"key": "value"})
+
+        assert channel_mock.queue_declare.call_args_list == [
+            call(queue="test_queue", durable=True),
+            call(queue="other_queue", durable=True),
+        ]
+        assert channel_mock.basic_publish.call_count == 3
+
     def test_consume(self, broker, channel_mock):
         queue = "test_queue"
         callback = Mock()
@@ -102,6 +114,64 @@ class TestRabbitMQBroker:
         callback.assert_called_once_with({"data": "test"})
         ch.basic_ack.assert_called_once_with(delivery_tag="tag1")
 
+    @staticmethod
+    def _delivery(tag, body):
+        return SimpleNamespace(delivery_tag=tag), SimpleNamespace(headers={"x-attempt": tag}), body.encode()
+
+    def test_consume_batch(self, broker, channel_mock):
+        channel_mock.consume.return_value = iter([
+            self._delivery(1, '{"order_id": 1}'),
+            self._delivery(2, '{"order_id": 2}'),
+            self._delivery(3, 'not-json'),
+            self._delivery(4, '{"order_id": 4}'),
+            (None, None, None),
+        ])
+
+        batches = broker.consume_batch("test_queue", max_batch=2, max_wait=0.5)
+        first = next(batches)
+        first.ack()
+        second = next(batches)
+        second.ack()
+
+        channel_mock.basic_qos.assert_called_once_with(prefetch_count=2)
+        channel_mock.consume.assert_called_once_with("test_queue", inactivity_timeout=0.5)
+        assert first.messages == [{"order_id": 1}, {"order_id": 2}]
+        assert second.messages == [{"order_id": 4}]
+        assert second.headers == [{"x-attempt": 4}]
+        assert channel_mock.basic_ack.call_args_list == [
+            call(delivery_tag=2, multiple=True),
+            call(delivery_tag=3, multiple=True),
+            call(delivery_tag=4, multiple=True),
+        ]
+
+    def test_consume_batch_close_cancels_consumer(self, broker, channel_mock):
+        channel_mock.consume.return_value = iter([self._delivery(1, '{"order_id": 1}')])
+
+        batches = broker.consume_batch("test_queue", max_batch=5, max_wait=0.5)
+        with pytest.raises(StopIteration):
+            next(batches)
+
+        channel_mock.basic_nack.assert_called_once_with(delivery_tag=1, requeue=True)
+        channel_mock.cancel.assert_called_once()
+
+    def test_ack_tracker_acks_contiguous_tags_only(self, channel_mock):
+        tracker = AckTracker(channel_mock)
+        for tag in (1, 2, 3, 4):
+            tracker.delivered(tag)
+        first = tracker.batch([{}, {}], [1, 2])
+        second = tracker.batch([{}], [3])
+        third = tracker.batch([{}], [4])
+
+        third.ack()
+        channel_mock.basic_ack.assert_not_called()
+
+        second.nack(requeue=True)
+        first.ack()
+        first.ack()
+
+        channel_mock.basic_nack.assert_called_once_with(delivery_tag=3, requeue=True)
+        channel_mock.basic_ack.assert_called_once_with(delivery_tag=4, multiple=True)
+
     def test_close(self, broker, connection_mock):
         connection_mock.is_open = True
 
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, call
+from tech.infra.retry_queues import RetryQueues, create_retry_queues
+
+
+class TestRetryQueues:
+    @pytest.fixture
+    def retry_queues(self):
+        return RetryQueues("payment_requests", max_retries=3, base_delay_ms=1000)
+
+    def test_retry_queue_arguments_use_exponential_ttl(self, retry_queues):
+        assert [retry_queues.delay_ms(attempt) for attempt in (1, 2, 3)] == [1000, 2000, 4000]
+        assert retry_queues.retry_queue_arguments(2) == {
+            "x-message-ttl": 2000,
+            "x-dead-letter-exchange": "",
+            "x-dead-letter-routing-key": "payment_requests",
+        }
+
+    def test_destination(self, retry_queues):
+        assert retry_queues.destination({}) == ("payment_requests.retry.1", 1)
+        assert retry_queues.destination({"x-attempt": 2}) == ("payment_requests.retry.3", 3)
+        assert retry_queues.destination({"x-attempt": 3}) == ("payment_requests.dlq", 4)
+
+    @pytest.mark.asyncio
+    async def test_declare(self, retry_queues):
+        broker = Mock()
+        broker.declare_queue = AsyncMock()
+
+        await retry_queues.declare(broker)
+
+        assert broker.declare_queue.await_args_list == [
+            call("payment_requests.retry.1", arguments=retry_queues.retry_queue_arguments(1)),
+            call("payment_requests.retry.2", arguments=retry_queues.retry_queue_arguments(2)),
+            call("payment_requests.retry.3", arguments=retry_queues.retry_queue_arguments(3)),
+            call("payment_requests.dlq"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reject_groups_messages_by_destination(self, retry_queues):
+        broker = Mock()
+        broker.publish_many = AsyncMock()
+
+        await retry_queues.reject(
+            broker,
+            [{"order_id": 1}, {"order_id": 2}, {"order_id": 3}],
+            [{}, {"x-attempt": 3}, {}],
+            "db down"
+        )
+
+        assert broker.publish_many.await_args_list == [
+            call("payment_requests.retry.1", [{"order_id": 1}, {"order_id": 3}],
+                 headers={"x-attempt": 1, "x-last-error": "db down"}),
+            call("payment_requests.dlq", [{"order_id": 2}],
+                 headers={"x-attempt": 4, "x-last-error": "db down"}),
+        ]
+
+    def test_create_retry_queues_from_env(self, monkeypatch):
+        monkeypatch.setenv("PAYMENT_MAX_RETRIES", "2")
+        monkeypatch.setenv("PAYMENT_RETRY_BASE_DELAY_MS", "500")
+
+        retry_queues = create_retry_queues("payment_requests")
+
+        assert retry_queues.max_retries == 2
+        assert retry_queues.delay_ms(2) == 1000
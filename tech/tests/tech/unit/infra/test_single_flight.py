@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from tech.infra.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.ensure_future(single_flight.do("key", call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["result"] * 5
+        assert len(calls) == 1
+        assert len(single_flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            single_flight.do("key", call), single_flight.do("key", call), return_exceptions=True
+        )
+
+        assert [str(result) for result in results] == ["boom", "boom"]
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_next_call_after_completion_runs_again(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return len(calls)
+
+        assert await single_flight.do("key", call) == 1
+        assert await single_flight.do("key", call) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        single_flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        first = asyncio.ensure_future(single_flight.do("key", call))
+        second = asyncio.ensure_future(single_flight.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "result"
+        assert first.cancelled()
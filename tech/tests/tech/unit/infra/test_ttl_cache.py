@@ -0,0 +1,64 @@
+from tech.infra.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_get_returns_fresh_values_only(self):
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        clock.now = 5
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_stale_entries_are_kept_for_the_stale_window(self):
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl=5, stale_ttl=10, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 7
+        entry = cache.get_entry("a")
+        assert entry.value == 1
+        assert not entry.is_fresh(clock.now)
+        assert cache.get("a") is None
+
+        clock.now = 15
+        assert cache.get_entry("a") is None
+
+    def test_per_entry_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.put("short", 1)
+        cache.put("long", 2, ttl=60)
+
+        clock.now = 30
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_invalidate(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.put("a", 1)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        assert cache.get("a") is None
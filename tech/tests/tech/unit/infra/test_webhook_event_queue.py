@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from tech.infra.webhook_event_queue import WebhookEventQueue, create_webhook_event_queue
+
+
+class Recorder:
+    def __init__(self, fail=False, failures=0, poison=None, delay=0):
+        self.batches = []
+        self.fail = fail
+        self.failures = failures
+        self.poison = poison
+        self.delay = delay
+
+    async def __call__(self, batch):
+        self.batches.append(list(batch))
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("db down")
+        if self.fail or self.poison in batch:
+            raise RuntimeError("db down")
+
+
+class TestWebhookEventQueue:
+    @pytest.mark.asyncio
+    async def test_events_are_applied_in_batches(self):
+        apply = Recorder()
+        queue = WebhookEventQueue(apply, max_size=100, batch_size=3, batch_wait=0.01)
+        queue.start()
+
+        assert queue.offer(list(range(7)))
+        await asyncio.sleep(0.05)
+        await queue.stop()
+
+        assert apply.batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+    @pytest.mark.asyncio
+    async def test_offer_rejects_batch_that_does_not_fit(self):
+        queue = WebhookEventQueue(Recorder(), max_size=5)
+
+        assert queue.offer([1, 2, 3])
+        assert not queue.offer([4, 5, 6])
+        assert len(queue) == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_applies_pending_events(self):
+        apply = Recorder()
+        queue = WebhookEventQueue(apply, max_size=100, batch_size=2)
+
+        queue.offer([1, 2, 3])
+        await queue.stop()
+
+        assert apply.batches == [[1, 2], [3]]
+        assert len(queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_does_not_stop_the_consumer(self):
+        apply = Recorder(fail=True)
+        queue = WebhookEventQueue(apply, max_size=100, batch_size=1, batch_wait=0, max_attempts=2, retry_delay=0)
+        queue.start()
+
+        queue.offer([1, 2])
+        await asyncio.sleep(0.01)
+        await queue.stop()
+
+        assert apply.batches == [[1], [1], [2], [2]]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried(self):
+        apply = Recorder(failures=2)
+        queue = WebhookEventQueue(apply, max_size=100, batch_size=3, max_attempts=3, retry_delay=0)
+
+        queue.offer([1, 2, 3])
+        await queue.stop()
+
+        assert apply.batches == [[1, 2, 3]] * 3
+
+    @pytest.mark.asyncio
+    async def test_batch_that_keeps_failing_is_split(self):
+        apply = Recorder(poison=3)
+        queue = WebhookEventQueue(apply, max_size=100, batch_size=4, max_attempts=1, retry_delay=0)
+
+        queue.offer([1, 2, 3, 4])
+        await queue.stop()
+
+        assert apply.batches == [[1, 2, 3, 4], [1, 2], [3, 4], [3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_batch_being_retried(self):
+        apply = Recorder(failures=1, delay=0.01)
+        queue = WebhookEventQueue(apply, max_size=100, batch_size=2, batch_wait=0, retry_delay=0.02)
+        queue.start()
+
+        queue.offer([1, 2])
+        await asyncio.sleep(0.005)
+        await queue.stop()
+
+        assert apply.batches == [[1, 2], [1, 2]]
+
+    def test_from_environment(self, monkeypatch):
+        monkeypatch.setenv("WEBHOOK_QUEUE_SIZE", "50")
+        monkeypatch.setenv("WEBHOOK_BATCH_SIZE", "10")
+        monkeypatch.setenv("WEBHOOK_BATCH_WAIT_MS", "200")
+        monkeypatch.setenv("WEBHOOK_APPLY_ATTEMPTS", "5")
+        monkeypatch.setenv("WEBHOOK_RETRY_DELAY_MS", "250")
+
+        queue = create_webhook_event_queue(Recorder())
+
+        assert (queue.max_size, queue.batch_size, queue.batch_wait) == (50, 10, 0.2)
+        assert (queue.max_attempts, queue.retry_delay) == (5, 0.25)
@@ -1,10 +1,12 @@
 import pytest
+from datetime import date
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import HTTPException
-from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentDailyTotal, PaymentStatus
 from tech.interfaces.presenters.payment_presenter import PaymentPresenter
 from tech.interfaces.schemas.payment_schema import PaymentCreate
 from tech.interfaces.controllers.payment_controller import PaymentController
+from tech.use_cases.payments.create_payment_use_case import PaymentCreationResult
 
 
 class TestPaymentController:
@@ -112,4 +114,101 @@ class TestPaymentController:
 
         webhook_handler_use_case_mock.execute.assert_called_once_with(order_id, PaymentStatus.APPROVED)
         assert excinfo.value.status_code == 404
-        assert excinfo.value.detail == "Payment not found"
\ No newline at end of file
+        assert excinfo.value.detail == "Payment not found"
+
+    def test_webhook_payment_invalid_transition(self, controller, webhook_handler_use_case_mock):
+        webhook_handler_use_case_mock.execute.side_effect = InvalidStatusTransition(
+            "Cannot change payment status from REJECTED to APPROVED"
+        )
+
+        with pytest.raises(HTTPException) as excinfo:
+            controller.webhook_payment(123, "APPROVED")
+
+        assert excinfo.value.status_code == 409
+
+    def test_get_payment_statuses(self, controller, get_payment_status_use_case_mock):
+        get_payment_status_use_case_mock.execute_many.return_value = {
+            1: PaymentStatus.APPROVED,
+            2: PaymentStatus.PENDING,
+        }
+
+        result = controller.get_payment_statuses([1, 2, 3, 3])
+
+        get_payment_status_use_case_mock.execute_many.assert_called_once_with([1, 2, 3, 3])
+        assert result == {
+            "payments": [
+                {"order_id": 1, "status": "APPROVED"},
+                {"order_id": 2, "status": "PENDING"},
+            ],
+            "not_found": [3]
+        }
+
+    @pytest.mark.asyncio
+    async def test_create_payments(self, controller, create_payment_use_case_mock):
+        create_payment_use_case_mock.execute_many = AsyncMock(return_value=[
+            PaymentCreationResult(1, payment=Payment(order_id=1, amount=10.0, status=PaymentStatus.PENDING)),
+            PaymentCreationResult(2, error="Payment already exists for this order"),
+        ])
+
+        result = await controller.create_payments([1, 2])
+
+        create_payment_use_case_mock.execute_many.assert_awaited_once_with([1, 2])
+        assert result["results"][1] == {"order_id": 2, "error": "Payment already exists for this order"}
+
+    @pytest.mark.asyncio
+    async def test_list_payments(self, create_payment_use_case_mock, get_payment_status_use_case_mock,
+                                 webhook_handler_use_case_mock):
+        list_payments_use_case = Mock()
+        list_payments_use_case.execute = AsyncMock(return_value=Mock(
+            payments=[Payment(order_id=1, amount=5.0, status=PaymentStatus.APPROVED)], next_cursor=1
+        ))
+        controller = PaymentController(
+            create_payment_use_case_mock,
+            get_payment_status_use_case_mock,
+            webhook_handler_use_case_mock,
+            list_payments_use_case
+        )
+
+        result = await controller.list_payments(statuses=["APPROVED"], cursor=0, limit=1)
+
+        assert result["next_cursor"] == 1
+        assert result["payments"][0]["status"] == "APPROVED"
+        assert list_payments_use_case.execute.await_args.kwargs["statuses"] == [PaymentStatus.APPROVED]
+
+    @pytest.mark.asyncio
+    async def test_list_payments_invalid_status(self, controller):
+        with pytest.raises(HTTPException) as exc_info:
+            await controller.list_payments(statuses=["UNKNOWN"])
+
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_get_payment_totals(self, create_payment_use_case_mock, get_payment_status_use_case_mock,
+                                      webhook_handler_use_case_mock):
+        get_payment_totals_use_case = Mock()
+        get_payment_totals_use_case.execute = AsyncMock(return_value=[
+            PaymentDailyTotal(day=date(2026, 10, 17), status=PaymentStatus.APPROVED, count=2, amount=15.5)
+        ])
+        controller = PaymentController(
+            create_payment_use_case_mock,
+            get_payment_status_use_case_mock,
+            webhook_handler_use_case_mock,
+            get_payment_totals_use_case=get_payment_totals_use_case
+        )
+
+        result = await controller.get_payment_totals(day_from=date(2026, 10, 1), statuses=["APPROVED"])
+
+        assert result == {"totals": [{"day": "2026-10-17", "status": "APPROVED", "count": 2, "amount": 15.5}]}
+        assert get_payment_totals_use_case.execute.await_args.kwargs["statuses"] == [PaymentStatus.APPROVED]
+
+    @pytest.mark.asyncio
+    async def test_get_payment_totals_invalid_window(self, controller):
+        controller.get_payment_totals_use_case = Mock()
+        controller.get_payment_totals_use_case.execute = AsyncMock(
+            side_effect=ValueError("day_to must not be before day_from")
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await controller.get_payment_totals(day_from=date(2026, 10, 2), day_to=date(2026, 10, 1))
+
+        assert exc_info.value.status_code == 400
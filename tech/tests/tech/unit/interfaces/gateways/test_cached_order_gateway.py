@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from tech.infra.ttl_cache import TTLCache
+from tech.interfaces.gateways.cached_order_gateway import CachedOrderGateway, create_order_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachedOrderGateway:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def inner(self):
+        gateway = AsyncMock()
+        gateway.get_order.side_effect = lambda order_id: {"id": order_id, "total_price": 100.0}
+        return gateway
+
+    @pytest.fixture
+    def gateway(self, inner, clock):
+        return CachedOrderGateway(inner, TTLCache(max_size=10, ttl=30, stale_ttl=300, clock=clock))
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_skip_the_orders_service(self, gateway, inner):
+        first = await gateway.get_order(1)
+        second = await gateway.get_order(1)
+
+        assert first == second == {"id": 1, "total_price": 100.0}
+        inner.get_order.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self, gateway):
+        order = await gateway.get_order(1)
+        order["total_price"] = 0
+
+        assert (await gateway.get_order(1))["total_price"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_revalidating(self, gateway, inner, clock):
+        await gateway.get_order(1)
+        inner.get_order.side_effect = lambda order_id: {"id": order_id, "total_price": 200.0}
+        clock.now = 60
+
+        stale = await gateway.get_order(1)
+        await gateway.get_order(1)
+
+        assert stale["total_price"] == 100.0
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert inner.get_order.await_count == 2
+        assert (await gateway.get_order(1))["total_price"] == 200.0
+
+    @pytest.mark.asyncio
+    async def test_failed_revalidation_keeps_stale_entry(self, gateway, inner, clock):
+        await gateway.get_order(1)
+        inner.get_order.side_effect = ValueError("Failed to communicate with orders service")
+        clock.now = 60
+
+        assert (await gateway.get_order(1))["total_price"] == 100.0
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert (await gateway.get_order(1))["total_price"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_fetched_again(self, gateway, inner, clock):
+        await gateway.get_order(1)
+        clock.now = 1000
+
+        await gateway.get_order(1)
+
+        assert inner.get_order.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, gateway, inner):
+        inner.get_order.side_effect = ValueError("Order with ID 1 not found")
+
+        with pytest.raises(ValueError):
+            await gateway.get_order(1)
+
+        assert len(gateway.cache) == 0
+
+
+class TestCreateOrderCache:
+    def test_disabled_with_zero_size(self, monkeypatch):
+        monkeypatch.setenv("ORDER_CACHE_SIZE", "0")
+
+        assert create_order_cache() is None
+
+    def test_from_environment(self, monkeypatch):
+        monkeypatch.setenv("ORDER_CACHE_SIZE", "5")
+        monkeypatch.setenv("ORDER_CACHE_TTL", "10")
+        monkeypatch.setenv("ORDER_CACHE_STALE_TTL", "20")
+
+        cache = create_order_cache()
+
+        assert (cache.max_size, cache.ttl, cache.stale_ttl) == (5, 10.0, 20.0)
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 import httpx
@@ -120,4 +121,59 @@ class TestHttpOrderGateway:
             with pytest.raises(ValueError, match="Failed to communicate with orders service"):
                 await gateway.get_order(order_id)
 
-            mock_client.get.assert_awaited_once()
\ No newline at end of file
+            mock_client.get.assert_awaited_once()
+    @pytest.mark.asyncio
+    async def test_get_order_reuses_injected_client(self):
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": 123, "total_price": 100.0}
+        shared_client = AsyncMock()
+        shared_client.get.return_value = mock_response
+        gateway = HttpOrderGateway(base_url="http://test-api.com", client=shared_client)
+
+        with patch('httpx.AsyncClient') as client_class:
+            await gateway.get_order(123)
+            await gateway.get_order(123)
+
+            client_class.assert_not_called()
+
+        assert shared_client.get.await_count == 2
+        shared_client.aclose.assert_not_called()
+        shared_client.__aexit__.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_order_with_injected_client_not_found(self):
+        mock_response = Mock()
+        mock_response.status_code = 404
+        shared_client = AsyncMock()
+        shared_client.get.return_value = mock_response
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "Not Found", request=Mock(), response=mock_response
+        )
+        gateway = HttpOrderGateway(base_url="http://test-api.com", client=shared_client)
+
+        with pytest.raises(ValueError, match="Order with ID 999 not found"):
+            await gateway.get_order(999)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_request(self):
+        release = asyncio.Event()
+        mock_response = Mock()
+        mock_response.json.return_value = {"id": 123, "total_price": 100.0}
+
+        async def slow_get(*args, **kwargs):
+            await release.wait()
+            return mock_response
+
+        shared_client = AsyncMock()
+        shared_client.get.side_effect = slow_get
+        gateway = HttpOrderGateway(base_url="http://test-api.com", client=shared_client)
+
+        lookups = [asyncio.ensure_future(gateway.get_order(123)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        orders = await asyncio.gather(*lookups)
+
+        assert shared_client.get.await_count == 1
+        assert all(order == {"id": 123, "total_price": 100.0} for order in orders)
+        orders[0]["total_price"] = 0
+        assert orders[1]["total_price"] == 100.0
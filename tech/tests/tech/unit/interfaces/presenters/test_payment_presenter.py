@@ -1,5 +1,7 @@
 import pytest
 from tech.interfaces.presenters.payment_presenter import PaymentPresenter
+from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.use_cases.payments.create_payment_use_case import PaymentCreationResult
 
 
 class TestPaymentPresenter:
@@ -23,4 +25,27 @@ class TestPaymentPresenter:
         assert result == {
             "order_id": order_id,
             "status": status
-        }
\ No newline at end of file
+        }
+    def test_present_payment_statuses(self):
+        result = PaymentPresenter.present_payment_statuses({1: "APPROVED", 2: "PENDING"}, [3])
+
+        assert result == {
+            "payments": [
+                {"order_id": 1, "status": "APPROVED"},
+                {"order_id": 2, "status": "PENDING"},
+            ],
+            "not_found": [3]
+        }
+
+    def test_present_payment_creations(self):
+        results = [
+            PaymentCreationResult(1, payment=Payment(order_id=1, amount=10.0, status=PaymentStatus.PENDING)),
+            PaymentCreationResult(2, error="Order with ID 2 not found"),
+        ]
+
+        assert PaymentPresenter.present_payment_creations(results) == {
+            "results": [
+                {"order_id": 1, "status": "PENDING"},
+                {"order_id": 2, "error": "Order with ID 2 not found"},
+            ]
+        }
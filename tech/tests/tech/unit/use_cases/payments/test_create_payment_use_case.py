@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
-from tech.interfaces.repositories.payment_repository import PaymentRepository
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
 from tech.interfaces.gateways.http_order_gateway import HttpOrderGateway
 from tech.domain.entities.payments import Payment, PaymentStatus
 from tech.interfaces.schemas.payment_schema import PaymentCreate
@@ -10,7 +11,9 @@ from tech.use_cases.payments.create_payment_use_case import CreatePaymentUseCase
 class TestCreatePaymentUseCase:
     @pytest.fixture
     def payment_repository_mock(self):
-        return Mock(spec=PaymentRepository)
+        repository = Mock(spec=AsyncPaymentRepository)
+        repository.get_by_order_ids.return_value = []
+        return repository
 
     @pytest.fixture
     def order_gateway_mock(self):
@@ -35,7 +38,7 @@ class TestCreatePaymentUseCase:
         payment_mock.amount = 100.0
         payment_mock.status = PaymentStatus.PENDING
 
-        payment_repository_mock.add.return_value = payment_mock
+        payment_repository_mock.add_or_get.return_value = (payment_mock, True)
 
         with patch('tech.use_cases.payments.create_payment_use_case.Payment') as mock_payment_class:
             mock_payment_class.return_value = payment_mock
@@ -50,7 +53,8 @@ class TestCreatePaymentUseCase:
                 status=PaymentStatus.PENDING
             )
 
-            payment_repository_mock.add.assert_called_once_with(payment_mock)
+            payment_repository_mock.get_by_order_ids.assert_awaited_once_with([123])
+            payment_repository_mock.add_or_get.assert_awaited_once_with(payment_mock)
             assert result == payment_mock
 
     @pytest.mark.asyncio
@@ -83,11 +87,95 @@ class TestCreatePaymentUseCase:
         order_gateway_mock.get_order = AsyncMock(return_value=order_mock)
 
         payment_mock = Mock(spec=Payment)
-        payment_repository_mock.add.side_effect = Exception("Database error")
+        payment_repository_mock.add_or_get.side_effect = Exception("Database error")
 
         with patch('tech.use_cases.payments.create_payment_use_case.Payment', return_value=payment_mock):
             with pytest.raises(ValueError, match="Failed to create payment: Database error"):
                 await use_case.execute(payment_data)
 
                 order_gateway_mock.get_order.assert_called_once_with(123)
-                payment_repository_mock.add.assert_called_once_with(payment_mock)
\ No newline at end of file
+                payment_repository_mock.add_or_get.assert_awaited_once_with(payment_mock)
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_existing_payment_without_calling_orders(
+            self, use_case, payment_repository_mock, order_gateway_mock
+    ):
+        existing = Payment(order_id=123, amount=100.0, status=PaymentStatus.APPROVED)
+        payment_repository_mock.get_by_order_ids.return_value = [existing]
+        order_gateway_mock.get_order = AsyncMock()
+
+        result = await use_case.execute(PaymentCreate(order_id=123))
+
+        assert result is existing
+        order_gateway_mock.get_order.assert_not_called()
+        payment_repository_mock.add_or_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_payment_created_concurrently(
+            self, use_case, payment_repository_mock, order_gateway_mock
+    ):
+        order_gateway_mock.get_order = AsyncMock(return_value={"id": 123, "total_price": 100.0})
+        existing = Payment(order_id=123, amount=90.0, status=PaymentStatus.PROCESSING)
+        payment_repository_mock.add_or_get.return_value = (existing, False)
+
+        result = await use_case.execute(PaymentCreate(order_id=123))
+
+        assert result is existing
+
+
+class TestCreatePaymentUseCaseExecuteMany:
+    @pytest.fixture
+    def payment_repository_mock(self):
+        repository = Mock(spec=AsyncPaymentRepository)
+        repository.add_many_if_absent.side_effect = lambda payments: [
+            payment for payment in payments if payment.order_id != 3
+        ]
+        return repository
+
+    @pytest.fixture
+    def order_gateway_mock(self):
+        async def get_order(order_id):
+            if order_id == 2:
+                raise ValueError("Order with ID 2 not found")
+            return {"id": order_id, "total_price": order_id * 10.0}
+
+        gateway = Mock(spec=HttpOrderGateway)
+        gateway.get_order = AsyncMock(side_effect=get_order)
+        return gateway
+
+    @pytest.mark.asyncio
+    async def test_partial_failures_do_not_fail_the_batch(self, payment_repository_mock, order_gateway_mock):
+        use_case = CreatePaymentUseCase(payment_repository_mock, order_gateway_mock)
+
+        results = await use_case.execute_many([1, 2, 3, 1])
+
+        assert [result.order_id for result in results] == [1, 2, 3]
+        assert results[0].payment.amount == 10.0
+        assert results[0].payment.status == PaymentStatus.PENDING
+        assert results[1].error == "Order with ID 2 not found"
+        assert results[2].error == "Payment already exists for this order"
+        inserted = payment_repository_mock.add_many_if_absent.call_args.args[0]
+        assert [payment.order_id for payment in inserted] == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_order_lookups_are_bounded(self, payment_repository_mock):
+        in_flight = 0
+        peak = 0
+
+        async def get_order(order_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {"id": order_id, "total_price": 1.0}
+
+        gateway = Mock(spec=HttpOrderGateway)
+        gateway.get_order = AsyncMock(side_effect=get_order)
+        use_case = CreatePaymentUseCase(payment_repository_mock, gateway, max_concurrency=3)
+
+        await use_case.execute_many(list(range(10, 30)))
+
+        assert gateway.get_order.await_count == 20
+        assert peak == 3
+        payment_repository_mock.add_many_if_absent.assert_called_once()
@@ -33,4 +33,14 @@ class TestGetPaymentStatusUseCase:
         with pytest.raises(ValueError, match="Payment not found for the given order ID."):
             use_case.execute(order_id)
 
-            payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
\ No newline at end of file
+            payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
+    def test_execute_many(self, use_case, payment_repository_mock):
+        payment_repository_mock.get_by_order_ids.return_value = [
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.PENDING),
+            Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED),
+        ]
+
+        result = use_case.execute_many([1, 2, 3, 1])
+
+        payment_repository_mock.get_by_order_ids.assert_called_once_with([1, 2, 3])
+        assert list(result.items()) == [(1, PaymentStatus.APPROVED), (2, PaymentStatus.PENDING)]
@@ -0,0 +1,32 @@
+from datetime import date
+from unittest.mock import Mock
+import pytest
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+from tech.domain.entities.payments import PaymentDailyTotal, PaymentStatus
+from tech.use_cases.payments.get_payment_totals_use_case import GetPaymentTotalsUseCase
+
+
+class TestGetPaymentTotalsUseCase:
+    @pytest.mark.asyncio
+    async def test_reads_the_rollup(self):
+        repository = Mock(spec=AsyncPaymentRepository)
+        totals = [PaymentDailyTotal(day=date(2026, 10, 1), status=PaymentStatus.APPROVED, count=3, amount=30.0)]
+        repository.daily_totals.return_value = totals
+
+        result = await GetPaymentTotalsUseCase(repository).execute(
+            day_from=date(2026, 10, 1), day_to=date(2026, 10, 2), statuses=[PaymentStatus.APPROVED]
+        )
+
+        assert result == totals
+        repository.daily_totals.assert_awaited_once_with(
+            day_from=date(2026, 10, 1), day_to=date(2026, 10, 2), statuses=[PaymentStatus.APPROVED]
+        )
+
+    @pytest.mark.asyncio
+    async def test_rejects_window_ending_before_it_starts(self):
+        repository = Mock(spec=AsyncPaymentRepository)
+
+        with pytest.raises(ValueError):
+            await GetPaymentTotalsUseCase(repository).execute(day_from=date(2026, 10, 2), day_to=date(2026, 10, 1))
+
+        repository.daily_totals.assert_not_awaited()
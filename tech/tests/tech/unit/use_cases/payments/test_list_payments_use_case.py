@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+import pytest
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
+from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.use_cases.payments.list_payments_use_case import ListPaymentsUseCase
+
+
+def payments(*order_ids):
+    return [Payment(order_id=order_id, amount=10.0, status=PaymentStatus.APPROVED) for order_id in order_ids]
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+class TestListPaymentsUseCase:
+    @pytest.mark.asyncio
+    async def test_returns_cursor_when_more_payments_follow(self):
+        repository = Mock(spec=AsyncPaymentRepository)
+        repository.iter_payments.return_value = stream(payments(4, 7, 9))
+
+        page = await ListPaymentsUseCase(repository).execute(statuses=[PaymentStatus.APPROVED], cursor=3, limit=2)
+
+        assert [payment.order_id for payment in page.payments] == [4, 7]
+        assert page.next_cursor == 7
+        repository.iter_payments.assert_called_once_with(
+            statuses=[PaymentStatus.APPROVED],
+            created_from=None,
+            created_to=None,
+            updated_from=None,
+            updated_to=None,
+            after_order_id=3,
+            limit=3,
+        )
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        repository = Mock(spec=AsyncPaymentRepository)
+        repository.iter_payments.return_value = stream(payments(4, 7))
+
+        page = await ListPaymentsUseCase(repository).execute(limit=2)
+
+        assert len(page.payments) == 2
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_time_windows_are_converted_to_naive_utc(self):
+        repository = Mock(spec=AsyncPaymentRepository)
+        repository.iter_payments.return_value = stream([])
+        created_from = datetime(2024, 1, 1, 9, tzinfo=timezone(timedelta(hours=-3)))
+
+        await ListPaymentsUseCase(repository).execute(created_from=created_from, created_to=datetime(2024, 2, 1))
+
+        kwargs = repository.iter_payments.call_args.kwargs
+        assert kwargs["created_from"] == datetime(2024, 1, 1, 12)
+        assert kwargs["created_to"] == datetime(2024, 2, 1)
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import Mock
 from tech.interfaces.repositories.payment_repository import PaymentRepository
-from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentStatus
 from tech.use_cases.payments.update_payment_status_use_case import UpdatePaymentStatusUseCase
 
 
@@ -19,23 +19,31 @@ class TestUpdatePaymentStatusUseCase:
         new_status = PaymentStatus.APPROVED
 
         payment_mock = Mock(spec=Payment)
-        payment_repository_mock.get_by_order_id.return_value = payment_mock
-        payment_repository_mock.update.return_value = payment_mock
+        payment_repository_mock.transition.return_value = payment_mock
 
         result = use_case.execute(order_id, new_status)
 
-        payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
-        assert payment_mock.status == new_status
-        payment_repository_mock.update.assert_called_once_with(payment_mock)
+        payment_repository_mock.transition.assert_called_once_with(order_id, new_status)
+        payment_repository_mock.get_by_order_id.assert_not_called()
         assert result == payment_mock
 
     def test_execute_payment_not_found(self, use_case, payment_repository_mock):
         order_id = 123
         new_status = PaymentStatus.APPROVED
 
+        payment_repository_mock.transition.return_value = None
         payment_repository_mock.get_by_order_id.return_value = None
 
         with pytest.raises(ValueError, match="Payment not found for this order."):
             use_case.execute(order_id, new_status)
 
-            payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
\ No newline at end of file
+        payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
+
+    def test_execute_invalid_transition(self, use_case, payment_repository_mock):
+        payment_repository_mock.transition.return_value = None
+        payment_repository_mock.get_by_order_id.return_value = Payment(
+            order_id=123, amount=10.0, status=PaymentStatus.REFUNDED
+        )
+
+        with pytest.raises(InvalidStatusTransition, match="from REFUNDED to PROCESSING"):
+            use_case.execute(123, PaymentStatus.PROCESSING)
@@ -1,8 +1,9 @@
 import pytest
 from unittest.mock import Mock
+from tech.interfaces.repositories.async_payment_repository import AsyncPaymentRepository
 from tech.interfaces.repositories.payment_repository import PaymentRepository
-from tech.domain.entities.payments import Payment, PaymentStatus
-from tech.use_cases.payments.webhook_payment_use_case import WebhookHandlerUseCase
+from tech.domain.entities.payments import InvalidStatusTransition, Payment, PaymentStatus
+from tech.use_cases.payments.webhook_payment_use_case import WebhookBatchHandlerUseCase, WebhookHandlerUseCase
 
 
 class TestWebhookHandlerUseCase:
@@ -19,14 +20,13 @@ class TestWebhookHandlerUseCase:
         payment_status = PaymentStatus.APPROVED
 
         payment_mock = Mock(spec=Payment)
-        payment_repository_mock.get_by_order_id.return_value = payment_mock
-        payment_repository_mock.update.return_value = payment_mock
+        payment_repository_mock.transition.return_value = payment_mock
 
         result = use_case.execute(order_id, payment_status)
 
-        payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
-        assert payment_mock.status == payment_status
-        payment_repository_mock.update.assert_called_once_with(payment_mock)
+        payment_repository_mock.transition.assert_called_once_with(order_id, payment_status)
+        payment_repository_mock.get_by_order_id.assert_not_called()
+        payment_repository_mock.update.assert_not_called()
         assert result == payment_mock
 
     def test_execute_with_status_string(self, use_case, payment_repository_mock):
@@ -34,14 +34,11 @@ class TestWebhookHandlerUseCase:
         payment_status = "APPROVED"
 
         payment_mock = Mock(spec=Payment)
-        payment_repository_mock.get_by_order_id.return_value = payment_mock
-        payment_repository_mock.update.return_value = payment_mock
+        payment_repository_mock.transition.return_value = payment_mock
 
         result = use_case.execute(order_id, payment_status)
 
-        payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
-        assert payment_mock.status == PaymentStatus.APPROVED
-        payment_repository_mock.update.assert_called_once_with(payment_mock)
+        payment_repository_mock.transition.assert_called_once_with(order_id, PaymentStatus.APPROVED)
         assert result == payment_mock
 
     def test_execute_with_invalid_status(self, use_case):
@@ -55,9 +52,55 @@ class TestWebhookHandlerUseCase:
         order_id = 123
         payment_status = PaymentStatus.APPROVED
 
+        payment_repository_mock.transition.return_value = None
         payment_repository_mock.get_by_order_id.return_value = None
 
         with pytest.raises(ValueError, match="Payment not found for this order."):
             use_case.execute(order_id, payment_status)
 
-            payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
\ No newline at end of file
+        payment_repository_mock.get_by_order_id.assert_called_once_with(order_id)
+
+    def test_execute_invalid_transition(self, use_case, payment_repository_mock):
+        payment_repository_mock.transition.return_value = None
+        payment_repository_mock.get_by_order_id.return_value = Payment(
+            order_id=123, amount=10.0, status=PaymentStatus.REJECTED
+        )
+
+        with pytest.raises(InvalidStatusTransition, match="from REJECTED to APPROVED"):
+            use_case.execute(123, PaymentStatus.APPROVED)
+
+
+class TestWebhookBatchHandlerUseCase:
+    @pytest.fixture
+    def payment_repository_mock(self):
+        return Mock(spec=AsyncPaymentRepository)
+
+    @pytest.fixture
+    def use_case(self, payment_repository_mock):
+        return WebhookBatchHandlerUseCase(payment_repository=payment_repository_mock)
+
+    @pytest.mark.asyncio
+    async def test_applies_last_event_per_order(self, use_case, payment_repository_mock):
+        payment_repository_mock.update_many.side_effect = lambda payments: list(payments)
+        payments = await use_case.execute([
+            (1, PaymentStatus.APPROVED),
+            (2, PaymentStatus.REJECTED),
+            (1, PaymentStatus.REFUNDED),
+        ])
+
+        written = payment_repository_mock.update_many.await_args.args[0]
+        assert [(payment.order_id, payment.status) for payment in written] == [
+            (1, PaymentStatus.REFUNDED),
+            (2, PaymentStatus.REJECTED),
+        ]
+        assert payments == written
+
+    @pytest.mark.asyncio
+    async def test_returns_only_changed_payments(self, use_case, payment_repository_mock):
+        changed = Payment(order_id=2, amount=20.0, status=PaymentStatus.REJECTED)
+        payment_repository_mock.update_many.return_value = [changed]
+
+        payments = await use_case.execute([(1, PaymentStatus.PENDING), (2, PaymentStatus.REJECTED)])
+
+        payment_repository_mock.update_many.assert_awaited_once()
+        assert payments == [changed]
@@ -0,0 +1,76 @@
+import gzip
+from datetime import date
+from unittest.mock import MagicMock, patch
+from tech.workers.archive_payments import archive_expired_partitions, archive_partition, export_partition
+
+
+def driver_connection(chunks):
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.copy.return_value.__enter__.return_value = iter(chunks)
+    return connection, cursor
+
+
+class TestArchivePayments:
+    def test_export_streams_copy_into_gzip(self, tmp_path):
+        connection, cursor = driver_connection([b"id,order_id\n", b"1,10\n", b"2,11\n"])
+
+        path = export_partition(connection, "payments_y2025m01", str(tmp_path))
+
+        assert path == str(tmp_path / "payments_y2025m01.csv.gz")
+        assert cursor.copy.call_args.args[0] == "COPY payments_y2025m01 TO STDOUT (FORMAT csv, HEADER)"
+        with gzip.open(path, "rb") as archive:
+            assert archive.read() == b"id,order_id\n1,10\n2,11\n"
+        assert not (tmp_path / "payments_y2025m01.csv.gz.partial").exists()
+
+    def test_archive_partition_detaches_exports_and_drops(self, tmp_path):
+        connection = MagicMock()
+        connection.connection.driver_connection = driver_connection([b"id\n"])[0]
+
+        archive_partition(connection, "payments_y2025m01", str(tmp_path))
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements == [
+            "ALTER TABLE payments DETACH PARTITION payments_y2025m01 CONCURRENTLY",
+            "DROP TABLE payments_y2025m01",
+        ]
+
+    def test_archive_partition_finalizes_an_interrupted_detach(self, tmp_path):
+        connection = MagicMock()
+        connection.connection.driver_connection = driver_connection([b"id\n"])[0]
+
+        archive_partition(connection, "payments_y2025m01", str(tmp_path), detach_pending=True)
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements == [
+            "ALTER TABLE payments DETACH PARTITION payments_y2025m01 FINALIZE",
+            "DROP TABLE payments_y2025m01",
+        ]
+
+    def test_failed_export_keeps_the_table(self, tmp_path):
+        connection = MagicMock()
+        connection.connection.driver_connection.cursor.side_effect = OSError("disk full")
+
+        try:
+            archive_partition(connection, "payments_y2025m01", str(tmp_path), attached=False)
+        except OSError:
+            pass
+
+        connection.execute.assert_not_called()
+
+    def test_archives_detached_leftovers_and_expired_partitions(self):
+        engine = MagicMock()
+        with patch('tech.workers.archive_payments.ensure_partitions') as ensure, \
+                patch('tech.workers.archive_payments.list_detached_partitions', return_value=["payments_y2025m01"]), \
+                patch('tech.workers.archive_payments.list_pending_detach_partitions',
+                      return_value=["payments_y2025m03"]), \
+                patch('tech.workers.archive_payments.list_partitions',
+                      return_value=["payments_legacy", "payments_y2025m02", "payments_y2026m10"]), \
+                patch('tech.workers.archive_payments.archive_partition', side_effect=lambda c, name, d, **kw: name) as archive:
+            archived = archive_expired_partitions(engine, "/archive", 12, 3, today=date(2026, 10, 17))
+
+        ensure.assert_called_once()
+        assert archived == ["payments_y2025m01", "payments_y2025m03", "payments_y2025m02"]
+        assert archive.call_args_list[0].kwargs == {"attached": False}
+        assert archive.call_args_list[1].kwargs == {"detach_pending": True}
+        assert archive.call_args_list[2].kwargs == {}
@@ -7,8 +7,10 @@ import logging
 import asyncio
 import pika
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from tech.domain.entities.payments import Payment, PaymentStatus
+from tech.infra.asyncio_rabbitmq_broker import AsyncioRabbitMQBroker
+from tests.tech.unit.infra.amqp_stand_in import StandInAMQPServer, settle
 
 
 class TestRunPaymentRequestWorker:
@@ -26,6 +28,7 @@ class TestRunPaymentRequestWorker:
     def mock_processor(self):
         processor = Mock()
         processor.process = AsyncMock()
+        processor.process_batch = AsyncMock()
         return processor
 
     @pytest.fixture
@@ -114,7 +117,7 @@ class TestRunPaymentRequestWorker:
                 amount=100.0,
                 status=PaymentStatus.PROCESSING
             )
-            mock_repository.add.return_value = payment
+            mock_repository.add_if_absent.return_value = payment
 
             processor = SimplePaymentProcessor(mock_repository, mock_broker)
             processor.provider = mock_provider
@@ -122,7 +125,7 @@ class TestRunPaymentRequestWorker:
 
             result = await processor.process(payment_request)
 
-            mock_repository.add.assert_called_once()
+            mock_repository.add_if_absent.assert_called_once()
             mock_provider.process_payment.assert_awaited_once()
             assert payment.status == PaymentStatus.ERROR
             assert payment.error_message == "Provider error"
@@ -148,7 +151,7 @@ class TestRunPaymentRequestWorker:
                 amount=100.0,
                 status=PaymentStatus.PROCESSING
             )
-            mock_repository.add.return_value = payment
+            mock_repository.add_if_absent.return_value = payment
 
             processor = SimplePaymentProcessor(mock_repository, mock_broker)
             processor.provider = mock_provider
@@ -156,7 +159,7 @@ class TestRunPaymentRequestWorker:
 
             result = await processor.process(payment_request)
 
-            mock_repository.add.assert_called_once()
+            mock_repository.add_if_absent.assert_called_once()
             mock_provider.process_payment.assert_awaited_once()
             assert payment.status == PaymentStatus.APPROVED
             assert "emergency_" in payment.transaction_id
@@ -207,29 +210,32 @@ class TestRunPaymentRequestWorker:
     @pytest.mark.asyncio
     async def test_process_message(self, payment_request, mock_processor):
         session_mock = Mock()
-        session_gen_mock = Mock()
-        session_gen_mock.__next__ = Mock(return_value=session_mock)
+        session_factory = Mock(return_value=session_mock)
+        broker_mock = Mock()
+        provider_mock = Mock()
 
-        with patch('tech.workers.run_payment_request_worker.get_session', return_value=session_gen_mock), \
-                patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository') as mock_repo_class, \
-                patch('tech.workers.run_payment_request_worker.create_async_rabbitmq_broker') as mock_broker_fn, \
+        with patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository') as mock_repo_class, \
                 patch('tech.workers.run_payment_request_worker.SimplePaymentProcessor') as mock_processor_class, \
                 patch('tech.workers.run_payment_request_worker.logger'):
             repository_mock = Mock()
-            broker_mock = Mock()
 
             mock_repo_class.return_value = repository_mock
-            mock_broker_fn.return_value = broker_mock
             mock_processor_class.return_value = mock_processor
 
-            from tech.workers.run_payment_request_worker import process_message
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
 
-            await process_message(payment_request)
+            runtime = PaymentWorkerRuntime(
+                session_factory=session_factory,
+                broker=broker_mock,
+                provider=provider_mock
+            )
+            await runtime.process_message(payment_request)
 
-            session_gen_mock.__next__.assert_called_once()
+            session_factory.assert_called_once()
             mock_repo_class.assert_called_once_with(session_mock)
-            mock_broker_fn.assert_called_once()
-            mock_processor_class.assert_called_once_with(repository_mock, broker_mock)
+            mock_processor_class.assert_called_once_with(
+                repository_mock, broker_mock, provider=provider_mock, completed_orders=runtime.completed_orders
+            )
 
             mock_processor.process.assert_awaited_once_with(payment_request)
             session_mock.close.assert_called_once()
@@ -237,87 +243,707 @@ class TestRunPaymentRequestWorker:
     @pytest.mark.asyncio
     async def test_process_message_exception(self, payment_request):
         session_mock = Mock()
-        session_gen_mock = Mock()
-        session_gen_mock.__next__ = Mock(return_value=session_mock)
+        session_factory = Mock(return_value=session_mock)
 
-        with patch('tech.workers.run_payment_request_worker.get_session', return_value=session_gen_mock), \
-                patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository',
-                      side_effect=Exception("Repo error")), \
+        with patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository',
+                   side_effect=Exception("Repo error")), \
                 patch('tech.workers.run_payment_request_worker.logger') as mock_logger:
-            from tech.workers.run_payment_request_worker import process_message
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
 
-            await process_message(payment_request)
+            runtime = PaymentWorkerRuntime(session_factory=session_factory, broker=Mock(), provider=Mock())
+            await runtime.process_message(payment_request)
 
-            session_gen_mock.__next__.assert_called_once()
+            session_factory.assert_called_once()
             mock_logger.error.assert_called()
             session_mock.close.assert_called_once()
 
+    @pytest.fixture
+    def amqp_server(self):
+        return StandInAMQPServer()
 
-    def test_callback_json_error(self):
-        ch = Mock()
-        method = Mock()
-        method.delivery_tag = "tag123"
-        properties = Mock()
-        body = b"invalid json"
+    @pytest.fixture
+    def stand_in_broker(self, amqp_server):
+        return AsyncioRabbitMQBroker(
+            host="localhost",
+            port=5672,
+            user="guest",
+            password="password",
+            connection_factory=amqp_server.connection_factory
+        )
+
+    @staticmethod
+    async def _wait_for(condition, timeout=2.0):
+        for _ in range(int(timeout / 0.01)):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("condition not met in time")
 
-        with patch('tech.workers.run_payment_request_worker.logger') as mock_logger:
-            from tech.workers.run_payment_request_worker import callback
+    @pytest.mark.asyncio
+    async def test_runtime_reuses_resources_across_messages(self, payment_request, mock_processor,
+                                                            amqp_server, stand_in_broker):
+        with patch('tech.workers.run_payment_request_worker.MockPaymentProvider') as mock_provider_class, \
+                patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository'), \
+                patch('tech.workers.run_payment_request_worker.SimplePaymentProcessor',
+                      return_value=mock_processor) as mock_processor_class, \
+                patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
 
-            callback(ch, method, properties, body)
+            session_factory = Mock()
+            runtime = PaymentWorkerRuntime(session_factory=session_factory, broker=stand_in_broker)
+            run_task = asyncio.ensure_future(runtime.run())
 
-            mock_logger.error.assert_called()
-            ch.basic_ack.assert_called_once_with(delivery_tag="tag123")
+            for order_id in (1, 2, 3):
+                await stand_in_broker.publish_async("payment_requests", dict(payment_request, order_id=order_id))
 
-    def test_callback_exception(self, payment_request):
-        ch = Mock()
-        method = Mock()
-        method.delivery_tag = "tag123"
-        properties = Mock()
-        body = json.dumps(payment_request).encode()
+            await self._wait_for(lambda: len(amqp_server.acked) == 3)
 
-        with patch('tech.workers.run_payment_request_worker.asyncio.run',
-                   side_effect=Exception("Process error")), \
-                patch('tech.workers.run_payment_request_worker.logger') as mock_logger:
-            from tech.workers.run_payment_request_worker import callback
+            assert len(amqp_server.connections) == 1
+            assert "payment_responses" in amqp_server.declared
+            mock_provider_class.assert_called_once()
+            assert mock_processor.process_batch.await_count == 3
+            assert session_factory.call_count == 3
+            for call in mock_processor_class.call_args_list:
+                assert call.args[1] is stand_in_broker
+                assert call.kwargs['provider'] is mock_provider_class.return_value
+
+            await stand_in_broker.close_async()
+            await run_task
+            assert not stand_in_broker.is_open
+
+    @staticmethod
+    def _batch_repository():
+        repository = Mock()
+        repository.add_many_if_absent.side_effect = lambda payments: payments
+        repository.update_many.side_effect = lambda payments: list(payments)
+        return repository
 
-            callback(ch, method, properties, body)
+    @pytest.mark.asyncio
+    async def test_runtime_writes_and_acks_batches(self, payment_request, amqp_server, stand_in_broker):
+        repository = self._batch_repository()
+        provider = Mock()
+        provider.process_payment = AsyncMock(return_value={"status": "APPROVED", "transaction_id": "tx"})
 
-            mock_logger.error.assert_called()
-            ch.basic_nack.assert_called_once_with(delivery_tag="tag123", requeue=True)
+        with patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository',
+                   return_value=repository), \
+                patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            await stand_in_broker.connect()
+            for order_id in range(4):
+                stand_in_broker.publish("payment_requests", dict(payment_request, order_id=order_id))
+
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(),
+                broker=stand_in_broker,
+                provider=provider,
+                concurrency=4,
+                batch_size=4,
+                batch_wait=0.5
+            )
+            run_task = asyncio.ensure_future(runtime.run())
+
+            await self._wait_for(lambda: len(amqp_server.acked) == 4)
+
+            repository.add_many_if_absent.assert_called_once()
+            assert len(repository.add_many_if_absent.call_args.args[0]) == 4
+            repository.update_many.assert_called_once()
+            assert {p.status for p in repository.update_many.call_args.args[0]} == {PaymentStatus.APPROVED}
+            assert len(amqp_server.messages("payment_responses")) == 4
+            assert amqp_server.ack_frames == [(4, True)]
+
+            await stand_in_broker.close_async()
+            await run_task
+
+    @pytest.mark.asyncio
+    async def test_runtime_limits_concurrent_provider_calls(self, payment_request, amqp_server, stand_in_broker):
+        active = 0
+        max_active = 0
+
+        async def slow_payment(order_id, amount, payment_method):
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return {"status": "APPROVED", "transaction_id": f"tx_{order_id}"}
+
+        provider = Mock()
+        provider.process_payment = slow_payment
+
+        with patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository',
+                   return_value=self._batch_repository()), \
+                patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(),
+                broker=stand_in_broker,
+                provider=provider,
+                concurrency=2,
+                prefetch=4,
+                batch_size=3
+            )
+            run_task = asyncio.ensure_future(runtime.run())
+
+            for order_id in range(6):
+                await stand_in_broker.publish_async("payment_requests", dict(payment_request, order_id=order_id))
+
+            await self._wait_for(lambda: len(amqp_server.acked) == 6)
+
+            assert max_active == 2
+            assert stand_in_broker.channel.prefetch_count == 4
+
+            run_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await run_task
+            assert not stand_in_broker.is_open
+
+    @pytest.mark.asyncio
+    async def test_process_batch_falls_back_to_single_messages_when_insert_fails(self, payment_request):
+        repository = Mock()
+        repository.add_many_if_absent.side_effect = Exception("null value in column \"amount\"")
+        session_mock = Mock()
+
+        with patch('tech.workers.run_payment_request_worker.SQLAlchemyPaymentRepository',
+                   return_value=repository), \
+                patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(return_value=session_mock), broker=Mock(), provider=Mock()
+            )
+            runtime.process_message = AsyncMock()
+            runtime.process_message.side_effect = [True, False]
+            messages = [dict(payment_request, order_id=1), dict(payment_request, order_id=2)]
+
+
+            failed = await runtime.process_batch(messages)
+
+            assert failed == [1]
+            assert runtime.process_message.await_count == 2
+            repository.update_many.assert_not_called()
+            session_mock.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_scheduled_for_retry(self, payment_request, amqp_server, stand_in_broker):
+        from tech.infra.retry_queues import RetryQueues
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(),
+                broker=stand_in_broker,
+                provider=Mock(),
+                retry_queues=RetryQueues("payment_requests", max_retries=2, base_delay_ms=100)
+            )
+            runtime.process_batch = AsyncMock(side_effect=Exception("db down"))
+            run_task = asyncio.ensure_future(runtime.run())
+
+            await stand_in_broker.publish_async("payment_requests", dict(payment_request, order_id=1))
+            await stand_in_broker.publish_async(
+                "payment_requests", dict(payment_request, order_id=2), headers={"x-attempt": 2}
+            )
+            await self._wait_for(lambda: len(amqp_server.acked) == 2)
+
+            assert amqp_server.declared["payment_requests.retry.2"]["x-message-ttl"] == 200
+            [(body, properties, _)] = amqp_server.messages("payment_requests.retry.1")
+            assert json.loads(body)["order_id"] == 1
+            assert properties.headers == {"x-attempt": 1, "x-last-error": "db down"}
+            [(body, properties, _)] = amqp_server.messages("payment_requests.dlq")
+            assert json.loads(body)["order_id"] == 2
+            assert properties.headers["x-attempt"] == 3
+            assert amqp_server.nacked == []
+
+            await stand_in_broker.close_async()
+            await run_task
+
+    @pytest.mark.asyncio
+    async def test_handle_batch_retries_only_failed_messages(self):
+        from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+        retry_queues = Mock()
+        retry_queues.reject = AsyncMock()
+        runtime = PaymentWorkerRuntime(
+            session_factory=Mock(), broker=Mock(), provider=Mock(), retry_queues=retry_queues
+        )
+        runtime.process_batch = AsyncMock(return_value=[1])
+        batch = Mock(messages=[{"order_id": 1}, {"order_id": 2}], headers=[{}, {"x-attempt": 1}])
+
+        await runtime.handle_batch(batch)
+
+        retry_queues.reject.assert_awaited_once_with(
+            runtime.broker, [{"order_id": 2}], [{"x-attempt": 1}], "Payment request processing failed"
+        )
+        batch.ack.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_handle_batch_requeues_when_retry_cannot_be_scheduled(self):
+        from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+        retry_queues = Mock()
+        retry_queues.reject = AsyncMock(side_effect=Exception("broker down"))
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(), broker=Mock(), provider=Mock(), retry_queues=retry_queues
+            )
+            runtime.process_batch = AsyncMock(side_effect=Exception("db down"))
+            batch = Mock(messages=[{"order_id": 1}], headers=[{}])
+
+            await runtime.handle_batch(batch)
+
+            batch.nack.assert_called_once_with(requeue=True)
+            batch.ack.assert_not_called()
+
+    def test_completed_order_cache_evicts_least_recently_used(self):
+        from tech.workers.run_payment_request_worker import CompletedOrderCache
+
+        cache = CompletedOrderCache(max_size=2)
+        cache.put(1, {"order_id": 1})
+        cache.put(2, {"order_id": 2})
+        cache.get(1)
+        cache.put(3, {"order_id": 3})
+
+        assert cache.get(2) is None
+        assert cache.get(1) == {"order_id": 1}
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_process_batch_short_circuits_duplicates(self, mock_broker):
+        from tech.workers.run_payment_request_worker import (
+            SimplePaymentProcessor, CompletedOrderCache, PaymentsInProgressError
+        )
+
+        completed_orders = CompletedOrderCache()
+        completed_orders.put(1, {"order_id": 1, "status": "APPROVED", "transaction_id": "tx_1"})
+        repository = Mock()
+        repository.add_many_if_absent.side_effect = lambda payments: [p for p in payments if p.order_id == 4]
+        repository.update_many.side_effect = lambda payments: list(payments)
+        repository.get_by_order_ids.return_value = [
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.APPROVED),
+            Payment(order_id=3, amount=30.0, status=PaymentStatus.PROCESSING),
+        ]
+        repository.claim_stale.return_value = []
+        mock_broker.publish_many = AsyncMock()
+        provider = Mock()
+        provider.process_payment = AsyncMock(return_value={"status": "APPROVED", "transaction_id": "tx_4"})
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(
+                repository, mock_broker, provider=provider, completed_orders=completed_orders
+            )
+            with pytest.raises(PaymentsInProgressError) as error:
+                await processor.process_batch([
+                    {"order_id": 1, "amount": 10.0},
+                    {"order_id": 2, "amount": 20.0},
+                    {"order_id": 3, "amount": 30.0},
+                    {"order_id": 4, "amount": 40.0},
+                    {"order_id": 4, "amount": 40.0},
+                ])
+
+        assert error.value.order_ids == [3]
+        assert [p.order_id for p in error.value.payments] == [4]
+        assert repository.claim_stale.call_args.args[0] == [3]
+        assert [p.order_id for p in repository.add_many_if_absent.call_args.args[0]] == [2, 3, 4]
+        repository.get_by_order_ids.assert_called_once_with([2, 3])
+        provider.process_payment.assert_awaited_once_with(order_id=4, amount=40.0, payment_method="credit_card")
+        published = [c.kwargs["messages"] for c in mock_broker.publish_many.await_args_list]
+        assert published == [
+            [{"order_id": 2, "status": "APPROVED"}],
+            [
+                {"order_id": 1, "status": "APPROVED", "transaction_id": "tx_1"},
+                {"order_id": 4, "status": "APPROVED", "transaction_id": "tx_4"},
+            ],
+        ]
+        assert completed_orders.get(4)["transaction_id"] == "tx_4"
+        assert completed_orders.get(3) is None
+
+    @pytest.mark.asyncio
+    async def test_process_resumes_payment_abandoned_in_processing(self, mock_repository, mock_broker,
+                                                                  payment_request):
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        mock_repository.add_if_absent.return_value = None
+        mock_repository.get_by_order_ids.return_value = [
+            Payment(order_id=123, amount=100.0, status=PaymentStatus.PROCESSING)
+        ]
+        mock_repository.claim_stale.return_value = [123]
+        provider = Mock()
+        provider.process_payment = AsyncMock(return_value={"status": "APPROVED", "transaction_id": "tx_1"})
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(mock_repository, mock_broker, provider=provider, processing_timeout=60)
+            processor.publish_response = AsyncMock()
+            before = datetime.utcnow()
+            result = await processor.process(payment_request)
+
+        order_ids, older_than = mock_repository.claim_stale.call_args.args
+        assert order_ids == [123]
+        assert before - timedelta(seconds=61) < older_than <= datetime.utcnow() - timedelta(seconds=60)
+        provider.process_payment.assert_awaited_once()
+        assert result.status == PaymentStatus.APPROVED
+        mock_repository.update.assert_called_once_with(result)
+        processor.publish_response.assert_awaited_once_with(order_id=123, status="APPROVED", transaction_id="tx_1")
+
+    @pytest.mark.asyncio
+    async def test_process_does_not_answer_payment_in_progress(self, mock_repository, mock_broker, payment_request):
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor, PaymentsInProgressError
+
+        mock_repository.add_if_absent.return_value = None
+        mock_repository.get_by_order_ids.return_value = [
+            Payment(order_id=123, amount=100.0, status=PaymentStatus.PROCESSING)
+        ]
+        mock_repository.claim_stale.return_value = []
+        provider = Mock()
+        provider.process_payment = AsyncMock()
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(mock_repository, mock_broker, provider=provider)
+            processor.publish_response = AsyncMock()
+            with pytest.raises(PaymentsInProgressError):
+                await processor.process(payment_request)
+
+        provider.process_payment.assert_not_awaited()
+        processor.publish_response.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_runtime_retries_redelivery_of_payment_in_progress(self, payment_request):
+        from tech.workers.run_payment_request_worker import PaymentWorkerRuntime, PaymentsInProgressError
+
+        runtime = PaymentWorkerRuntime(session_factory=Mock(), broker=Mock(), provider=Mock())
+        processed = [Payment(order_id=1, amount=10.0, status=PaymentStatus.APPROVED)]
+
+        with patch('tech.workers.run_payment_request_worker.SimplePaymentProcessor') as processor_class, \
+                patch('tech.workers.run_payment_request_worker.logger'):
+            processor_class.return_value.process_batch = AsyncMock(
+                side_effect=PaymentsInProgressError([2], processed)
+            )
+            failed = await runtime.process_batch([
+                dict(payment_request, order_id=1),
+                dict(payment_request, order_id=2),
+            ])
+
+        assert failed == [1]
+        assert runtime.metrics["processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_batch_resumes_payments_abandoned_in_processing(self, mock_broker):
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        repository = self._batch_repository()
+        repository.add_many_if_absent.side_effect = lambda payments: [p for p in payments if p.order_id == 1]
+        repository.get_by_order_ids.return_value = [
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.PROCESSING)
+        ]
+        repository.claim_stale.return_value = [2]
+        mock_broker.publish_many = AsyncMock()
+        provider = Mock()
+        provider.process_payment = AsyncMock(return_value={"status": "APPROVED", "transaction_id": "tx"})
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(repository, mock_broker, provider=provider)
+            payments = await processor.process_batch([
+                {"order_id": 1, "amount": 10.0},
+                {"order_id": 2, "amount": 20.0}
+            ])
+
+        assert [(p.order_id, p.status) for p in payments] == [(1, PaymentStatus.APPROVED), (2, PaymentStatus.APPROVED)]
+        assert provider.process_payment.await_count == 2
+        assert [p.order_id for p in repository.update_many.call_args.args[0]] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_process_skips_provider_for_stored_order(self, mock_repository, mock_broker, payment_request):
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        stored = Payment(order_id=123, amount=100.0, status=PaymentStatus.APPROVED)
+        mock_repository.add_if_absent.return_value = None
+        mock_repository.get_by_order_ids.return_value = [stored]
+        mock_broker.publish_many = AsyncMock()
+        provider = Mock()
+        provider.process_payment = AsyncMock()
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(mock_repository, mock_broker, provider=provider)
+            result = await processor.process(payment_request)
+            cached = await processor.process(payment_request)
+
+        assert result is stored
+        assert cached is None
+        provider.process_payment.assert_not_awaited()
+        mock_repository.add_if_absent.assert_called_once()
+        mock_repository.update.assert_not_called()
+        mock_broker.publish_many.assert_awaited_once_with(
+            queue="payment_responses", messages=[{"order_id": 123, "status": "APPROVED"}]
+        )
+        mock_broker.publish_async.assert_awaited_once_with(
+            queue="payment_responses", message={"order_id": 123, "status": "APPROVED"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_publishes_stored_status_when_transition_is_refused(self, mock_repository, mock_broker,
+                                                                             payment_request):
+        from tech.domain.entities.payments import InvalidStatusTransition
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        stored = Payment(order_id=123, amount=100.0, status=PaymentStatus.REFUNDED, transaction_id="tx_webhook")
+        mock_repository.add_if_absent.return_value = Payment(order_id=123, amount=100.0,
+                                                             status=PaymentStatus.PROCESSING)
+        mock_repository.update.side_effect = InvalidStatusTransition("Cannot change payment status")
+        mock_repository.get_by_order_id.return_value = stored
+        provider = Mock()
+        provider.process_payment = AsyncMock(return_value={"status": "APPROVED", "transaction_id": "tx_1"})
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(mock_repository, mock_broker, provider=provider)
+            processor.publish_response = AsyncMock()
+            result = await processor.process(payment_request)
+
+        assert result is stored
+        mock_repository.update.assert_called_once()
+        processor.publish_response.assert_awaited_once_with(
+            order_id=123, status="REFUNDED", transaction_id="tx_webhook"
+        )
+        assert processor.completed_orders.get(123)["status"] == "REFUNDED"
+
+    @pytest.mark.asyncio
+    async def test_process_batch_publishes_stored_status_for_refused_transitions(self, mock_broker):
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        repository = self._batch_repository()
+        repository.update_many.side_effect = lambda payments: [p for p in payments if p.order_id == 1]
+        repository.get_by_order_ids.return_value = [
+            Payment(order_id=2, amount=20.0, status=PaymentStatus.APPROVED, transaction_id="tx_webhook")
+        ]
+        mock_broker.publish_many = AsyncMock()
+        provider = Mock()
+        provider.process_payment = AsyncMock(side_effect=[
+            {"status": "APPROVED", "transaction_id": "tx_1"},
+            Exception("Timeout")
+        ])
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(repository, mock_broker, provider=provider)
+            payments = await processor.process_batch([
+                {"order_id": 1, "amount": 10.0},
+                {"order_id": 2, "amount": 20.0}
+            ])
+
+        assert [p.status for p in payments] == [PaymentStatus.APPROVED, PaymentStatus.APPROVED]
+        repository.get_by_order_ids.assert_called_once_with([2])
+        mock_broker.publish_many.assert_awaited_once_with(
+            queue="payment_responses",
+            messages=[
+                {"order_id": 1, "status": "APPROVED", "transaction_id": "tx_1"},
+                {"order_id": 2, "status": "APPROVED", "transaction_id": "tx_webhook"}
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_processor_process_batch(self, mock_broker):
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        repository = self._batch_repository()
+        mock_broker.publish_many = AsyncMock()
+        provider = Mock()
+        provider.process_payment = AsyncMock(side_effect=[
+            {"status": "APPROVED", "transaction_id": "tx_1"},
+            Exception("Card declined")
+        ])
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(repository, mock_broker, provider=provider)
+            payments = await processor.process_batch([
+                {"order_id": 1, "amount": 10.0},
+                {"order_id": 2, "amount": 20.0, "payment_method": "pix"}
+            ])
+
+        assert [p.status for p in payments] == [PaymentStatus.APPROVED, PaymentStatus.ERROR]
+        assert payments[1].payment_method == "pix"
+        repository.update_many.assert_called_once_with(payments)
+        mock_broker.publish_many.assert_awaited_once_with(
+            queue="payment_responses",
+            messages=[
+                {"order_id": 1, "status": "APPROVED", "transaction_id": "tx_1"},
+                {"order_id": 2, "status": "ERROR", "error": "Card declined"}
+            ]
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_batch_keeps_event_loop_running_during_writes(self, mock_broker):
+        import threading
+        from tech.workers.run_payment_request_worker import SimplePaymentProcessor
+
+        write_started = threading.Event()
+        release_write = threading.Event()
+
+        def blocking_update_many(payments):
+            write_started.set()
+            assert release_write.wait(timeout=5)
+            return list(payments)
+
+        repository = self._batch_repository()
+        repository.update_many.side_effect = blocking_update_many
+        mock_broker.publish_many = AsyncMock()
+        provider = Mock()
+        provider.process_payment = AsyncMock(return_value={"status": "APPROVED", "transaction_id": "tx_1"})
+        ticks = []
+
+        async def ticker():
+            while not write_started.is_set():
+                await asyncio.sleep(0.001)
+            for tick in range(3):
+                ticks.append(tick)
+                await asyncio.sleep(0.001)
+            release_write.set()
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            processor = SimplePaymentProcessor(repository, mock_broker, provider=provider)
+            payments, _ = await asyncio.wait_for(asyncio.gather(
+                processor.process_batch([{"order_id": 1, "amount": 10.0}]),
+                ticker()
+            ), timeout=5)
+
+        assert ticks == [0, 1, 2]
+        assert [p.status for p in payments] == [PaymentStatus.APPROVED]
+
+    @pytest.mark.asyncio
+    async def test_runtime_stop_ends_run_and_counts_metrics(self, payment_request, amqp_server, stand_in_broker):
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(session_factory=Mock(), broker=stand_in_broker, provider=Mock())
+            runtime.process_batch = AsyncMock(return_value=[])
+            run_task = asyncio.ensure_future(runtime.run())
+
+            await stand_in_broker.publish_async("payment_requests", payment_request)
+            await self._wait_for(lambda: len(amqp_server.acked) == 1)
+            await runtime.stop()
+            await run_task
+
+            assert runtime.metrics == {"batches": 1, "messages": 1}
+            assert not stand_in_broker.is_open
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_in_flight_batches(self, payment_request, amqp_server, stand_in_broker):
+        release = asyncio.Event()
+
+        async def slow_batch(messages):
+            await release.wait()
+            return []
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(), broker=stand_in_broker, provider=Mock(),
+                batch_size=2, batch_wait=0.01, drain_timeout=1
+            )
+            runtime.process_batch = slow_batch
+            run_task = asyncio.ensure_future(runtime.run())
+
+            for order_id in range(2):
+                await stand_in_broker.publish_async("payment_requests", dict(payment_request, order_id=order_id))
+            await self._wait_for(lambda: runtime.metrics["batches"] == 1)
+
+            await runtime.stop()
+            await settle()
+            assert not run_task.done()
+            assert stand_in_broker.channel.consumers == {}
+
+            release.set()
+            await run_task
+
+            assert len(amqp_server.acked) == 2
+            assert amqp_server.nacked == []
+            assert not stand_in_broker.is_open
+
+    @pytest.mark.asyncio
+    async def test_stop_requeues_batches_that_miss_the_deadline(self, payment_request, amqp_server,
+                                                                 stand_in_broker):
+        async def stuck_batch(messages):
+            await asyncio.sleep(10)
+
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(
+                session_factory=Mock(), broker=stand_in_broker, provider=Mock(), drain_timeout=0.05
+            )
+            runtime.process_batch = stuck_batch
+            run_task = asyncio.ensure_future(runtime.run())
+
+            await stand_in_broker.publish_async("payment_requests", payment_request)
+            await self._wait_for(lambda: runtime.metrics["batches"] == 1)
+
+            await runtime.stop()
+            await run_task
+
+            assert amqp_server.nacked == [("payment_requests", json.dumps(payment_request))]
+            assert runtime.metrics["requeued"] == 1
+            assert len(amqp_server.messages("payment_requests")) == 1
+
+    @pytest.mark.asyncio
+    async def test_serve_stops_runtime_on_signal(self):
+        import signal
+        from tech.workers.run_payment_request_worker import serve
+
+        runtime = Mock()
+        runtime.run = AsyncMock()
+        runtime.stop = AsyncMock()
+
+        with patch.object(asyncio.get_running_loop(), 'add_signal_handler') as add_signal_handler:
+            await serve(runtime)
+
+        assert [c.args[0] for c in add_signal_handler.call_args_list] == [signal.SIGTERM, signal.SIGINT]
+        add_signal_handler.call_args_list[0].args[1]()
+        await settle()
+        runtime.stop.assert_awaited_once()
+        runtime.run.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_runtime_run_raises_when_connection_is_lost(self, amqp_server, stand_in_broker):
+        with patch('tech.workers.run_payment_request_worker.logger'):
+            from tech.workers.run_payment_request_worker import PaymentWorkerRuntime
+
+            runtime = PaymentWorkerRuntime(session_factory=Mock(), broker=stand_in_broker, provider=Mock())
+            run_task = asyncio.ensure_future(runtime.run())
+            await self._wait_for(lambda: stand_in_broker.channel is not None and stand_in_broker.channel.consumers)
+
+            amqp_server.connections[0].drop()
+
+            with pytest.raises(pika.exceptions.StreamLostError):
+                await run_task
 
     def test_main(self):
-        connection_mock = Mock()
-        channel_mock = Mock()
-        connection_mock.channel.return_value = channel_mock
-
-        with patch('tech.workers.run_payment_request_worker.pika.PlainCredentials') as mock_creds, \
-                patch('tech.workers.run_payment_request_worker.pika.ConnectionParameters') as mock_params, \
-                patch('tech.workers.run_payment_request_worker.pika.BlockingConnection',
-                      return_value=connection_mock), \
+        with patch('tech.workers.run_payment_request_worker.PaymentWorkerRuntime') as mock_runtime_class, \
+                patch('tech.workers.run_payment_request_worker.serve', new=Mock()) as mock_serve, \
+                patch('tech.workers.run_payment_request_worker.asyncio.run',
+                      side_effect=KeyboardInterrupt()) as mock_run, \
                 patch('tech.workers.run_payment_request_worker.logger'), \
                 patch('sys.exit') as mock_exit:
-            mock_creds.return_value = "fake_creds"
-            mock_params.return_value = "fake_params"
-
-            channel_mock.start_consuming.side_effect = KeyboardInterrupt()
-
-            from tech.workers.run_payment_request_worker import main
+            from tech.workers.run_payment_request_worker import (
+                main, WORKER_CONCURRENCY, WORKER_PREFETCH, WORKER_BATCH_SIZE, WORKER_BATCH_WAIT_MS
+            )
 
             main()
 
-            mock_creds.assert_called_once()
-            mock_params.assert_called_once()
-            connection_mock.channel.assert_called_once()
-            channel_mock.queue_declare.assert_called()
-            channel_mock.basic_qos.assert_called_once_with(prefetch_count=1)
-            channel_mock.basic_consume.assert_called_once()
-            channel_mock.start_consuming.assert_called_once()
-
+            mock_runtime_class.assert_called_once_with(
+                concurrency=WORKER_CONCURRENCY,
+                prefetch=WORKER_PREFETCH,
+                batch_size=WORKER_BATCH_SIZE,
+                batch_wait=WORKER_BATCH_WAIT_MS / 1000
+            )
+            mock_serve.assert_called_once_with(mock_runtime_class.return_value)
+            mock_run.assert_called_once_with(mock_serve.return_value)
             mock_exit.assert_called_once_with(0)
 
     def test_main_exception(self):
-        with patch('tech.workers.run_payment_request_worker.pika.PlainCredentials',
-                   side_effect=Exception("Connection error")), \
+        with patch('tech.workers.run_payment_request_worker.PaymentWorkerRuntime'), \
+                patch('tech.workers.run_payment_request_worker.serve', new=Mock()), \
+                patch('tech.workers.run_payment_request_worker.asyncio.run',
+                      side_effect=Exception("Connection error")), \
                 patch('tech.workers.run_payment_request_worker.logger') as mock_logger, \
                 patch('sys.exit') as mock_exit:
             from tech.workers.run_payment_request_worker import main
@@ -0,0 +1,28 @@
+from datetime import date
+from unittest.mock import MagicMock
+import pytest
+from tech.workers.rebuild_payment_totals import rebuild_totals
+
+
+class TestRebuildPaymentTotals:
+    def test_recomputes_the_window_under_a_lock(self):
+        connection = MagicMock()
+        connection.execute.return_value.rowcount = 4
+
+        rows = rebuild_totals(connection, date(2026, 10, 16), date(2026, 10, 18), 12, today=date(2026, 10, 17))
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert statements[0] == "LOCK TABLE payment_daily_totals IN EXCLUSIVE MODE"
+        assert statements[1].startswith("DELETE FROM payment_daily_totals")
+        assert statements[2].startswith("INSERT INTO payment_daily_totals")
+        assert connection.execute.call_args.args[1] == {"day_from": date(2026, 10, 16), "day_to": date(2026, 10, 18)}
+        connection.commit.assert_called_once()
+        assert rows == 4
+
+    def test_refuses_days_that_may_be_archived(self):
+        connection = MagicMock()
+
+        with pytest.raises(ValueError):
+            rebuild_totals(connection, date(2025, 9, 30), date(2025, 10, 2), 12, today=date(2026, 10, 17))
+
+        connection.execute.assert_not_called()
@@ -0,0 +1,79 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from tech.infra.retry_queues import RetryQueues
+from tech.workers.replay_dead_letters import replay_dead_letters, main
+
+
+class TestReplayDeadLetters:
+    @pytest.fixture
+    def retry_queues(self):
+        return RetryQueues("payment_requests", max_retries=2)
+
+    @staticmethod
+    def _dead_letter(tag, body):
+        return (
+            SimpleNamespace(delivery_tag=tag),
+            SimpleNamespace(headers={"x-attempt": 3, "x-last-error": "boom"}),
+            body
+        )
+
+    def test_replays_until_dlq_is_empty(self, retry_queues):
+        channel = Mock()
+        channel.basic_get.side_effect = [
+            self._dead_letter(1, b'{"order_id": 1}'),
+            self._dead_letter(2, b'{"order_id": 2}'),
+            (None, None, None),
+        ]
+        sleep = Mock()
+
+        replayed = replay_dead_letters(channel, retry_queues, rate=20, sleep=sleep)
+
+        assert replayed == 2
+        channel.confirm_delivery.assert_called_once()
+        publish_call = channel.basic_publish.call_args_list[0]
+        assert publish_call.kwargs["routing_key"] == "payment_requests"
+        assert publish_call.kwargs["body"] == b'{"order_id": 1}'
+        assert publish_call.kwargs["properties"].headers == {"x-last-error": "boom"}
+        assert [c.kwargs["delivery_tag"] for c in channel.basic_ack.call_args_list] == [1, 2]
+        sleep.assert_called_with(0.05)
+        assert sleep.call_count == 2
+
+    def test_respects_limit(self, retry_queues):
+        channel = Mock()
+        channel.basic_get.return_value = self._dead_letter(1, b'{}')
+
+        replayed = replay_dead_letters(channel, retry_queues, rate=0, limit=3, sleep=Mock())
+
+        assert replayed == 3
+        assert channel.basic_get.call_count == 3
+
+    def test_failed_publish_keeps_message_in_dlq(self, retry_queues):
+        channel = Mock()
+        channel.basic_get.return_value = self._dead_letter(1, b'{}')
+        channel.basic_publish.side_effect = Exception("nacked")
+
+        with pytest.raises(Exception, match="nacked"):
+            replay_dead_letters(channel, retry_queues, rate=0)
+
+        channel.basic_ack.assert_not_called()
+
+    def test_main(self):
+        with patch('tech.workers.replay_dead_letters.RabbitMQBroker') as mock_broker_class, \
+                patch('tech.workers.replay_dead_letters.replay_dead_letters', return_value=5) as mock_replay, \
+                patch('tech.workers.replay_dead_letters.logger'):
+            main(["--rate", "5", "--limit", "10"])
+
+            broker = mock_broker_class.return_value
+            assert mock_replay.call_args.args[0] is broker.channel
+            assert mock_replay.call_args.kwargs == {"rate": 5.0, "limit": 10}
+            broker.close.assert_called_once()
+
+    def test_main_exception(self):
+        with patch('tech.workers.replay_dead_letters.RabbitMQBroker', side_effect=Exception("refused")), \
+                patch('tech.workers.replay_dead_letters.logger') as mock_logger, \
+                patch('sys.exit') as mock_exit:
+            main([])
+
+            mock_logger.error.assert_called()
+            mock_exit.assert_called_once_with(1)
@@ -0,0 +1,146 @@
+import os
+import time
+import queue
+import signal
+import asyncio
+import pytest
+from collections import Counter
+from unittest.mock import Mock, AsyncMock, patch
+from tech.workers.supervisor import WorkerSupervisor, run_worker_process, _run_runtime, main
+
+
+def _report_and_exit(metrics_queue, report, code):
+    metrics_queue.put(report)
+    metrics_queue.close()
+    metrics_queue.join_thread()
+    os._exit(code)
+
+
+def exit_with_error(index, metrics_queue):
+    _report_and_exit(metrics_queue, (index, os.getpid(), {"messages": 2}), 3)
+
+
+def wait_for_sigterm(index, metrics_queue):
+    def on_sigterm(signum, frame):
+        _report_and_exit(metrics_queue, (index, os.getpid(), {"messages": 5, "batches": 1}), 0)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    while True:
+        time.sleep(0.01)
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+class TestWorkerSupervisor:
+    def test_restarts_crashed_children_and_keeps_their_metrics(self):
+        supervisor = WorkerSupervisor(processes=2, target=exit_with_error, restart_delay=0)
+        supervisor.start()
+
+        def restarted():
+            supervisor.poll()
+            return supervisor.restarts >= 2
+
+        _wait_until(restarted)
+        supervisor.stop()
+        supervisor.wait()
+
+        metrics = supervisor.aggregate_metrics()
+        assert metrics["restarts"] >= 2
+        assert metrics["messages"] >= 4
+        assert metrics["processes"] == 0
+
+    def test_stop_forwards_sigterm_and_collects_final_metrics(self):
+        supervisor = WorkerSupervisor(processes=2, target=wait_for_sigterm, shutdown_timeout=5)
+        supervisor.start()
+        _wait_until(lambda: all(p.is_alive() for p in supervisor.children.values()))
+        time.sleep(0.1)
+
+        supervisor.stop()
+        supervisor.wait()
+
+        assert all(p.exitcode == 0 for p in supervisor.children.values())
+        metrics = supervisor.aggregate_metrics()
+        assert metrics["messages"] == 10
+        assert metrics["batches"] == 2
+        assert metrics["restarts"] == 0
+
+    def test_poll_does_not_restart_while_stopping(self):
+        supervisor = WorkerSupervisor(processes=1, target=exit_with_error, restart_delay=0)
+        supervisor.start()
+        supervisor.stop()
+        supervisor.wait()
+
+        supervisor.poll()
+        supervisor.poll()
+
+        assert supervisor.restarts == 0
+
+    def test_metrics_from_a_new_pid_retire_previous_totals(self):
+        supervisor = WorkerSupervisor(processes=1, target=Mock())
+        supervisor.metrics_queue = queue.Queue()
+        supervisor.metrics_queue.put((0, 100, {"messages": 3}))
+        supervisor.metrics_queue.put((0, 100, {"messages": 4}))
+        supervisor.metrics_queue.put((0, 200, {"messages": 1}))
+
+        supervisor.collect_metrics()
+
+        assert supervisor.aggregate_metrics()["messages"] == 5
+
+
+class TestWorkerProcess:
+    @pytest.mark.asyncio
+    async def test_run_runtime_reports_metrics(self):
+        runtime = Mock()
+        runtime.metrics = Counter(messages=3)
+        runtime.run = AsyncMock()
+        metrics_queue = queue.Queue()
+
+        with patch.object(asyncio.get_running_loop(), 'add_signal_handler') as add_signal_handler:
+            await _run_runtime(runtime, 1, metrics_queue, metrics_interval=10)
+
+        add_signal_handler.assert_called_once()
+        assert add_signal_handler.call_args.args[0] == signal.SIGTERM
+        index, pid, metrics = metrics_queue.get_nowait()
+        assert (index, pid, metrics) == (1, os.getpid(), {"messages": 3})
+
+    def test_run_worker_process(self):
+        with patch('tech.workers.supervisor.PaymentWorkerRuntime') as mock_runtime_class, \
+                patch('tech.workers.supervisor.engine') as mock_engine, \
+                patch('tech.workers.supervisor.asyncio.run') as mock_run, \
+                patch('tech.workers.supervisor.signal.signal'), \
+                patch('tech.workers.supervisor.logger'):
+            run_worker_process(0, None)
+
+            mock_engine.dispose.assert_called_once_with(close=False)
+            mock_runtime_class.assert_called_once()
+            mock_run.assert_called_once()
+            mock_run.call_args.args[0].close()
+
+    def test_run_worker_process_exception(self):
+        with patch('tech.workers.supervisor.PaymentWorkerRuntime'), \
+                patch('tech.workers.supervisor.engine'), \
+                patch('tech.workers.supervisor.asyncio.run', side_effect=Exception("boom")) as mock_run, \
+                patch('tech.workers.supervisor.signal.signal'), \
+                patch('tech.workers.supervisor.logger'), \
+                patch('sys.exit') as mock_exit:
+            run_worker_process(0, None)
+
+            mock_run.call_args.args[0].close()
+            mock_exit.assert_called_once_with(1)
+
+    def test_main(self):
+        with patch('tech.workers.supervisor.WorkerSupervisor') as mock_supervisor_class, \
+                patch('tech.workers.supervisor.logger'):
+            from tech.workers.supervisor import WORKER_PROCESSES
+
+            main()
+
+            mock_supervisor_class.assert_called_once_with(processes=WORKER_PROCESSES)
+            mock_supervisor_class.return_value.run.assert_called_once()